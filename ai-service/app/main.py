@@ -9,12 +9,15 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 import os
 import asyncio
+import threading
 from datetime import datetime
 
 # Import our custom modules
-from app.utils.preprocessor import preprocess_text, extract_symptoms, extract_numeric_data
+from app.utils.preprocessor import preprocessor, analyze_complaint, get_cache_stats, reload_dictionary
 from app.models.urgency_engine import analyze_urgency
-from app.models.classifier import SymptomClassifier
+from app.models.registry import ModelRegistry, DEFAULT_REGISTRY_DIR
+from app.models.training_jobs import TrainingJobManager, JobConflictError
+from app.models.similar_cases import SimilarCaseIndex, DEFAULT_SIMILAR_CASES_DIR, INDEX_FILE as SIMILAR_INDEX_FILE
 from app.utils.llm_service import generate_medical_summary, generate_category_explanation, generate_first_aid_advice, analyze_skin_image
 
 # Initialize FastAPI app
@@ -34,24 +37,71 @@ app.add_middleware(
 )
 
 # Initialize ML model
+# Requests read model_registry.active once; new versions are swapped in atomically
 MODEL_PATH = os.path.join(os.path.dirname(__file__), 'data/trained_model')
-classifier = SymptomClassifier()
+MODEL_REGISTRY_PATH = os.getenv("MODEL_REGISTRY_DIR", DEFAULT_REGISTRY_DIR)
+model_registry = ModelRegistry(MODEL_REGISTRY_PATH, bundled_path=MODEL_PATH)
 
-# Try to load existing model, if not found will need to train first
+# Load the current registered version, else the bundled model
 try:
-    if os.path.exists(MODEL_PATH):
-        classifier.load_model(MODEL_PATH)
-        print("✓ Model loaded successfully")
+    if model_registry.load_current():
+        print(f"✓ Model loaded successfully ({model_registry.active.version})")
     else:
         print("⚠ No trained model found. Please run training first.")
 except Exception as e:
     print(f"⚠ Warning: Could not load model: {e}")
 
+# Retraining runs in a worker process, one job at a time
+training_jobs = TrainingJobManager(model_registry)
+
+# Similar-case index, tied to the feature space of the model it was built with
+SIMILAR_CASES_PATH = os.getenv("SIMILAR_CASES_DIR", DEFAULT_SIMILAR_CASES_DIR)
+similar_cases = {"index": None, "classifier": None, "error": None}
+similar_cases_lock = threading.Lock()
+
+# Optionally pick up edits to the normalization dictionary without a restart
+DICTIONARY_WATCH_INTERVAL = float(os.getenv("DICTIONARY_WATCH_INTERVAL", "0"))
+if DICTIONARY_WATCH_INTERVAL > 0:
+    preprocessor.watch_dictionary(interval=DICTIONARY_WATCH_INTERVAL)
+
 
 # Pydantic models for request/response
 class TriageRequest(BaseModel):
     complaint: str = Field(..., description="Patient's complaint text in Bahasa Indonesia")
     patient_data: Optional[Dict] = Field(default=None, description="Optional patient demographic data")
+    include_similar_cases: bool = Field(default=False, description="Attach the most similar historical triages")
+
+
+class SimilarCasesRequest(BaseModel):
+    complaint: str = Field(..., description="Patient's complaint text in Bahasa Indonesia")
+    top_k: int = Field(default=5, ge=1, le=50, description="Number of similar cases to return")
+    min_score: float = Field(default=0.0, ge=0.0, le=1.0, description="Minimum cosine similarity")
+
+
+class CaseRecord(BaseModel):
+    complaint: str
+    triage_id: Optional[str] = None
+    primary_category: Optional[str] = None
+    urgency_level: Optional[str] = None
+    doctor_reviewed: Optional[bool] = None
+    created_at: Optional[str] = None
+
+
+class AddCasesRequest(BaseModel):
+    cases: List[CaseRecord]
+    reviewed_only: bool = Field(default=True, description="Skip cases not reviewed by a doctor")
+    persist: bool = Field(default=True, description="Save the index to disk after inserting")
+
+
+class SimilarCase(BaseModel):
+    case_id: int
+    score: float
+    complaint: str
+    triage_id: Optional[str] = None
+    primary_category: Optional[str] = None
+    urgency_level: Optional[str] = None
+    doctor_reviewed: Optional[bool] = None
+    created_at: Optional[str] = None
 
 
 class SymptomInfo(BaseModel):
@@ -108,11 +158,27 @@ class TriageResponse(BaseModel):
     category_explanation: Optional[str] = None
     first_aid_advice: Optional[str] = None
 
+    # Model version that produced the prediction
+    model_version: Optional[str] = None
+
+    # Most similar historical triages (when requested and an index is loaded)
+    similar_cases: Optional[List[SimilarCase]] = None
+
 
 class HealthCheckResponse(BaseModel):
     status: str
     model_loaded: bool
     timestamp: str
+    model_version: Optional[str] = None
+
+
+class TrainRequest(BaseModel):
+    features: str = Field(default="tfidf", description="Feature mode: tfidf or hashing")
+    stemming: bool = Field(default=False, description="Train on preprocessed + stemmed complaints")
+    activate: bool = Field(default=True, description="Hot-swap the model in when training succeeds")
+    streaming: bool = Field(default=False, description="Out-of-core training (hashed features, chunked SGD)")
+    epochs: int = Field(default=3, ge=1, le=50, description="Passes over the data (streaming only)")
+    memory_budget_mb: Optional[int] = Field(default=None, ge=64, description="Peak RSS budget (streaming only)")
 
 
 class ImageAnalysisRequest(BaseModel):
@@ -137,10 +203,12 @@ class ImageAnalysisResponse(BaseModel):
 @app.get("/", response_model=HealthCheckResponse)
 async def root():
     """Health check endpoint"""
+    active = model_registry.active
     return {
         "status": "online",
-        "model_loaded": classifier.is_trained,
-        "timestamp": datetime.utcnow().isoformat()
+        "model_loaded": active.classifier.is_trained,
+        "timestamp": datetime.utcnow().isoformat(),
+        "model_version": active.version
     }
 
 
@@ -156,6 +224,10 @@ async def perform_triage(request: TriageRequest):
     - Medical recommendations
     """
 
+    # One read of the active model: a concurrent swap cannot mix versions
+    active = model_registry.active
+    classifier = active.classifier
+
     if not classifier.is_trained:
         raise HTTPException(
             status_code=503,
@@ -163,15 +235,11 @@ async def perform_triage(request: TriageRequest):
         )
 
     try:
-        # 1. Preprocess complaint text
-        preprocessed = preprocess_text(request.complaint, remove_stopwords=False)
-        processed_text = preprocessed['processed']
-
-        # 2. Extract symptoms
-        symptoms = extract_symptoms(request.complaint)
-
-        # 3. Extract numeric data
-        numeric_data = extract_numeric_data(request.complaint)
+        # 1-3. Preprocess complaint once (text, symptoms, numeric data)
+        complaint = analyze_complaint(request.complaint)
+        processed_text = complaint.processed
+        symptoms = list(complaint.symptoms)
+        numeric_data = complaint.numeric_data
 
         # 4. Classify disease category
         category_result = classifier.predict_with_details(processed_text)
@@ -242,9 +310,16 @@ async def perform_triage(request: TriageRequest):
             # Summary (LLM-enhanced)
             "summary": summary,
             "category_explanation": category_explanation,
-            "first_aid_advice": first_aid_advice
+            "first_aid_advice": first_aid_advice,
+
+            "model_version": active.version
         }
 
+        if request.include_similar_cases:
+            index = await asyncio.to_thread(get_similar_case_index, active)
+            if index is not None:
+                response["similar_cases"] = await asyncio.to_thread(index.search, processed_text, top_k=5)
+
         return response
 
     except Exception as e:
@@ -260,15 +335,15 @@ async def analyze_symptoms(request: TriageRequest):
     Simplified endpoint for symptom extraction only
     """
     try:
-        preprocessed = preprocess_text(request.complaint)
-        symptoms = extract_symptoms(request.complaint)
-        numeric_data = extract_numeric_data(request.complaint)
+        complaint = analyze_complaint(request.complaint)
 
         return {
             "success": True,
-            "processed_text": preprocessed['processed'],
-            "symptoms": symptoms,
-            "numeric_data": numeric_data
+            "processed_text": complaint.processed,
+            "symptoms": list(complaint.symptoms),
+            "symptom_spans": [match._asdict() for match in complaint.symptom_matches],
+            "numeric_data": complaint.numeric_data,
+            "numeric_readings": [reading._asdict() for reading in complaint.numeric_readings]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -280,9 +355,8 @@ async def check_urgency(request: TriageRequest):
     Endpoint for urgency checking only
     """
     try:
-        preprocessed = preprocess_text(request.complaint)
-        numeric_data = extract_numeric_data(request.complaint)
-        urgency_result = analyze_urgency(preprocessed['processed'], numeric_data)
+        complaint = analyze_complaint(request.complaint)
+        urgency_result = analyze_urgency(complaint.processed, complaint.numeric_data)
 
         return {
             "success": True,
@@ -339,18 +413,196 @@ async def get_categories():
     """
     Get list of available disease categories
     """
-    if not classifier.is_trained:
+    active = model_registry.active
+    if not active.classifier.is_trained:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
     return {
         "success": True,
-        "categories": classifier.categories,
-        "total": len(classifier.categories)
+        "categories": active.classifier.categories,
+        "total": len(active.classifier.categories),
+        "model_version": active.version
+    }
+
+
+@app.get("/api/v1/stats")
+async def get_stats():
+    """
+    Get in-process cache statistics (preprocessing and prediction)
+    """
+    return {
+        "success": True,
+        "preprocessor_cache": get_cache_stats(),
+        "prediction_cache": model_registry.active.classifier.get_cache_stats(),
+        "similar_cases": similar_cases["index"].get_stats() if similar_cases["index"] is not None else None
+    }
+
+
+@app.post("/api/v1/admin/reload-dictionary")
+async def reload_normalization_dictionary():
+    """
+    Reload the normalization dictionary from disk
+    The new dictionary is compiled off the event loop and swapped in atomically
+    """
+    try:
+        info = await asyncio.to_thread(reload_dictionary)
+        return {
+            "success": True,
+            "dictionary": info
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Dictionary reload error: {str(e)}")
+
+
+@app.get("/api/v1/models")
+async def list_models():
+    """
+    List registered model versions with their manifests
+    """
+    info = model_registry.get_info()
+    manifests = []
+    for version in info['versions']:
+        try:
+            manifests.append(model_registry.get_manifest(version))
+        except (OSError, ValueError):
+            manifests.append({"version": version, "error": "manifest unreadable"})
+    return {
+        "success": True,
+        **info,
+        "manifests": manifests
     }
 
 
+@app.post("/api/v1/admin/models/{version}/activate")
+async def activate_model(version: str):
+    """
+    Load and warm a model version off the event loop, then swap it in atomically
+    In-flight requests finish on the model they started with
+    """
+    try:
+        swap = await asyncio.to_thread(model_registry.activate, version)
+        return {
+            "success": True,
+            "swap": swap
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model activation error: {str(e)}")
+
+
+@app.post("/api/v1/admin/models/rollback")
+async def rollback_model():
+    """
+    Swap back to the previously registered model version
+    """
+    try:
+        swap = await asyncio.to_thread(model_registry.rollback)
+        return {
+            "success": True,
+            "swap": swap
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model rollback error: {str(e)}")
+
+
+@app.post("/api/v1/similar-cases")
+async def find_similar_cases(request: SimilarCasesRequest):
+    """
+    Most similar historical triages to a complaint (cosine similarity in the
+    active model's TF-IDF space)
+    """
+    active = model_registry.active
+    if not active.classifier.is_trained:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+    index = await asyncio.to_thread(get_similar_case_index, active)
+    if index is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Similar-case index not available: {similar_cases['error']}"
+        )
+
+    try:
+        complaint = analyze_complaint(request.complaint)
+        results = await asyncio.to_thread(
+            index.search, complaint.processed, top_k=request.top_k, min_score=request.min_score
+        )
+        return {
+            "success": True,
+            "processed_complaint": complaint.processed,
+            "similar_cases": results,
+            "indexed_cases": len(index),
+            "model_version": active.version
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Similar-case search error: {str(e)}")
+
+
+@app.post("/api/v1/admin/similar-cases")
+async def add_similar_cases(request: AddCasesRequest):
+    """
+    Insert triage records into the similar-case index (searchable immediately)
+    Creates an empty index for the active model if none has been saved yet
+    """
+    active = model_registry.active
+    if not active.classifier.is_trained:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+    def add_cases():
+        index = get_similar_case_index(active, create=True)
+        if index is None:
+            raise ValueError(similar_cases['error'])
+        added = index.add_records([case.model_dump() for case in request.cases], reviewed_only=request.reviewed_only)
+        if request.persist and added:
+            index.save(SIMILAR_CASES_PATH)
+        return added, index.get_stats()
+
+    try:
+        added, stats = await asyncio.to_thread(add_cases)
+        return {
+            "success": True,
+            "added": added,
+            "index": stats
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Similar-case insert error: {str(e)}")
+
+
 # Helper functions
 
+def get_similar_case_index(active, create: bool = False) -> Optional[SimilarCaseIndex]:
+    """
+    Similar-case index for the active model
+
+    Loaded from SIMILAR_CASES_PATH on first use and again after a model swap;
+    an index built with another model's features is re-indexed from its
+    stored cases, so persisting it later keeps every case.
+
+    Args:
+        active: ActiveModel read by the request
+        create: Start an empty index if none has been saved yet (never
+            over an index that exists but failed to load)
+
+    Returns:
+        Index, or None (reason in similar_cases['error'])
+    """
+    with similar_cases_lock:
+        if similar_cases["classifier"] is not active.classifier:
+            similar_cases.update(index=None, classifier=active.classifier, error=None)
+            try:
+                similar_cases["index"] = SimilarCaseIndex.load(SIMILAR_CASES_PATH, active.classifier, rebuild=True)
+                print(f"[INFO] Loaded similar-case index ({len(similar_cases['index'])} cases)")
+            except Exception as e:
+                similar_cases["error"] = str(e)
+        saved = os.path.exists(os.path.join(SIMILAR_CASES_PATH, SIMILAR_INDEX_FILE))
+        if similar_cases["index"] is None and create and not saved:
+            similar_cases.update(index=SimilarCaseIndex(active.classifier), error=None)
+        return similar_cases["index"]
+
+
 def generate_summary(category: str, urgency: str, symptoms: List[str]) -> str:
     """Generate human-readable summary"""
 
@@ -376,30 +628,82 @@ def generate_summary(category: str, urgency: str, symptoms: List[str]) -> str:
     return summary
 
 
-# Training endpoint (for development only, remove in production)
-@app.post("/api/v1/train")
-async def train_model():
+# Training endpoints (for development only, remove in production)
+@app.post("/api/v1/train", status_code=202)
+async def train_model(request: Optional[TrainRequest] = None):
     """
-    Train the ML model (DEV only)
+    Start a background training job (DEV only)
     Should be disabled in production
+    Training runs in a worker process; poll /api/v1/train/jobs/{job_id}.
+    The model is registered as a new version and hot-swapped in.
     """
-    try:
-        dataset_path = os.path.join(os.path.dirname(__file__), 'data/symptoms_dataset.csv')
-
-        global classifier
-        classifier = SymptomClassifier()
-        metrics = classifier.train(dataset_path)
-        classifier.save_model(MODEL_PATH)
+    request = request or TrainRequest()
+    dataset_path = os.path.join(os.path.dirname(__file__), 'data/symptoms_dataset.csv')
+
+    if request.streaming:
+        options = {
+            'streaming': True,
+            'stemming': request.stemming,
+            'epochs': request.epochs,
+            'memory_budget_mb': request.memory_budget_mb
+        }
+    else:
+        options = {'features': request.features, 'stemming': request.stemming}
 
+    try:
+        job = training_jobs.start(dataset_path, options=options, activate=request.activate)
         return {
             "success": True,
-            "message": "Model trained successfully",
-            "metrics": metrics
+            "message": "Training job started",
+            "job": job
         }
+    except JobConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Training error: {str(e)}")
 
 
+@app.get("/api/v1/train/jobs")
+async def list_training_jobs():
+    """
+    List recent training jobs, newest first
+    """
+    return {
+        "success": True,
+        "jobs": training_jobs.list_jobs()
+    }
+
+
+@app.get("/api/v1/train/jobs/{job_id}")
+async def get_training_job(job_id: str):
+    """
+    Poll a training job: status, stage, progress, metrics and model version
+    """
+    try:
+        return {
+            "success": True,
+            "job": training_jobs.get(job_id)
+        }
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Training job not found: {job_id}")
+
+
+@app.post("/api/v1/train/jobs/{job_id}/cancel")
+async def cancel_training_job(job_id: str):
+    """
+    Cancel a running training job (no model is swapped in)
+    """
+    try:
+        return {
+            "success": True,
+            "job": training_jobs.cancel(job_id)
+        }
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Training job not found: {job_id}")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", "8000"))
@@ -5,49 +5,172 @@ Uses TF-IDF + Logistic Regression for multi-class classification
 
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, accuracy_score
 import joblib
 import os
-from typing import Dict, List, Tuple
+import uuid
+from typing import Callable, Dict, List, Tuple, Iterable, NamedTuple, Union
 import json
 
+from app.utils.cache import LRUCache, approximate_size
+from app.utils.stemmer import stem_text
+from app.models.inference import LinearInferenceEngine, UnsupportedModelError, ArtifactError, MANIFEST_FILE, read_manifest
+
+
+# Feature spaces selectable at train time
+FEATURE_MODES = ('tfidf', 'hashing')
+DEFAULT_HASH_FEATURES = 2 ** 14
+
+# Streaming training: chunk limits and the allowance for transient copies
+STREAM_SCAN_CHUNK = 5000
+STREAM_MIN_CHUNK = 256
+STREAM_MAX_CHUNK = 100000
+STREAM_MEMORY_OVERHEAD = 4
+STREAM_RESERVE_BYTES = 16 * 1024 * 1024  # parser buffers and fitting temporaries
+
+
+class BatchPrediction(NamedTuple):
+    """Top-k predictions for a batch of complaints, best first per row"""
+    indices: np.ndarray        # (n, k) class indices into labels
+    probabilities: np.ndarray  # (n, k) probabilities
+    labels: np.ndarray         # class names, in model column order
+
+    @property
+    def categories(self) -> np.ndarray:
+        """(n, k) category names"""
+        return self.labels[self.indices]
+
+
+def _report_from_confusion(confusion: np.ndarray, labels: Iterable[str]) -> Dict:
+    """classification_report(output_dict=True) equivalent computed from a confusion matrix"""
+    true_positives = np.diag(confusion).astype(np.float64)
+    support = confusion.sum(axis=1)
+    predicted = confusion.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.nan_to_num(true_positives / predicted)
+        recall = np.nan_to_num(true_positives / support)
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+
+    # Like sklearn, classes neither present nor predicted are left out
+    present = (support + predicted) > 0
+    report = {
+        str(label): {'precision': float(p), 'recall': float(r), 'f1-score': float(f), 'support': float(s)}
+        for label, p, r, f, s, keep in zip(labels, precision, recall, f1, support, present)
+        if keep
+    }
+    total = support.sum()
+    report['accuracy'] = float(true_positives.sum() / total) if total else 0.0
+    report['macro avg'] = {
+        'precision': float(precision[present].mean()), 'recall': float(recall[present].mean()),
+        'f1-score': float(f1[present].mean()), 'support': float(total)
+    }
+    weights = support / total if total else support
+    report['weighted avg'] = {
+        'precision': float(precision @ weights), 'recall': float(recall @ weights),
+        'f1-score': float(f1 @ weights), 'support': float(total)
+    }
+    return report
+
 
 class SymptomClassifier:
     """ML Classifier for disease category prediction"""
 
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, cache_size: int = None):
         """
         Initialize classifier
 
         Args:
             model_path: Path to saved model directory
+            cache_size: Max cached predict_with_details results
+                (default PREDICTION_CACHE_SIZE env or 4096, 0 disables)
         """
         self.vectorizer = None
         self.model = None
         self.categories = []
         self.is_trained = False
+        self.stemming = False  # stem processed text before vectorizing
+        self.engine = None  # NumPy scorer used instead of sklearn when available
+        self.features = {'mode': 'tfidf'}  # feature space the model was trained on
+        self.model_version = None  # changes whenever a different model is trained or loaded
+
+        # Repeated processed complaints skip vectorization and scoring
+        if cache_size is None:
+            cache_size = int(os.getenv('PREDICTION_CACHE_SIZE', '4096'))
+        self.prediction_cache = LRUCache(maxsize=cache_size, sizeof=approximate_size)
 
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
 
-    def train(self, dataset_path: str) -> Dict:
+    @classmethod
+    def from_fitted(
+        cls,
+        vectorizer,
+        model,
+        categories: List[str],
+        features: Dict = None,
+        stemming: bool = False
+    ) -> 'SymptomClassifier':
+        """
+        Wrap an already fitted vectorizer and linear model (e.g. from incremental learning)
+
+        Returns:
+            Trained classifier, ready to predict or save
+        """
+        classifier = cls()
+        classifier.vectorizer = vectorizer
+        classifier.model = model
+        classifier.categories = list(categories)
+        classifier.features = features or {'mode': 'tfidf'}
+        classifier.stemming = stemming
+        classifier.is_trained = True
+        classifier._build_engine()
+        classifier._set_model_version()
+        return classifier
+
+    def train(
+        self,
+        dataset_path: str,
+        stemming: bool = False,
+        features: str = 'tfidf',
+        hash_features: int = DEFAULT_HASH_FEATURES,
+        hash_idf: bool = True,
+        feature_cache=None,
+        progress: Callable[[str, float], None] = None
+    ) -> Dict:
         """
         Train classifier on dataset
 
         Args:
             dataset_path: Path to symptoms_dataset.csv
+            stemming: Train on preprocessed + stemmed complaints; the same
+                stage is then applied to every complaint at prediction time
+            features: 'tfidf' (500-term vocabulary) or 'hashing' (stateless
+                hashed unigrams + bigrams, no vocabulary)
+            hash_features: Size of the hashed feature space
+            hash_idf: Reweight hashed counts with an IDF vector fixed at train time
+            feature_cache: FeatureCache to reuse vectorized train/test matrices
+            progress: Called with (stage, fraction done) as training advances
 
         Returns:
             Training metrics
         """
+        if features not in FEATURE_MODES:
+            raise ValueError(f"Unknown feature mode: {features} (choose from {', '.join(FEATURE_MODES)})")
+
+        # sklearn is only needed to train or to load pickles, not to serve the artifact
+        from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer, TfidfTransformer
+        from sklearn.pipeline import Pipeline
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import classification_report, accuracy_score
+
+        report_progress = progress or (lambda stage, fraction: None)
+
         # Load dataset
+        report_progress('loading', 0.0)
         df = pd.read_csv(dataset_path)
 
         # Prepare data
-        X = df['complaint'].values
+        self.stemming = stemming
         y = df['category'].values
         self.categories = list(df['category'].unique())
 
@@ -57,31 +180,76 @@ class SymptomClassifier:
         min_class_count = min(class_counts.values())
         can_stratify = min_class_count >= 2
 
-        # Split data
-        if can_stratify:
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, stratify=y
+        if features == 'hashing':
+            # Hashed unigrams and bigrams: no vocabulary to fit, store or look up
+            hashing = HashingVectorizer(
+                n_features=hash_features,
+                ngram_range=(1, 2),
+                alternate_sign=False,
+                norm=None if hash_idf else 'l2',
+                lowercase=True
             )
+            if hash_idf:
+                self.vectorizer = Pipeline([('hashing', hashing), ('idf', TfidfTransformer())])
+            else:
+                self.vectorizer = hashing
+            self.features = {'mode': 'hashing', 'n_features': hash_features, 'idf': hash_idf}
         else:
-            print(f"Warning: Some classes have <2 samples. Splitting without stratification.")
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42
+            # Create TF-IDF vectorizer
+            self.vectorizer = TfidfVectorizer(
+                max_features=500,
+                ngram_range=(1, 2),  # unigrams and bigrams
+                min_df=1,
+                max_df=0.8,
+                lowercase=True
             )
+            self.features = {'mode': 'tfidf'}
+
+        # Vectorized data is reused across runs when dataset, preprocessing
+        # and vectorizer settings are unchanged
+        report_progress('vectorizing', 0.1)
+        cached = None
+        if feature_cache is not None:
+            cache_key = feature_cache.make_key(
+                dataset_path,
+                preprocessing=self._preprocessing_version(),
+                vectorizer=self.vectorizer,
+                split={'test_size': 0.2, 'random_state': 42, 'stratify': can_stratify}
+            )
+            cached = feature_cache.get(cache_key)
 
-        # Create TF-IDF vectorizer
-        self.vectorizer = TfidfVectorizer(
-            max_features=500,
-            ngram_range=(1, 2),  # unigrams and bigrams
-            min_df=1,
-            max_df=0.8,
-            lowercase=True
-        )
-
-        # Fit vectorizer and transform data
-        X_train_tfidf = self.vectorizer.fit_transform(X_train)
-        X_test_tfidf = self.vectorizer.transform(X_test)
+        if cached is not None:
+            print(f"Feature cache hit: {cache_key['key']}")
+            self.vectorizer = cached['vectorizer']
+            X_train_tfidf, X_test_tfidf = cached['X_train'], cached['X_test']
+            y_train, y_test = cached['y_train'], cached['y_test']
+        else:
+            if stemming:
+                from app.utils.preprocessor import preprocess_many
+                X = np.array([self._featurize(text) for text in preprocess_many(df['complaint'])['processed']])
+            else:
+                X = df['complaint'].values
+
+            # Split data
+            if can_stratify:
+                X_train, X_test, y_train, y_test = train_test_split(
+                    X, y, test_size=0.2, random_state=42, stratify=y
+                )
+            else:
+                print(f"Warning: Some classes have <2 samples. Splitting without stratification.")
+                X_train, X_test, y_train, y_test = train_test_split(
+                    X, y, test_size=0.2, random_state=42
+                )
+
+            # Fit vectorizer and transform data
+            X_train_tfidf = self.vectorizer.fit_transform(X_train)
+            X_test_tfidf = self.vectorizer.transform(X_test)
+
+            if feature_cache is not None:
+                feature_cache.put(cache_key, self.vectorizer, X_train_tfidf, X_test_tfidf, y_train, y_test)
 
         # Train Logistic Regression
+        report_progress('fitting', 0.3)
         self.model = LogisticRegression(
             max_iter=1000,
             multi_class='multinomial',
@@ -91,8 +259,11 @@ class SymptomClassifier:
 
         self.model.fit(X_train_tfidf, y_train)
         self.is_trained = True
+        self._build_engine()
+        self._set_model_version()
 
         # Evaluate
+        report_progress('evaluating', 0.9)
         y_pred = self.model.predict(X_test_tfidf)
         accuracy = accuracy_score(y_test, y_pred)
         report = classification_report(y_test, y_pred, output_dict=True)
@@ -102,16 +273,233 @@ class SymptomClassifier:
         print(f"{'='*50}")
         print(f"Accuracy: {accuracy:.3f}")
         print(f"Categories: {len(self.categories)}")
-        print(f"Training samples: {len(X_train)}")
-        print(f"Test samples: {len(X_test)}")
+        print(f"Features: {self.features['mode']}")
+        print(f"Training samples: {X_train_tfidf.shape[0]}")
+        print(f"Test samples: {X_test_tfidf.shape[0]}")
         print(f"{'='*50}\n")
 
         return {
             'accuracy': accuracy,
             'report': report,
             'categories': self.categories,
-            'train_size': len(X_train),
-            'test_size': len(X_test)
+            'features': self.features,
+            'train_size': X_train_tfidf.shape[0],
+            'test_size': X_test_tfidf.shape[0]
+        }
+
+    def train_streaming(
+        self,
+        dataset_paths: Union[str, List[str]],
+        epochs: int = 3,
+        memory_budget_mb: int = None,
+        chunk_size: int = None,
+        holdout: float = 0.2,
+        stemming: bool = False,
+        hash_features: int = DEFAULT_HASH_FEATURES,
+        alpha: float = 1e-5,
+        progress: Callable[[str, float], None] = None
+    ) -> Dict:
+        """
+        Train on corpora larger than memory
+
+        Rows are streamed in chunks (CSV, NDJSON or Parquet with complaint and
+        category columns), hashed with a stateless vectorizer and learned with
+        SGD partial_fit over several epochs. Nothing but the current chunk
+        and the model is ever held in memory.
+
+        Args:
+            dataset_paths: Dataset file or files
+            epochs: Passes over the training stream
+            memory_budget_mb: Peak RSS the process may reach; sizes the chunks
+                (default TRAIN_MEMORY_BUDGET_MB env or 1024)
+            chunk_size: Rows per chunk (default: derived from the budget)
+            holdout: Fraction of rows held out for evaluation, chosen by a
+                hash of the complaint (duplicates never straddle the split)
+            stemming: Train on preprocessed + stemmed complaints
+            hash_features: Size of the hashed feature space
+            alpha: SGD regularization strength
+            progress: Called with (stage, fraction done) as training advances
+
+        Returns:
+            Training metrics, including rows/s and peak RSS
+        """
+        import time
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+        from app.utils.corpus_stream import iter_chunks
+        from app.utils.memory import current_rss_bytes, peak_rss_bytes, reset_peak_rss
+
+        report_progress = progress or (lambda stage, fraction: None)
+        paths = [dataset_paths] if isinstance(dataset_paths, str) else list(dataset_paths)
+        if memory_budget_mb is None:
+            memory_budget_mb = int(os.getenv('TRAIN_MEMORY_BUDGET_MB', '1024'))
+        budget = memory_budget_mb * 1024 * 1024
+        reset_peak_rss()
+
+        self.stemming = stemming
+        # IDF would need a fitted pass; hashed l2-normalized counts are stateless
+        self.vectorizer = HashingVectorizer(
+            n_features=hash_features,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm='l2',
+            lowercase=True
+        )
+        holdout_cut = np.uint64(int(holdout * 2 ** 32))
+
+        def split(chunk: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+            chunk = chunk.dropna(subset=['complaint', 'category'])
+            # pandas' row hash has a fixed key: the split is the same on every pass and run
+            hashes = pd.util.hash_pandas_object(chunk['complaint'].astype(str), index=False).to_numpy()
+            held = (hashes >> np.uint64(32)) < holdout_cut
+            return chunk[~held], chunk[held]
+
+        def vectorize(complaints: pd.Series):
+            # Complaint histories repeat a lot: hash each distinct text once
+            codes, distinct = pd.factorize(complaints.astype(str))
+            if stemming:
+                from app.utils.preprocessor import preprocess_many
+                distinct = [self._featurize(text) for text in preprocess_many(pd.Series(distinct))['processed']]
+            return self.vectorizer.transform(distinct)[codes]
+
+        # Pass 1: category counts (partial_fit needs every class up front) and
+        # a per-row memory estimate from the first chunk
+        report_progress('scanning', 0.0)
+        scan_start = time.perf_counter()
+        train_counts, test_rows, row_bytes = {}, 0, None
+        for path in paths:
+            for chunk in iter_chunks(path, chunk_size=STREAM_SCAN_CHUNK):
+                train_part, test_part = split(chunk)
+                for category, count in train_part['category'].value_counts().items():
+                    train_counts[category] = train_counts.get(category, 0) + int(count)
+                test_rows += len(test_part)
+                if row_bytes is None and len(chunk):
+                    X = vectorize(chunk['complaint'].dropna())
+                    nnz = X.nnz / max(1, X.shape[0])
+                    # Frame + CSR (data, indices) + transient copies while hashing/fitting
+                    row_bytes = chunk.memory_usage(deep=True).sum() / len(chunk) + nnz * 12 * STREAM_MEMORY_OVERHEAD
+        scan_seconds = time.perf_counter() - scan_start
+
+        if not train_counts:
+            raise ValueError("No training rows (need complaint and category columns)")
+        self.categories = sorted(train_counts)
+        train_rows = sum(train_counts.values())
+
+        # Half of what the budget leaves after the process and the model goes
+        # to chunks; the rest absorbs allocator slack and parser buffers
+        model_bytes = len(self.categories) * hash_features * 8 * 3
+        available = budget - current_rss_bytes() - model_bytes - STREAM_RESERVE_BYTES
+        if chunk_size is None:
+            if available <= 0:
+                raise ValueError(
+                    f"Memory budget {memory_budget_mb} MB is below the process ({current_rss_bytes() >> 20} MB) "
+                    f"plus model ({model_bytes >> 20} MB) and working reserve ({STREAM_RESERVE_BYTES >> 20} MB)"
+                )
+            chunk_size = int(min(STREAM_MAX_CHUNK, max(STREAM_MIN_CHUNK, available // 2 // row_bytes)))
+
+        # Same weighting as class_weight='balanced', from the scan counts
+        class_weights = {
+            category: train_rows / (len(self.categories) * count)
+            for category, count in train_counts.items()
+        }
+        classes = np.array(self.categories)
+        self.model = SGDClassifier(loss='log_loss', alpha=alpha, random_state=42)
+        self.features = {'mode': 'hashing', 'n_features': hash_features, 'idf': False, 'learner': 'sgd'}
+
+        # Pass 2..n: partial_fit per shuffled chunk. Held-out rows of a chunk are
+        # scored before the chunk is learned (progressive validation)
+        fit_start = time.perf_counter()
+        history = []
+        for epoch in range(epochs):
+            rng = np.random.default_rng(42 + epoch)
+            epoch_start = time.perf_counter()
+            seen = correct = scored = 0
+            for path in paths:
+                for chunk in iter_chunks(path, chunk_size=chunk_size):
+                    train_part, test_part = split(chunk)
+                    if len(test_part) and hasattr(self.model, 'coef_'):
+                        predicted = self.model.predict(vectorize(test_part['complaint']))
+                        correct += int(np.sum(predicted == test_part['category'].values))
+                        scored += len(test_part)
+                    if len(train_part):
+                        train_part = train_part.iloc[rng.permutation(len(train_part))]
+                        labels = train_part['category'].values
+                        self.model.partial_fit(
+                            vectorize(train_part['complaint']),
+                            labels,
+                            classes=classes,
+                            sample_weight=train_part['category'].map(class_weights).to_numpy()
+                        )
+                        seen += len(train_part)
+                    report_progress('fitting', 0.1 + 0.8 * (epoch + seen / train_rows) / epochs)
+
+            history.append({
+                'epoch': epoch + 1,
+                'rows': seen,
+                'seconds': round(time.perf_counter() - epoch_start, 3),
+                'holdout_accuracy': round(correct / scored, 4) if scored else None
+            })
+            print(f"[INFO] Epoch {epoch + 1}/{epochs}: {seen} rows, "
+                  f"{seen / max(1e-9, time.perf_counter() - epoch_start):.0f} rows/s, "
+                  f"progressive holdout accuracy {history[-1]['holdout_accuracy']}")
+        fit_seconds = time.perf_counter() - fit_start
+
+        self.is_trained = True
+        self._build_engine()
+        self._set_model_version()
+
+        # Final pass: the held-out stream against the finished model, into a
+        # confusion matrix (labels are never collected, memory stays flat)
+        report_progress('evaluating', 0.9)
+        confusion = np.zeros((len(classes), len(classes)), dtype=np.int64)
+        unknown = 0
+        for path in paths:
+            for chunk in iter_chunks(path, chunk_size=chunk_size):
+                _, test_part = split(chunk)
+                if len(test_part):
+                    actual = pd.Categorical(test_part['category'], categories=self.model.classes_).codes
+                    predicted = self.model.decision_function(vectorize(test_part['complaint'])).argmax(axis=1)
+                    known = actual >= 0
+                    unknown += int((~known).sum())
+                    np.add.at(confusion, (actual[known], predicted[known]), 1)
+
+        accuracy = float(np.trace(confusion) / test_rows) if test_rows else None
+        report = _report_from_confusion(confusion, self.model.classes_) if test_rows else {}
+        if report:
+            report['accuracy'] = accuracy
+        if unknown:
+            print(f"Warning: {unknown} held-out rows have categories absent from training; they count as errors")
+        rows_per_second = train_rows * epochs / max(1e-9, fit_seconds)
+        peak = peak_rss_bytes()
+
+        print(f"\n{'='*50}")
+        print("STREAMING TRAINING COMPLETED")
+        print(f"{'='*50}")
+        print(f"Accuracy: {accuracy:.3f}" if accuracy is not None else "Accuracy: n/a (empty holdout)")
+        print(f"Categories: {len(self.categories)}")
+        print(f"Training samples: {train_rows} x {epochs} epochs")
+        print(f"Test samples: {test_rows}")
+        print(f"Chunk size: {chunk_size} rows")
+        print(f"Throughput: {rows_per_second:.0f} rows/s")
+        print(f"Peak RSS: {peak / 1024 / 1024:.0f} MB (budget {memory_budget_mb} MB)")
+        print(f"{'='*50}\n")
+        if peak > budget:
+            print("Warning: Peak RSS exceeded the memory budget; pass a smaller chunk_size")
+
+        return {
+            'accuracy': accuracy,
+            'report': report,
+            'categories': self.categories,
+            'features': self.features,
+            'train_size': train_rows,
+            'test_size': test_rows,
+            'epochs': history,
+            'chunk_size': chunk_size,
+            'rows_per_second': round(rows_per_second, 1),
+            'scan_seconds': round(scan_seconds, 3),
+            'fit_seconds': round(fit_seconds, 3),
+            'peak_rss_mb': round(peak / 1024 / 1024, 1),
+            'memory_budget_mb': memory_budget_mb
         }
 
     def predict(self, complaint_text: str, top_k: int = 3) -> List[Dict]:
@@ -125,27 +513,93 @@ class SymptomClassifier:
         Returns:
             List of predictions with probabilities
         """
-        if not self.is_trained:
-            raise ValueError("Model not trained yet. Call train() first or load a trained model.")
+        return self.predict_batch([complaint_text], top_k=top_k, as_dicts=True)[0]
+
+    def predict_batch(
+        self,
+        complaint_texts: Iterable[str],
+        top_k: int = 3,
+        as_dicts: bool = False
+    ) -> Union[BatchPrediction, List[List[Dict]]]:
+        """
+        Predict disease categories for many complaints at once
 
-        # Vectorize input
-        X = self.vectorizer.transform([complaint_text])
+        All complaints are vectorized into one sparse matrix and scored in a
+        single pass (NumPy engine, or sklearn predict_proba as fallback);
+        top-k selection is vectorized per row.
 
-        # Get probabilities for all classes
-        probabilities = self.model.predict_proba(X)[0]
+        Args:
+            complaint_texts: Preprocessed complaint texts
+            top_k: Number of top predictions per complaint
+            as_dicts: Return per-complaint prediction dicts (as predict())
+                instead of compact arrays
 
-        # Get top K predictions
-        top_indices = np.argsort(probabilities)[-top_k:][::-1]
+        Returns:
+            BatchPrediction arrays, or a list of prediction lists
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet. Call train() first or load a trained model.")
 
-        predictions = []
-        for idx in top_indices:
-            predictions.append({
-                'category': self.categories[idx],
-                'probability': float(probabilities[idx]),
-                'confidence': self._get_confidence_level(probabilities[idx])
-            })
+        texts = [self._featurize(text) for text in complaint_texts]
+        labels = self.engine.classes_ if self.engine is not None else self.model.classes_
 
-        return predictions
+        # Vectorize all complaints into one sparse matrix; probabilities
+        # for all classes, columns ordered as model.classes_
+        if texts and self.engine is not None:
+            probabilities = self.engine.predict_proba(texts)
+        elif texts:
+            probabilities = self.model.predict_proba(self.vectorizer.transform(texts))
+        else:
+            probabilities = np.empty((0, len(labels)))
+
+        # Top K per row: partition first, then sort only the K survivors
+        n_classes = probabilities.shape[1]
+        top_k = max(1, min(top_k, n_classes))
+        if top_k < n_classes:
+            top_indices = np.argpartition(-probabilities, top_k - 1, axis=1)[:, :top_k]
+        else:
+            top_indices = np.tile(np.arange(n_classes), (probabilities.shape[0], 1))
+        top_probabilities = np.take_along_axis(probabilities, top_indices, axis=1)
+        order = np.argsort(-top_probabilities, axis=1, kind='stable')
+        top_indices = np.take_along_axis(top_indices, order, axis=1)
+        top_probabilities = np.take_along_axis(top_probabilities, order, axis=1)
+
+        batch = BatchPrediction(top_indices, top_probabilities, labels)
+        if not as_dicts:
+            return batch
+
+        return [
+            [
+                {
+                    'category': str(labels[idx]),
+                    'probability': float(probability),
+                    'confidence': self._get_confidence_level(probability)
+                }
+                for idx, probability in zip(row_indices, row_probabilities)
+            ]
+            for row_indices, row_probabilities in zip(top_indices.tolist(), top_probabilities.tolist())
+        ]
+
+    def _build_engine(self):
+        """Extract the NumPy inference engine (sklearn stays the fallback)"""
+        try:
+            self.engine = LinearInferenceEngine.from_sklearn(self.vectorizer, self.model)
+        except UnsupportedModelError as e:
+            print(f"Warning: NumPy inference disabled, using sklearn: {e}")
+            self.engine = None
+
+    def _preprocessing_version(self) -> str:
+        """Version of the text stages applied before vectorizing during training"""
+        if not self.stemming:
+            return 'raw'
+        from app.utils.preprocessor import preprocessor
+        return f"preprocess-{preprocessor.config_version}+stem"
+
+    def _featurize(self, complaint_text: str) -> str:
+        """Apply the text stages the model was trained with"""
+        if self.stemming:
+            return stem_text(complaint_text)
+        return complaint_text
 
     def _get_confidence_level(self, probability: float) -> str:
         """Convert probability to confidence level"""
@@ -166,6 +620,12 @@ class SymptomClassifier:
         Returns:
             Detailed prediction result
         """
+        key = (self.model_version, complaint_text)
+        cached = self.prediction_cache.get(key)
+        if cached is not None:
+            # Callers get their own copy; the cached result stays intact
+            return {**cached, 'alternative_categories': [dict(alt) for alt in cached['alternative_categories']]}
+
         predictions = self.predict(complaint_text, top_k=3)
 
         # Primary prediction
@@ -182,38 +642,109 @@ class SymptomClassifier:
             'requires_review': primary['probability'] < 0.5  # Flag for doctor review if low confidence
         }
 
+        self.prediction_cache.set(key, {**result, 'alternative_categories': [dict(alt) for alt in alternatives]})
         return result
 
-    def save_model(self, save_path: str):
-        """Save trained model and vectorizer"""
+    def _set_model_version(self, version: str = None):
+        """Record the model now loaded and drop predictions of the previous one"""
+        self.model_version = version or uuid.uuid4().hex[:12]
+        self.prediction_cache.clear()
+
+    def get_cache_stats(self) -> Dict:
+        """Prediction cache statistics (hit rate, entries, approximate bytes)"""
+        return {
+            **self.prediction_cache.get_stats(),
+            "model_version": self.model_version
+        }
+
+    def save_model(self, save_path: str, compression: Dict = None):
+        """
+        Save trained model
+
+        Writes the pickle-free artifact (manifest.json + .npy arrays) used
+        by workers, and the joblib pickles as fallback when the sklearn
+        objects are available.
+
+        Args:
+            save_path: Model directory
+            compression: Export pruned, reduced-precision weights, e.g.
+                {'prune': 0.01, 'precision': 'int8'} (see LinearInferenceEngine.compress)
+        """
         if not self.is_trained:
             raise ValueError("Cannot save untrained model")
 
         os.makedirs(save_path, exist_ok=True)
 
-        # Save vectorizer
-        joblib.dump(self.vectorizer, os.path.join(save_path, 'vectorizer.pkl'))
-
-        # Save model
-        joblib.dump(self.model, os.path.join(save_path, 'model.pkl'))
+        if self.model is not None:
+            # Save vectorizer
+            joblib.dump(self.vectorizer, os.path.join(save_path, 'vectorizer.pkl'))
+
+            # Save model
+            joblib.dump(self.model, os.path.join(save_path, 'model.pkl'))
+
+        # Save pickle-free artifact (a stale one must never shadow new pickles)
+        manifest_path = os.path.join(save_path, MANIFEST_FILE)
+        if self.engine is not None:
+            engine = self.engine.compress(**compression) if compression else self.engine
+            engine.save(save_path, metadata={
+                'categories': self.categories,
+                'stemming': self.stemming,
+                'features': self.features
+            })
+        elif os.path.exists(manifest_path):
+            os.remove(manifest_path)
 
         # Save categories
         with open(os.path.join(save_path, 'categories.json'), 'w', encoding='utf-8') as f:
-            json.dump({'categories': self.categories}, f, ensure_ascii=False, indent=2)
+            json.dump({
+                'categories': self.categories,
+                'stemming': self.stemming,
+                'features': self.features
+            }, f, ensure_ascii=False, indent=2)
 
         print(f"Model saved to {save_path}")
 
-    def load_model(self, model_path: str):
-        """Load trained model from disk"""
-        try:
-            self.vectorizer = joblib.load(os.path.join(model_path, 'vectorizer.pkl'))
-            self.model = joblib.load(os.path.join(model_path, 'model.pkl'))
+    def load_model(self, model_path: str, use_artifact: bool = True, verify: bool = None):
+        """
+        Load trained model from disk
+
+        Args:
+            model_path: Model directory
+            use_artifact: Prefer the memory-mapped, pickle-free artifact;
+                the joblib pickles are used if it is missing or invalid
+            verify: Hash the artifact files against the manifest (default
+                MODEL_VERIFY_ARTIFACTS env; registered versions are verified
+                once, at registration)
+        """
+        if verify is None:
+            verify = os.getenv('MODEL_VERIFY_ARTIFACTS', 'false').lower() in ('1', 'true', 'yes')
 
+        try:
             with open(os.path.join(model_path, 'categories.json'), 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 self.categories = data['categories']
+                self.stemming = data.get('stemming', False)
+                self.features = data.get('features', {'mode': 'tfidf'})
+
+            if use_artifact and os.path.exists(os.path.join(model_path, MANIFEST_FILE)):
+                try:
+                    # Inference only: sklearn objects are not needed to serve
+                    self.engine = LinearInferenceEngine.load(model_path, mmap=True, verify=verify)
+                    self.vectorizer = None
+                    self.model = None
+                    self.is_trained = True
+                    self._set_model_version(read_manifest(model_path)['checksum'][:12])
+                    print(f"Model loaded from {model_path} (artifact)")
+                    return
+                except (ArtifactError, OSError, ValueError, KeyError) as e:
+                    print(f"Warning: Could not load model artifact, falling back to pickle: {e}")
+
+            self.vectorizer = joblib.load(os.path.join(model_path, 'vectorizer.pkl'))
+            self.model = joblib.load(os.path.join(model_path, 'model.pkl'))
 
             self.is_trained = True
+            self._build_engine()
+            self._set_model_version()
             print(f"Model loaded from {model_path}")
 
         except Exception as e:
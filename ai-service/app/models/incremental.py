@@ -0,0 +1,313 @@
+"""
+Incremental learning from doctor-reviewed triage records
+SGD logistic regression over a fixed hashed feature space, updated with
+partial_fit on mini-batches, with versioned checkpoints and rollback
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.models.classifier import SymptomClassifier, DEFAULT_HASH_FEATURES
+from app.utils.corpus_stream import iter_chunks
+from app.utils.preprocessor import preprocess_many
+from app.utils.versioning import (
+    version_name, list_version_numbers, read_current, write_current, staging_path, publish_version, is_true
+)
+
+
+CHECKPOINT_FILE = 'checkpoint.json'
+LABEL_COLUMNS = ('category', 'primary_category')
+
+
+class IncrementalLearner:
+    """Online SGD classifier with checkpoints that load as a SymptomClassifier"""
+
+    def __init__(
+        self,
+        checkpoint_dir: str,
+        classes: Iterable[str] = None,
+        n_features: int = DEFAULT_HASH_FEATURES,
+        alpha: float = 1e-4,
+        keep: int = 10,
+        seed_path: str = None,
+        seed_epochs: int = 5
+    ):
+        """
+        Initialize learner, resuming from the current checkpoint if any
+
+        A fresh learner should be seeded with the base training dataset, so
+        its first checkpoints start near the production model instead of
+        from an untrained one.
+
+        Args:
+            checkpoint_dir: Directory holding versioned checkpoints
+            classes: Fixed category set (default: the seed dataset's categories)
+            n_features: Size of the hashed feature space
+            alpha: SGD regularization strength
+            keep: Number of checkpoint versions to retain
+            seed_path: Base dataset (complaint, category) a fresh learner is
+                first trained on
+            seed_epochs: Passes over the seed dataset
+        """
+        self.checkpoint_dir = checkpoint_dir
+        self.keep = keep
+        self.version = 0
+        self.samples_seen = 0
+        self.batches = 0
+        self.seeded_from = None
+
+        if self.current_version() is not None:
+            self._load(self.current_version())
+            return
+
+        if not classes and seed_path:
+            classes = pd.read_csv(seed_path, usecols=['category'])['category'].dropna().unique()
+        if classes is None or not len(classes):
+            raise ValueError("A fresh incremental learner needs the category set (classes or seed_path)")
+
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+
+        # Stateless features: the same columns for every mini-batch, forever
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm='l2',
+            lowercase=True
+        )
+        self.model = SGDClassifier(loss='log_loss', alpha=alpha, random_state=42)
+        self.classes = sorted(set(classes))
+
+        if seed_path:
+            self.seed(seed_path, epochs=seed_epochs)
+
+    def seed(self, dataset_path: str, epochs: int = 5, batch_size: int = 512) -> Dict:
+        """
+        Train a fresh learner on the base dataset before any reviewed records
+
+        Args:
+            dataset_path: Base training dataset (complaint, category)
+            epochs: Passes over the dataset
+            batch_size: Rows per mini-batch
+
+        Returns:
+            Aggregate rows learned / skipped and elapsed seconds
+        """
+        if self.samples_seen:
+            raise ValueError("Only a fresh learner can be seeded")
+        stats = self.learn_from_file(dataset_path, batch_size=batch_size, reviewed_only=False, epochs=epochs)
+        self.seeded_from = os.path.basename(dataset_path)
+        print(f"[INFO] Seeded from {self.seeded_from}: {stats['rows']} rows over {epochs} epochs")
+        return stats
+
+    def partial_fit(self, complaints: Iterable[str], categories: Iterable[str]) -> Dict:
+        """
+        Update the model with one mini-batch of verified pairs
+
+        Args:
+            complaints: Raw complaint texts (preprocessed as at serving time)
+            categories: Verified categories; unknown categories are skipped
+
+        Returns:
+            Rows learned, rows skipped and elapsed seconds
+        """
+        start = time.perf_counter()
+        batch = pd.DataFrame({'complaint': list(complaints), 'category': list(categories)})
+        known = batch['category'].isin(self.classes)
+        skipped = int((~known).sum())
+        batch = batch[known]
+
+        if not batch.empty:
+            # The serving path classifies preprocessed text, so learn on the same
+            texts = preprocess_many(batch['complaint'])['processed']
+            X = self.vectorizer.transform(texts)
+            self.model.partial_fit(X, batch['category'].values, classes=np.array(self.classes))
+            self.samples_seen += len(batch)
+            self.batches += 1
+
+        return {
+            'rows': len(batch),
+            'skipped': skipped,
+            'seconds': time.perf_counter() - start
+        }
+
+    def learn_from_file(
+        self,
+        path: str,
+        batch_size: int = 512,
+        reviewed_only: bool = True,
+        label_column: str = None,
+        epochs: int = 1
+    ) -> Dict:
+        """
+        Stream a record export (NDJSON, CSV or Parquet) through partial_fit
+
+        Args:
+            path: Export of triage records
+            batch_size: Rows per mini-batch
+            reviewed_only: Keep only rows with doctor_reviewed true
+            label_column: Category column (default 'category', else 'primary_category')
+            epochs: Passes over the file
+
+        Returns:
+            Aggregate rows learned / skipped and elapsed seconds
+
+        Raises:
+            ValueError: reviewed_only is set but the export has no
+                doctor_reviewed column, or there is no category column
+        """
+        totals = {'rows': 0, 'skipped': 0, 'unreviewed': 0, 'seconds': 0.0}
+        start = time.perf_counter()
+
+        for _ in range(epochs):
+            for chunk in iter_chunks(path, chunk_size=batch_size):
+                if reviewed_only:
+                    if 'doctor_reviewed' not in chunk.columns:
+                        raise ValueError(
+                            f"No doctor_reviewed column in {path}; pass reviewed_only=False "
+                            f"to learn from every row"
+                        )
+                    reviewed = chunk['doctor_reviewed'].map(is_true)
+                    totals['unreviewed'] += int((~reviewed).sum())
+                    chunk = chunk[reviewed]
+
+                column = label_column or next((name for name in LABEL_COLUMNS if name in chunk.columns), None)
+                if column is None:
+                    raise ValueError(f"No category column in {path} (expected one of {', '.join(LABEL_COLUMNS)})")
+
+                chunk = chunk.dropna(subset=['complaint', column])
+                stats = self.partial_fit(chunk['complaint'], chunk[column])
+                totals['rows'] += stats['rows']
+                totals['skipped'] += stats['skipped']
+
+        totals['seconds'] = time.perf_counter() - start
+        return totals
+
+    def to_classifier(self) -> SymptomClassifier:
+        """Current model as a servable SymptomClassifier"""
+        if not hasattr(self.model, 'coef_'):
+            raise ValueError("Model has not learned any batch yet")
+
+        return SymptomClassifier.from_fitted(
+            self.vectorizer,
+            self.model,
+            categories=self.classes,
+            features={'mode': 'hashing', 'n_features': self.vectorizer.n_features, 'idf': False, 'learner': 'sgd'}
+        )
+
+    def evaluate(self, complaints: Iterable[str], categories: Iterable[str]) -> float:
+        """Top-1 accuracy on preprocessed complaints"""
+        texts = preprocess_many(list(complaints))['processed']
+        predicted = self.to_classifier().predict_batch(texts, top_k=1).categories[:, 0]
+        return float(np.mean(predicted == np.asarray(list(categories))))
+
+    # Checkpoints
+
+    def _version_path(self, version: int) -> str:
+        return os.path.join(self.checkpoint_dir, version_name(version))
+
+    def list_versions(self) -> List[int]:
+        """Available checkpoint versions, oldest first"""
+        return list_version_numbers(self.checkpoint_dir)
+
+    def current_version(self) -> Optional[int]:
+        """Version the CURRENT pointer refers to"""
+        return read_current(self.checkpoint_dir)
+
+    def current_path(self) -> Optional[str]:
+        """Model directory of the current checkpoint (loadable by SymptomClassifier)"""
+        version = self.current_version()
+        return self._version_path(version) if version is not None else None
+
+    def _set_current(self, version: int):
+        write_current(self.checkpoint_dir, version)
+
+    def checkpoint(self, note: str = None) -> int:
+        """
+        Save the current model as a new version and make it current
+
+        The version directory is written under a temporary name and renamed
+        into place, so a crash never leaves a half-written checkpoint.
+
+        Returns:
+            New version number
+        """
+        versions = self.list_versions()
+        version = (versions[-1] if versions else 0) + 1
+        tmp_path = staging_path(self.checkpoint_dir, version_name(version))
+
+        self.to_classifier().save_model(tmp_path)
+        with open(os.path.join(tmp_path, CHECKPOINT_FILE), 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': version,
+                'parent': self.version or None,
+                'samples_seen': self.samples_seen,
+                'batches': self.batches,
+                'seeded_from': self.seeded_from,
+                'created_at': datetime.now().isoformat(),
+                'note': note
+            }, f, ensure_ascii=False, indent=2)
+
+        publish_version(tmp_path, self.checkpoint_dir, version_name(version))
+        self._set_current(version)
+        self.version = version
+        self._prune()
+        return version
+
+    def rollback(self, version: int = None) -> int:
+        """
+        Make an earlier checkpoint current and continue learning from it
+
+        Args:
+            version: Target version (default: the one before the current)
+
+        Returns:
+            Version now current
+        """
+        versions = self.list_versions()
+        current = self.current_version()
+
+        if version is None:
+            earlier = [v for v in versions if current is not None and v < current]
+            if not earlier:
+                raise ValueError("No earlier checkpoint to roll back to")
+            version = earlier[-1]
+        elif version not in versions:
+            raise ValueError(f"Checkpoint version not found: {version}")
+
+        self._load(version)
+        self._set_current(version)
+        return version
+
+    def _load(self, version: int):
+        """Restore learner state from a checkpoint"""
+        path = self._version_path(version)
+        classifier = SymptomClassifier()
+        # The sklearn objects are needed to keep calling partial_fit
+        classifier.load_model(path, use_artifact=False)
+
+        with open(os.path.join(path, CHECKPOINT_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        self.vectorizer = classifier.vectorizer
+        self.model = classifier.model
+        self.classes = list(classifier.categories)
+        self.version = version
+        self.samples_seen = meta.get('samples_seen', 0)
+        self.batches = meta.get('batches', 0)
+        self.seeded_from = meta.get('seeded_from')
+
+    def _prune(self):
+        """Delete the oldest versions beyond `keep` (never the current one)"""
+        current = self.current_version()
+        old = [v for v in self.list_versions() if v != current]
+        for version in old[:max(0, len(old) - (self.keep - 1))]:
+            shutil.rmtree(self._version_path(version), ignore_errors=True)
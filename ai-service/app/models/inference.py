@@ -0,0 +1,810 @@
+"""
+Inference-only scorer for the TF-IDF + Logistic Regression classifier
+Re-implements transform + predict_proba in plain NumPy, without sklearn's
+per-call validation overhead
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+from collections.abc import Mapping
+from functools import lru_cache, partial
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# Pickle-free artifact: .npy arrays (memory-mappable) + JSON manifest
+ARTIFACT_FORMAT = 'triage-linear-tfidf'
+ARTIFACT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+ARTIFACT_ARRAYS = ('vocabulary', 'idf', 'weights', 'intercept')
+
+# Compressed artifacts store pruned, reduced-precision weights in CSR form
+COMPRESSED_ARTIFACT_VERSION = 2
+COMPRESSED_ARRAYS = ('vocabulary', 'idf', 'intercept', 'weight_indptr', 'weight_classes', 'weight_values', 'weight_scales')
+PRECISIONS = ('float64', 'float32', 'float16', 'int8')
+
+
+class ArtifactError(ValueError):
+    """Artifact is missing, incompatible or fails its checksum"""
+
+
+class UnsupportedModelError(ValueError):
+    """The fitted vectorizer/model uses options the engine does not replicate"""
+
+
+def murmurhash3_32(data: bytes, seed: int = 0) -> int:
+    """Signed 32-bit MurmurHash3 (x86), as used by sklearn's HashingVectorizer"""
+    c1, c2 = 0xcc9e2d51, 0x1b873593
+    length = len(data)
+    h = seed & 0xffffffff
+    block_end = length & ~3
+
+    for i in range(0, block_end, 4):
+        k = int.from_bytes(data[i:i + 4], 'little')
+        k = (k * c1) & 0xffffffff
+        k = ((k << 15) | (k >> 17)) & 0xffffffff
+        k = (k * c2) & 0xffffffff
+        h ^= k
+        h = ((h << 13) | (h >> 19)) & 0xffffffff
+        h = (h * 5 + 0xe6546b64) & 0xffffffff
+
+    tail = data[block_end:]
+    if tail:
+        k = int.from_bytes(tail, 'little')
+        k = (k * c1) & 0xffffffff
+        k = ((k << 15) | (k >> 17)) & 0xffffffff
+        k = (k * c2) & 0xffffffff
+        h ^= k
+
+    h ^= length
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & 0xffffffff
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & 0xffffffff
+    h ^= h >> 16
+
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+def hash_feature_index(term: str, n_features: int) -> int:
+    """Column of a term in a hashed feature space (sklearn-compatible)"""
+    h = murmurhash3_32(term.encode('utf-8'))
+    if h == -2147483648:
+        # sklearn's definition of abs(-2**31) % n_features
+        return (2147483647 - (n_features - 1)) % n_features
+    return abs(h) % n_features
+
+
+class SparseWeights(NamedTuple):
+    """Pruned coefficients, feature-major CSR: weight = value * scales[class]"""
+    indptr: np.ndarray
+    classes: np.ndarray
+    values: np.ndarray
+    scales: np.ndarray
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self.indptr) - 1, len(self.scales))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self)
+
+    def to_dense(self) -> np.ndarray:
+        """(n_features, n_classes) float64 weights"""
+        dense = np.zeros(self.shape)
+        features = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        dense[features, self.classes] = self.values.astype(np.float64) * self.scales[self.classes]
+        return dense
+
+
+def compress_weights(weights: np.ndarray, prune: float = 0.0, precision: str = 'float16') -> SparseWeights:
+    """
+    Prune and quantize a (n_features, n_classes) weight matrix
+
+    Args:
+        weights: Dense feature-major weights
+        prune: Drop weights whose magnitude is below this fraction of the
+            largest magnitude in their class (0 keeps every non-zero weight)
+        precision: Storage type of the kept weights; int8 uses a symmetric
+            per-class scale (largest magnitude -> 127)
+
+    Returns:
+        SparseWeights
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision} (choose from {', '.join(PRECISIONS)})")
+
+    weights = np.asarray(weights, dtype=np.float64)
+    class_max = np.abs(weights).max(axis=0)
+    class_max[class_max == 0] = 1.0
+
+    if precision == 'int8':
+        scales = class_max / 127.0
+        quantized = np.clip(np.rint(weights / scales), -127, 127)
+    else:
+        scales = np.ones(weights.shape[1])
+        quantized = weights.astype(precision)
+
+    keep = (np.abs(weights) >= prune * class_max) & (quantized != 0)
+    features, classes = np.nonzero(keep)
+    class_dtype = np.uint8 if weights.shape[1] <= 256 else np.uint16 if weights.shape[1] <= 65536 else np.int32
+
+    return SparseWeights(
+        indptr=np.concatenate([[0], np.cumsum(keep.sum(axis=1))]).astype(np.int32),
+        classes=classes.astype(class_dtype),
+        values=quantized[features, classes].astype(precision),
+        scales=scales
+    )
+
+
+class SortedVocabulary(Mapping):
+    """
+    Read-only term -> feature index view over a sorted term array
+
+    Feature index is the position in the array, and terms are found by
+    binary search, so a memory-mapped vocabulary is used in place: no
+    per-process dict is built and its pages stay shared across workers.
+    """
+
+    def __init__(self, terms: np.ndarray):
+        """
+        Args:
+            terms: Unicode array of terms in feature order, strictly ascending
+        """
+        self.terms = terms
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __iter__(self):
+        return (str(term) for term in self.terms)
+
+    def __getitem__(self, term: str) -> int:
+        index = self.get(term)
+        if index is None:
+            raise KeyError(term)
+        return index
+
+    def get(self, term: str, default: Optional[int] = None) -> Optional[int]:
+        position = int(np.searchsorted(self.terms, term))
+        if position < len(self.terms) and self.terms[position] == term:
+            return position
+        return default
+
+    def lookup(self, terms: Sequence[str]) -> np.ndarray:
+        """Feature index of every term (-1 for unknown terms), in one vectorized search"""
+        if not len(terms) or not len(self.terms):
+            return np.full(len(terms), -1, dtype=np.intp)
+        queries = np.array(terms)
+        positions = np.searchsorted(self.terms, queries)
+        clipped = np.minimum(positions, len(self.terms) - 1)
+        return np.where(self.terms[clipped] == queries, clipped, -1)
+
+
+def is_strictly_sorted(terms: np.ndarray) -> bool:
+    """Whether a term array can back a SortedVocabulary"""
+    return bool(len(terms) < 2 or (terms[:-1] < terms[1:]).all())
+
+
+def _coordinates(row_counts: List[Dict[int, int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(row ids, feature indices, counts) from per-row counts, features sorted within each row"""
+    rows, columns, counts = [], [], []
+    for row, term_counts in enumerate(row_counts):
+        for index in sorted(term_counts):
+            rows.append(row)
+            columns.append(index)
+            counts.append(term_counts[index])
+
+    return (
+        np.array(rows, dtype=np.intp),
+        np.array(columns, dtype=np.intp),
+        np.array(counts, dtype=np.float64)
+    )
+
+
+class LinearInferenceEngine:
+    """TF-IDF (vocabulary or hashed) vectorization and linear softmax scoring in NumPy"""
+
+    def __init__(
+        self,
+        vocabulary: Union[Dict[str, int], Sequence[str], None],
+        idf: np.ndarray,
+        weights: np.ndarray,
+        intercept: np.ndarray,
+        classes: Sequence[str],
+        token_pattern: str = r"(?u)\b\w\w+\b",
+        ngram_range: Tuple[int, int] = (1, 1),
+        lowercase: bool = True,
+        binary: bool = False,
+        sublinear_tf: bool = False,
+        norm: str = 'l2',
+        multinomial: bool = True,
+        hash_features: int = None
+    ):
+        """
+        Initialize engine from fitted parameters
+
+        Args:
+            vocabulary: Term -> feature index (dict or SortedVocabulary), or
+                terms in feature order (None in hashing mode)
+            idf: Inverse document frequency per feature (None = no idf)
+            weights: (n_features, n_classes or 1) coefficients, feature-major,
+                or SparseWeights from compress_weights()
+            intercept: (n_classes or 1,) biases
+            classes: Class labels in probability column order
+            token_pattern, ngram_range, lowercase: Analyzer settings
+            binary, sublinear_tf, norm: Term weighting settings
+            multinomial: Softmax (True) or one-vs-rest sigmoid (False) probabilities
+            hash_features: Size of the hashed feature space; terms are mapped
+                by MurmurHash3 instead of a vocabulary
+        """
+        if norm not in ('l1', 'l2', None):
+            raise UnsupportedModelError(f"Unsupported norm: {norm}")
+
+        self.hash_features = hash_features
+        self._hash_index = None
+        if hash_features:
+            vocabulary = {}
+            # Bounded memo of term -> column; hashing itself needs no state
+            self._hash_index = lru_cache(maxsize=1 << 16)(partial(hash_feature_index, n_features=hash_features))
+        elif not isinstance(vocabulary, (dict, SortedVocabulary)):
+            vocabulary = {term: index for index, term in enumerate(vocabulary)}
+        self.vocabulary = vocabulary
+        self.idf = None if idf is None else np.asarray(idf, dtype=np.float64)
+        # Feature-major weights so one row gather serves every class; arrays
+        # loaded with mmap are used in place, without a copy
+        if isinstance(weights, SparseWeights):
+            self.weights = None
+            self.sparse_weights = weights
+        else:
+            self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+            self.sparse_weights = None
+        self.compression = None
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.token_pattern = token_pattern
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+        self.binary = binary
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.multinomial = multinomial
+        self._token_regex = re.compile(token_pattern)
+        # Built on first use for a mapped vocabulary, so loading stays cheap
+        self._unigrams = self._bigrams = None
+        self._lookup_ready = False
+        if not isinstance(vocabulary, SortedVocabulary):
+            self._ensure_lookup()
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, model) -> 'LinearInferenceEngine':
+        """
+        Extract an engine from a fitted vectorizer and LogisticRegression
+        (or SGDClassifier with log loss)
+
+        Supported vectorizers: TfidfVectorizer, HashingVectorizer, or a
+        Pipeline of HashingVectorizer(norm=None) followed by TfidfTransformer.
+
+        Raises:
+            UnsupportedModelError: If the vectorizer uses a custom analyzer,
+                tokenizer, preprocessor, stop words, accent stripping or
+                alternating hash signs
+        """
+        weighting = vectorizer
+        if hasattr(vectorizer, 'steps'):
+            vectorizer, weighting = vectorizer.steps[0][1], vectorizer.steps[-1][1]
+            if getattr(vectorizer, 'norm', None) is not None:
+                raise UnsupportedModelError("Hashing step must not normalize before TfidfTransformer")
+
+        for name in ('preprocessor', 'tokenizer', 'stop_words', 'strip_accents'):
+            if getattr(vectorizer, name, None) is not None:
+                raise UnsupportedModelError(f"Unsupported vectorizer option: {name}")
+        if vectorizer.analyzer != 'word':
+            raise UnsupportedModelError(f"Unsupported analyzer: {vectorizer.analyzer}")
+
+        hash_features = getattr(vectorizer, 'n_features', None)
+        if hash_features and vectorizer.alternate_sign:
+            raise UnsupportedModelError("Unsupported vectorizer option: alternate_sign")
+
+        use_idf = getattr(weighting, 'use_idf', False)
+
+        if hasattr(model, 'loss'):
+            # SGDClassifier: one-vs-rest logistic probabilities
+            if model.loss != 'log_loss':
+                raise UnsupportedModelError(f"Unsupported SGD loss: {model.loss}")
+            ovr = True
+        else:
+            # Mirrors LogisticRegression.predict_proba's choice of link function
+            multi_class = getattr(model, 'multi_class', 'auto')
+            ovr = multi_class in ('ovr', 'warn') or (
+                multi_class in ('auto', 'deprecated')
+                and (len(model.classes_) <= 2 or getattr(model, 'solver', None) == 'liblinear')
+            )
+
+        return cls(
+            vocabulary=None if hash_features else vectorizer.vocabulary_,
+            idf=weighting.idf_ if use_idf else None,
+            weights=model.coef_.T,
+            intercept=model.intercept_,
+            classes=model.classes_,
+            token_pattern=vectorizer.token_pattern,
+            ngram_range=vectorizer.ngram_range,
+            lowercase=vectorizer.lowercase,
+            binary=vectorizer.binary,
+            sublinear_tf=getattr(weighting, 'sublinear_tf', False),
+            norm=weighting.norm,
+            multinomial=not ovr,
+            hash_features=hash_features
+        )
+
+    def _build_lookup(self):
+        """
+        Unigram and bigram lookup tables from the vocabulary
+
+        Bigrams are indexed first token -> second token -> feature, so a
+        complaint is counted straight from its tokens without building any
+        n-gram strings. Only used when every term re-tokenizes to itself
+        (the tables are then exactly equivalent to the analyzer).
+
+        Returns:
+            (unigrams or None, bigrams or None); (None, None) = use analyze()
+        """
+        min_n, max_n = self.ngram_range
+        if self.hash_features or max_n > 2:
+            return None, None
+
+        if isinstance(self.vocabulary, SortedVocabulary):
+            items = ((term, index) for index, term in enumerate(self.vocabulary.terms.tolist()))
+        else:
+            items = self.vocabulary.items()
+
+        unigrams, bigrams = {}, {}
+        for term, index in items:
+            tokens = term.split(' ')
+            if self._token_regex.findall(term) != tokens or not min_n <= len(tokens) <= max_n:
+                return None, None
+            if len(tokens) == 1:
+                unigrams[term] = index
+            else:
+                bigrams.setdefault(tokens[0], {})[tokens[1]] = index
+
+        return (unigrams if min_n == 1 else None), (bigrams if max_n == 2 else None)
+
+    def _ensure_lookup(self) -> bool:
+        """Build the lookup tables once; whether they serve this engine"""
+        if not self._lookup_ready:
+            # Concurrent first calls may both build; the flag is set last,
+            # so a reader that sees it also sees both tables
+            self._unigrams, self._bigrams = self._build_lookup()
+            self._lookup_ready = True
+        return self._unigrams is not None or self._bigrams is not None
+
+    def _count_terms(self, text: str) -> Dict[int, int]:
+        """Feature index -> term count of one text (lookup-table fast path)"""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_regex.findall(text)
+        counts = {}
+
+        if self._unigrams is not None:
+            unigrams = self._unigrams
+            for token in tokens:
+                index = unigrams.get(token)
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+
+        if self._bigrams:
+            bigrams = self._bigrams
+            for position in range(len(tokens) - 1):
+                following = bigrams.get(tokens[position])
+                if following is not None:
+                    index = following.get(tokens[position + 1])
+                    if index is not None:
+                        counts[index] = counts.get(index, 0) + 1
+
+        return counts
+
+    def analyze(self, text: str) -> List[str]:
+        """Word n-grams, as TfidfVectorizer's default word analyzer"""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_regex.findall(text)
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+
+        ngrams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            ngrams.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return ngrams
+
+    def transform(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sparse TF-IDF matrix of a batch, in coordinate form
+
+        Returns:
+            (row ids, feature indices, weights); features sorted within each row
+        """
+        if isinstance(self.vocabulary, SortedVocabulary) and not self._ensure_lookup():
+            rows, columns, values = self._count_sorted(texts)
+        else:
+            rows, columns, values = self._count_mapped(texts)
+
+        if self.binary:
+            values[:] = 1.0
+        elif self.sublinear_tf:
+            values = np.log(values) + 1.0
+        if self.idf is not None:
+            values *= self.idf[columns]
+
+        if self.norm is not None and len(values):
+            if self.norm == 'l2':
+                norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(texts)))
+            else:
+                norms = np.bincount(rows, weights=np.abs(values), minlength=len(texts))
+            norms[norms == 0] = 1.0
+            values /= norms[rows]
+
+        return rows, columns, values
+
+    def _count_mapped(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Term counts in coordinate form (dict vocabulary or hashing)"""
+        feature_index = self._hash_index or self.vocabulary.get
+        fast_path = self._unigrams is not None or self._bigrams is not None
+        row_counts = []
+        for text in texts:
+            if fast_path:
+                term_counts = self._count_terms(text)
+            else:
+                term_counts = {}
+                for term in self.analyze(text):
+                    index = feature_index(term)
+                    if index is not None:
+                        term_counts[index] = term_counts.get(index, 0) + 1
+            row_counts.append(term_counts)
+        return _coordinates(row_counts)
+
+    def _count_sorted(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Term counts in coordinate form, looked up in the sorted term array once per batch"""
+        analyzed = [self.analyze(text) for text in texts]
+        indices = self.vocabulary.lookup([term for terms in analyzed for term in terms]).tolist()
+
+        row_counts = []
+        start = 0
+        for terms in analyzed:
+            term_counts = {}
+            for index in indices[start:start + len(terms)]:
+                if index >= 0:
+                    term_counts[index] = term_counts.get(index, 0) + 1
+            start += len(terms)
+            row_counts.append(term_counts)
+        return _coordinates(row_counts)
+
+    def feature_terms(self) -> List[str]:
+        """Vocabulary terms in feature order (empty in hashing mode)"""
+        if isinstance(self.vocabulary, SortedVocabulary):
+            return self.vocabulary.terms.tolist()
+        return sorted(self.vocabulary, key=self.vocabulary.get)
+
+    def transform_csr(self, texts: Sequence[str]):
+        """
+        TF-IDF matrix as scipy CSR, identical to the fitted vectorizer's
+        transform() (same indices, dtypes and float64 values, bit for bit)
+        """
+        import scipy.sparse as sp
+
+        rows, columns, values = self.transform(texts)
+        n_features = self.hash_features or len(self.vocabulary)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(texts)))])
+        return sp.csr_matrix(
+            (values, columns.astype(np.int32), indptr.astype(np.int32)),
+            shape=(len(texts), n_features)
+        )
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        """(n, n_classes or 1) linear scores"""
+        rows, columns, values = self.transform(texts)
+        scores = np.tile(self.intercept, (len(texts), 1))
+        if self.sparse_weights is not None:
+            self._add_sparse_scores(scores, rows, columns, values)
+        else:
+            # Sparse dot product: gather one weight row per non-zero feature
+            np.add.at(scores, rows, self.weights[columns] * values[:, None])
+        return scores
+
+    def _add_sparse_scores(self, scores: np.ndarray, rows: np.ndarray, columns: np.ndarray, values: np.ndarray):
+        """Sparse dot product against pruned CSR weights, dequantized on the fly"""
+        weights = self.sparse_weights
+        starts = weights.indptr[columns].astype(np.intp)
+        lengths = weights.indptr[columns + 1].astype(np.intp) - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return
+
+        # Position of every stored weight the batch touches, feature by feature
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        classes = weights.classes[offsets].astype(np.intp)
+        contributions = weights.values[offsets].astype(np.float64) * weights.scales[classes]
+        contributions *= np.repeat(values, lengths)
+        # bincount over flat (row, class) cells: one pass, no scatter conflicts
+        cells = np.repeat(rows, lengths) * scores.shape[1] + classes
+        scores += np.bincount(cells, weights=contributions, minlength=scores.size).reshape(scores.shape)
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Class probabilities, columns ordered as classes_
+
+        Args:
+            texts: Feature texts (as passed to the vectorizer)
+
+        Returns:
+            (n, n_classes) probabilities
+        """
+        scores = self.decision_function(texts)
+
+        if self.multinomial:
+            if scores.shape[1] == 1:
+                scores = np.hstack([-scores, scores])
+            scores -= scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+            scores /= scores.sum(axis=1, keepdims=True)
+            return scores
+
+        probabilities = 1.0 / (1.0 + np.exp(-scores))
+        if probabilities.shape[1] == 1:
+            return np.hstack([1.0 - probabilities, probabilities])
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def dense_weights(self) -> np.ndarray:
+        """(n_features, n_classes or 1) float64 weights, whatever the storage"""
+        if self.sparse_weights is not None:
+            return self.sparse_weights.to_dense()
+        return self.weights
+
+    @property
+    def coefficient_nbytes(self) -> int:
+        """In-memory size of the weights and intercept"""
+        weights = self.sparse_weights if self.sparse_weights is not None else self.weights
+        return weights.nbytes + self.intercept.nbytes
+
+    def compress(self, prune: float = 0.0, precision: str = 'float16') -> 'LinearInferenceEngine':
+        """
+        Copy of the engine with pruned, reduced-precision weights
+
+        Args:
+            prune: Relative magnitude threshold per class (see compress_weights)
+            precision: float64, float32, float16 or int8
+
+        Returns:
+            New engine; self is unchanged
+        """
+        weights = compress_weights(self.dense_weights(), prune=prune, precision=precision)
+        engine = copy.copy(self)
+        engine.weights = None
+        engine.sparse_weights = weights
+        engine.compression = {
+            'prune': prune,
+            'precision': precision,
+            'nnz': int(len(weights.values)),
+            'density': round(len(weights.values) / max(1, weights.shape[0] * weights.shape[1]), 6)
+        }
+        return engine
+
+    def get_config(self) -> Dict:
+        """Analyzer and weighting settings (JSON-serializable)"""
+        return {
+            'token_pattern': self.token_pattern,
+            'ngram_range': list(self.ngram_range),
+            'lowercase': self.lowercase,
+            'binary': self.binary,
+            'sublinear_tf': self.sublinear_tf,
+            'norm': self.norm,
+            'multinomial': self.multinomial,
+            'hash_features': self.hash_features
+        }
+
+    def save(self, path: str, metadata: Dict = None) -> Dict:
+        """
+        Export the engine as a pickle-free artifact
+
+        Writes vocabulary.npy (terms in feature order; sklearn vocabularies
+        are alphabetical, empty in hashing mode), idf.npy, weights.npy and
+        intercept.npy, then
+        manifest.json with per-file SHA-256 and an overall checksum. The
+        manifest is written last, so a partial export is never loadable.
+        A vocabulary in ascending order is flagged so load() can look terms
+        up in the memory-mapped array directly.
+        A compressed engine writes weight_indptr/classes/values/scales.npy
+        instead of weights.npy (artifact version 2).
+
+        Args:
+            path: Model directory
+            metadata: Extra JSON fields stored in the manifest
+
+        Returns:
+            Manifest
+        """
+        os.makedirs(path, exist_ok=True)
+
+        if isinstance(self.vocabulary, SortedVocabulary):
+            vocabulary = self.vocabulary.terms
+        else:
+            terms = self.feature_terms()
+            vocabulary = np.array(terms, dtype=f'<U{max(map(len, terms), default=1)}')
+        arrays = {
+            'vocabulary': vocabulary,
+            'idf': self.idf if self.idf is not None else np.empty(0),
+            'intercept': self.intercept,
+        }
+        if self.sparse_weights is not None:
+            names = COMPRESSED_ARRAYS
+            for field, array in self.sparse_weights._asdict().items():
+                arrays[f'weight_{field}'] = array
+        else:
+            names = ARTIFACT_ARRAYS
+            arrays['weights'] = self.weights
+
+        files = {}
+        for name in names:
+            filename = f'{name}.npy'
+            np.save(os.path.join(path, filename), np.ascontiguousarray(arrays[name]))
+            files[name] = {
+                'file': filename,
+                'dtype': arrays[name].dtype.str,
+                'shape': list(arrays[name].shape),
+                'sha256': _file_sha256(os.path.join(path, filename))
+            }
+
+        manifest = {
+            'format': ARTIFACT_FORMAT,
+            'version': ARTIFACT_VERSION if self.sparse_weights is None else COMPRESSED_ARTIFACT_VERSION,
+            'classes': [str(label) for label in self.classes_],
+            'use_idf': self.idf is not None,
+            'vocabulary_sorted': is_strictly_sorted(vocabulary),
+            'config': self.get_config(),
+            'arrays': files,
+            'checksum': _combined_checksum(files, names),
+            'metadata': metadata or {}
+        }
+        if self.compression is not None:
+            manifest['compression'] = self.compression
+
+        tmp_path = os.path.join(path, MANIFEST_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, os.path.join(path, MANIFEST_FILE))
+
+        return manifest
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, verify: bool = False) -> 'LinearInferenceEngine':
+        """
+        Load a pickle-free artifact
+
+        File contents are not hashed by default (see verify_artifact(),
+        run once when a model is registered); dtypes and shapes are always
+        checked against the manifest.
+
+        Args:
+            path: Model directory containing manifest.json
+            mmap: Memory-map the arrays read-only (pages shared across workers)
+            verify: Also check every file's SHA-256 against the manifest
+
+        Raises:
+            ArtifactError: Missing files, unknown format or checksum mismatch
+        """
+        manifest = verify_artifact(path) if verify else read_manifest(path)
+        files = manifest['arrays']
+        compressed = manifest['version'] == COMPRESSED_ARTIFACT_VERSION
+        names = COMPRESSED_ARRAYS if compressed else ARTIFACT_ARRAYS
+
+        if _combined_checksum(files, names) != manifest.get('checksum'):
+            raise ArtifactError("Manifest checksum mismatch")
+
+        arrays = {}
+        for name in names:
+            entry = files.get(name)
+            if entry is None:
+                raise ArtifactError(f"Artifact is missing array: {name}")
+            file_path = os.path.join(path, entry['file'])
+            array = np.load(file_path, mmap_mode='r' if mmap else None, allow_pickle=False)
+            if array.dtype.str != entry['dtype'] or list(array.shape) != entry['shape']:
+                raise ArtifactError(f"Unexpected dtype/shape: {entry['file']}")
+            # Plain ndarray view of the mapping: same shared pages, without
+            # np.memmap's per-operation subclass overhead
+            arrays[name] = array.view(np.ndarray) if mmap else array
+
+        if compressed:
+            weights = SparseWeights(*(arrays[f'weight_{field}'] for field in SparseWeights._fields))
+        else:
+            weights = arrays['weights']
+
+        # Sorted vocabularies are searched in place (older artifacts are checked)
+        terms = arrays['vocabulary']
+        sorted_terms = manifest.get('vocabulary_sorted')
+        if sorted_terms is None:
+            sorted_terms = is_strictly_sorted(terms)
+        vocabulary = SortedVocabulary(terms) if sorted_terms else terms.tolist()
+
+        config = manifest['config']
+        engine = cls(
+            vocabulary=vocabulary,
+            idf=arrays['idf'] if manifest['use_idf'] else None,
+            weights=weights,
+            intercept=arrays['intercept'],
+            classes=manifest['classes'],
+            token_pattern=config['token_pattern'],
+            ngram_range=tuple(config['ngram_range']),
+            lowercase=config['lowercase'],
+            binary=config['binary'],
+            sublinear_tf=config['sublinear_tf'],
+            norm=config['norm'],
+            multinomial=config['multinomial'],
+            hash_features=config.get('hash_features')
+        )
+        engine.compression = manifest.get('compression')
+        return engine
+
+
+def read_manifest(path: str) -> Dict:
+    """Read and validate an artifact manifest"""
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise ArtifactError(f"No artifact manifest in {path}")
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != ARTIFACT_FORMAT or manifest.get('version') not in (ARTIFACT_VERSION, COMPRESSED_ARTIFACT_VERSION):
+        raise ArtifactError(
+            f"Unsupported artifact format: {manifest.get('format')} v{manifest.get('version')}"
+        )
+    return manifest
+
+
+def verify_artifact(path: str) -> Dict:
+    """
+    Check every array file of an artifact against its manifest SHA-256
+
+    Returns:
+        Manifest
+
+    Raises:
+        ArtifactError: Missing file, unknown format or checksum mismatch
+    """
+    manifest = read_manifest(path)
+    names = COMPRESSED_ARRAYS if manifest['version'] == COMPRESSED_ARTIFACT_VERSION else ARTIFACT_ARRAYS
+    if _combined_checksum(manifest['arrays'], names) != manifest.get('checksum'):
+        raise ArtifactError("Manifest checksum mismatch")
+
+    for name in names:
+        entry = manifest['arrays'].get(name)
+        if entry is None:
+            raise ArtifactError(f"Artifact is missing array: {name}")
+        file_path = os.path.join(path, entry['file'])
+        if not os.path.exists(file_path) or _file_sha256(file_path) != entry['sha256']:
+            raise ArtifactError(f"Checksum mismatch: {entry['file']}")
+    return manifest
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _combined_checksum(files: Dict, names: Sequence[str] = ARTIFACT_ARRAYS) -> str:
+    """Checksum over every array file's digest, in a fixed order"""
+    digest = hashlib.sha256()
+    for name in names:
+        entry = files.get(name) or {}
+        digest.update(f"{name}:{entry.get('sha256', '')}\n".encode('utf-8'))
+    return digest.hexdigest()
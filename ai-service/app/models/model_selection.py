@@ -0,0 +1,294 @@
+"""
+Cross-validated model selection for the symptom classifier
+Runs k-fold CV over a grid of vectorizer and regularization settings in
+parallel, reusing each vectorized fold for every regularization value
+"""
+
+import os
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from app.models.classifier import SymptomClassifier, DEFAULT_HASH_FEATURES
+from app.utils.versioning import is_true
+
+
+# Vectorizer settings searched by default; each is combined with every C
+DEFAULT_VECTORIZER_GRID = [
+    {'mode': 'tfidf', 'max_features': 500, 'ngram_range': (1, 2)},
+    {'mode': 'tfidf', 'max_features': 5000, 'ngram_range': (1, 2)},
+    {'mode': 'tfidf', 'max_features': 5000, 'ngram_range': (1, 2), 'sublinear_tf': True},
+    {'mode': 'tfidf', 'max_features': None, 'ngram_range': (1, 1)},
+    {'mode': 'hashing', 'n_features': DEFAULT_HASH_FEATURES, 'idf': True},
+]
+DEFAULT_C_GRID = [0.3, 1.0, 3.0, 10.0]
+
+
+def load_training_data(paths: Sequence[str], dedupe: bool = True) -> pd.DataFrame:
+    """
+    Load and concatenate labelled complaints
+
+    Accepts (complaint, category) CSV/NDJSON files, triage record exports
+    (complaint, primary_category, doctor_reviewed) and the DATABASE
+    disease-symptom table (Disease, Symptom_1..Symptom_17). The disease
+    table is translated and mapped to categories as in
+    prepare_dataset_improved.py, so it shares the Indonesian category space.
+
+    Args:
+        paths: Dataset files
+        dedupe: Drop duplicate (complaint, category) rows, which would
+            otherwise land in both training and test folds
+
+    Returns:
+        DataFrame with complaint and category columns
+    """
+    from app.utils.disease_mapping import disease_table_to_dataset, load_disease_descriptions
+
+    frames = []
+    for path in paths:
+        extension = os.path.splitext(path)[1].lower()
+        if extension in ('.ndjson', '.jsonl', '.json'):
+            df = pd.read_json(path, lines=True)
+        else:
+            df = pd.read_csv(path)
+
+        if 'Disease' in df.columns:
+            df = disease_table_to_dataset(df, load_disease_descriptions(path))
+        else:
+            if 'doctor_reviewed' in df.columns:
+                df = df[df['doctor_reviewed'].map(is_true)]
+            if 'category' not in df.columns and 'primary_category' in df.columns:
+                df = df.rename(columns={'primary_category': 'category'})
+
+        frames.append(df[['complaint', 'category']].dropna())
+
+    data = pd.concat(frames, ignore_index=True)
+    if dedupe:
+        data = data.drop_duplicates(ignore_index=True)
+    return data
+
+
+def build_vectorizer(config: Dict):
+    """Unfitted vectorizer for one grid configuration (engine-compatible)"""
+    from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer, TfidfTransformer
+    from sklearn.pipeline import Pipeline
+
+    if config['mode'] == 'hashing':
+        hashing = HashingVectorizer(
+            n_features=config.get('n_features', DEFAULT_HASH_FEATURES),
+            ngram_range=tuple(config.get('ngram_range', (1, 2))),
+            alternate_sign=False,
+            norm=None if config.get('idf', True) else 'l2',
+            lowercase=True
+        )
+        if config.get('idf', True):
+            return Pipeline([('hashing', hashing), ('idf', TfidfTransformer())])
+        return hashing
+
+    return TfidfVectorizer(
+        max_features=config.get('max_features', 500),
+        ngram_range=tuple(config.get('ngram_range', (1, 2))),
+        sublinear_tf=config.get('sublinear_tf', False),
+        min_df=1,
+        max_df=config.get('max_df', 0.8),
+        lowercase=True
+    )
+
+
+def build_model(C: float, warm_start: bool = False):
+    """Logistic Regression as used by SymptomClassifier.train()"""
+    from sklearn.linear_model import LogisticRegression
+    return LogisticRegression(C=C, max_iter=1000, random_state=42, class_weight='balanced', warm_start=warm_start)
+
+
+def _vectorize_fold(config: Dict, texts: np.ndarray, labels: np.ndarray, train_index, test_index) -> Dict:
+    """Fit the vectorizer on one training fold and transform both sides"""
+    vectorizer = build_vectorizer(config)
+    return {
+        'vectorizer': vectorizer,
+        'X_train': vectorizer.fit_transform(texts[train_index]),
+        'X_test': vectorizer.transform(texts[test_index]),
+        'y_train': labels[train_index],
+        'y_test': labels[test_index],
+        'test_texts': texts[test_index],
+    }
+
+
+def _fit_fold(fold: Dict, C_values: List[float], classes: List[str]) -> List[Dict]:
+    """
+    Fit every C on one cached vectorized fold and score each
+
+    C values are fitted in increasing order, each warm-started from the
+    previous solution (a regularization path), which converges much faster
+    than independent cold fits.
+    """
+    from sklearn.metrics import accuracy_score, f1_score
+
+    model = build_model(C_values[0], warm_start=True)
+    scores = {}
+    for C in sorted(C_values):
+        model.set_params(C=C)
+        start = time.perf_counter()
+        model.fit(fold['X_train'], fold['y_train'])
+        fit_seconds = time.perf_counter() - start
+
+        # End-to-end inference latency: text -> probabilities, per complaint
+        start = time.perf_counter()
+        probabilities = model.predict_proba(fold['vectorizer'].transform(fold['test_texts']))
+        latency = (time.perf_counter() - start) / len(fold['test_texts'])
+
+        predicted = model.classes_[probabilities.argmax(axis=1)]
+        scores[C] = {
+            'accuracy': accuracy_score(fold['y_test'], predicted),
+            'f1': f1_score(fold['y_test'], predicted, labels=classes, average=None, zero_division=0),
+            'fit_seconds': fit_seconds,
+            'latency_us': latency * 1e6,
+        }
+    return [scores[C] for C in C_values]
+
+
+def _config_name(config: Dict) -> str:
+    if config['mode'] == 'hashing':
+        return f"hashing n={config.get('n_features', DEFAULT_HASH_FEATURES)} idf={config.get('idf', True)}"
+    name = f"tfidf max={config.get('max_features', 500)} ngram={tuple(config.get('ngram_range', (1, 2)))}"
+    if config.get('sublinear_tf'):
+        name += " sublinear"
+    return name
+
+
+def cross_validate_grid(
+    data: pd.DataFrame,
+    vectorizer_grid: List[Dict] = None,
+    C_grid: List[float] = None,
+    folds: int = 5,
+    n_jobs: int = -1,
+    preprocess: bool = True
+) -> Tuple[List[Dict], Dict]:
+    """
+    k-fold cross-validation over vectorizer x C in parallel
+
+    Each (vectorizer, fold) is vectorized once, in parallel, and the cached
+    matrices are shared by every C value for that fold. Fit times are
+    warm-started along the C path (see _fit_fold).
+
+    Args:
+        data: DataFrame with complaint and category columns
+        vectorizer_grid: Vectorizer configurations
+        C_grid: Inverse regularization strengths
+        folds: Number of CV folds
+        n_jobs: Worker processes (-1 = all cores)
+        preprocess: Train on preprocessed text, as the serving path predicts
+
+    Returns:
+        (results sorted best first, CV info)
+    """
+    from sklearn.model_selection import StratifiedKFold, KFold
+
+    vectorizer_grid = vectorizer_grid or DEFAULT_VECTORIZER_GRID
+    C_grid = C_grid or DEFAULT_C_GRID
+
+    start = time.perf_counter()
+    if preprocess:
+        from app.utils.preprocessor import preprocess_many
+        texts = preprocess_many(data['complaint'], n_jobs=n_jobs)['processed'].to_numpy()
+    else:
+        texts = data['complaint'].astype(str).to_numpy()
+    labels = data['category'].astype(str).to_numpy()
+    classes = sorted(set(labels))
+    preprocess_seconds = time.perf_counter() - start
+
+    # Stratify when every class can appear in every fold
+    min_class_count = data['category'].value_counts().min()
+    if min_class_count >= folds:
+        splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    else:
+        print(f"Warning: Smallest class has {min_class_count} samples (<{folds}). Using unstratified folds.")
+        splitter = KFold(n_splits=folds, shuffle=True, random_state=42)
+    splits = list(splitter.split(texts, labels))
+
+    parallel = Parallel(n_jobs=n_jobs)
+
+    # Stage 1: vectorize every (config, fold) once
+    start = time.perf_counter()
+    tasks = [(c, f) for c in range(len(vectorizer_grid)) for f in range(len(splits))]
+    vectorized = parallel(
+        delayed(_vectorize_fold)(vectorizer_grid[c], texts, labels, *splits[f]) for c, f in tasks
+    )
+    fold_cache = dict(zip(tasks, vectorized))
+    vectorize_seconds = time.perf_counter() - start
+
+    # Stage 2: every C on every cached fold
+    start = time.perf_counter()
+    fold_scores = parallel(delayed(_fit_fold)(fold_cache[task], C_grid, classes) for task in tasks)
+    fit_seconds = time.perf_counter() - start
+
+    grouped = {}
+    for (c, _), scores in zip(tasks, fold_scores):
+        for C, score in zip(C_grid, scores):
+            grouped.setdefault((c, C), []).append(score)
+
+    results = []
+    for (c, C), fold_scores in grouped.items():
+        accuracies = [score['accuracy'] for score in fold_scores]
+        f1 = np.mean([score['f1'] for score in fold_scores], axis=0)
+        results.append({
+            'name': _config_name(vectorizer_grid[c]),
+            'vectorizer': {key: list(value) if isinstance(value, tuple) else value for key, value in vectorizer_grid[c].items()},
+            'C': C,
+            'accuracy': float(np.mean(accuracies)),
+            'accuracy_std': float(np.std(accuracies)),
+            'macro_f1': float(np.mean(f1)),
+            'per_class_f1': {label: float(value) for label, value in zip(classes, f1)},
+            'fit_seconds': float(np.mean([score['fit_seconds'] for score in fold_scores])),
+            'latency_us': float(np.mean([score['latency_us'] for score in fold_scores])),
+        })
+
+    # Best accuracy, then macro F1, then the faster model
+    results.sort(key=lambda result: (-result['accuracy'], -result['macro_f1'], result['latency_us']))
+
+    info = {
+        'samples': len(data),
+        'distinct_complaints': int(data['complaint'].nunique()),
+        'classes': len(classes),
+        'folds': folds,
+        'stratified': bool(min_class_count >= folds),
+        'configurations': len(results),
+        'preprocess_seconds': preprocess_seconds,
+        'vectorize_seconds': vectorize_seconds,
+        'fit_seconds': fit_seconds,
+    }
+    return results, info
+
+
+def train_best(data: pd.DataFrame, result: Dict, preprocess: bool = True) -> SymptomClassifier:
+    """Refit the winning configuration on all data"""
+    if preprocess:
+        from app.utils.preprocessor import preprocess_many
+        texts = preprocess_many(data['complaint'])['processed']
+    else:
+        texts = data['complaint'].astype(str)
+
+    config = result['vectorizer']
+    vectorizer = build_vectorizer(config)
+    model = build_model(result['C'])
+    model.fit(vectorizer.fit_transform(texts), data['category'].astype(str))
+
+    if config['mode'] == 'hashing':
+        features = {
+            'mode': 'hashing',
+            'n_features': config.get('n_features', DEFAULT_HASH_FEATURES),
+            'idf': config.get('idf', True)
+        }
+    else:
+        features = {'mode': 'tfidf'}
+    features.update({'C': result['C'], 'cv_accuracy': result['accuracy']})
+
+    return SymptomClassifier.from_fitted(
+        vectorizer,
+        model,
+        categories=list(data['category'].astype(str).unique()),
+        features=features
+    )
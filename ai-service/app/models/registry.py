@@ -0,0 +1,273 @@
+"""
+Versioned model registry with atomic hot swap
+Each trained model is saved to its own version directory with a manifest
+(metrics, dataset hash, features). The active model is loaded and warmed
+off the request path, then published with a single reference assignment,
+so in-flight requests finish on the model they started with.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from app.models.classifier import SymptomClassifier
+from app.models.inference import MANIFEST_FILE, verify_artifact
+from app.utils.feature_cache import file_sha256
+from app.utils.versioning import (
+    version_name, list_version_numbers, read_current, write_current, staging_path, publish_version
+)
+
+
+DEFAULT_REGISTRY_DIR = os.path.join(os.path.dirname(__file__), '../data/model_registry')
+VERSION_MANIFEST = 'registry.json'
+BUNDLED_VERSION = 'bundled'
+
+# Representative complaints run through a model before it takes traffic
+WARMUP_COMPLAINTS = [
+    "nyeri dada menjalar ke lengan kiri dan sesak napas",
+    "batuk pilek sudah 3 hari hidung meler",
+    "demam tinggi dan kepala pusing",
+    "gatal ruam kulit dan bintik merah",
+    "sakit perut mual dan muntah",
+    "pusing kehilangan keseimbangan dan leher kaku",
+]
+
+
+class ActiveModel(NamedTuple):
+    """Model serving traffic; read once per request for a consistent pair"""
+    version: Optional[str]
+    classifier: SymptomClassifier
+
+
+class ModelRegistry:
+    """Versioned model directories plus the reference requests read"""
+
+    def __init__(self, registry_dir: str = None, bundled_path: str = None):
+        """
+        Initialize registry
+
+        Args:
+            registry_dir: Directory holding version directories (default app/data/model_registry)
+            bundled_path: Model shipped with the service, served while no version is current
+        """
+        self.registry_dir = registry_dir or DEFAULT_REGISTRY_DIR
+        self.bundled_path = bundled_path
+        self.active = ActiveModel(None, SymptomClassifier())
+        self.last_swap = None
+        # Serializes register/activate; readers never take it
+        self._lock = threading.Lock()
+
+    # Versions
+
+    def _version_path(self, version: str) -> str:
+        if version == BUNDLED_VERSION and self.bundled_path:
+            return self.bundled_path
+        return os.path.join(self.registry_dir, version)
+
+    def list_versions(self) -> List[str]:
+        """Registered versions, oldest first"""
+        return [version_name(number) for number in list_version_numbers(self.registry_dir)]
+
+    def get_manifest(self, version: str) -> Dict:
+        """Manifest of one version (metrics, dataset hash, features)"""
+        if version == BUNDLED_VERSION:
+            return {'version': BUNDLED_VERSION, 'path': self.bundled_path}
+        with open(os.path.join(self._version_path(version), VERSION_MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def current_version(self) -> Optional[str]:
+        """Version the CURRENT pointer refers to (survives restarts)"""
+        return read_current(self.registry_dir)
+
+    def _set_current(self, version: str):
+        write_current(self.registry_dir, version)
+
+    def register(
+        self,
+        classifier: SymptomClassifier,
+        metrics: Dict = None,
+        dataset_path: str = None,
+        note: str = None
+    ) -> str:
+        """
+        Save a trained classifier as a new version (does not activate it)
+
+        The version directory is written under a temporary name and renamed
+        into place, so a crash never leaves a half-written version.
+
+        Args:
+            classifier: Trained classifier
+            metrics: Training metrics (accuracy, sizes; the report is dropped)
+            dataset_path: Training dataset, recorded by content hash
+            note: Free-form description
+
+        Returns:
+            New version name
+        """
+        with self._lock:
+            numbers = list_version_numbers(self.registry_dir)
+            version = version_name(numbers[-1] + 1 if numbers else 1)
+            tmp_path = staging_path(self.registry_dir, version)
+
+            classifier.save_model(tmp_path)
+            # Checksums are verified here once, not on every load
+            if os.path.exists(os.path.join(tmp_path, MANIFEST_FILE)):
+                verify_artifact(tmp_path)
+            metrics = metrics or {}
+            manifest = {
+                'version': version,
+                'created_at': datetime.now().isoformat(),
+                'dataset': os.path.basename(dataset_path) if dataset_path else None,
+                'dataset_sha256': file_sha256(dataset_path) if dataset_path else None,
+                'features': classifier.features,
+                'stemming': classifier.stemming,
+                'categories': len(classifier.categories),
+                'metrics': {
+                    key: metrics[key] for key in ('accuracy', 'train_size', 'test_size') if key in metrics
+                },
+                'note': note
+            }
+            with open(os.path.join(tmp_path, VERSION_MANIFEST), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+            publish_version(tmp_path, self.registry_dir, version)
+            print(f"[INFO] Registered model {version}")
+            return version
+
+    def find_versions(self, note: str) -> List[str]:
+        """Registered versions whose manifest note matches exactly"""
+        versions = []
+        for version in self.list_versions():
+            try:
+                if self.get_manifest(version).get('note') == note:
+                    versions.append(version)
+            except (OSError, ValueError):
+                continue
+        return versions
+
+    def deregister(self, version: str):
+        """
+        Delete a registered version that is neither active nor current
+
+        Raises:
+            ValueError: Unknown, active or current version
+        """
+        with self._lock:
+            if version not in self.list_versions():
+                raise ValueError(f"Model version not found: {version}")
+            if version in (self.active.version, self.current_version()):
+                raise ValueError(f"Model version {version} is in use and cannot be deregistered")
+            shutil.rmtree(self._version_path(version))
+            print(f"[INFO] Deregistered model {version}")
+
+    # Serving
+
+    def load(self, version: str) -> SymptomClassifier:
+        """Load one version without activating it"""
+        path = self._version_path(version)
+        if not os.path.isdir(path):
+            raise ValueError(f"Model version not found: {version}")
+        classifier = SymptomClassifier()
+        classifier.load_model(path)
+        return classifier
+
+    @staticmethod
+    def warmup(classifier: SymptomClassifier, rounds: int = 3) -> float:
+        """
+        Run sample predictions so the first real request pays no first-call cost
+
+        Faults (mmap page-in, lazy caches, hash memo) are taken here. A model
+        that fails or returns malformed output is rejected before any swap.
+
+        Returns:
+            Mean seconds per warmup prediction
+        """
+        start = time.perf_counter()
+        for _ in range(rounds):
+            # predict() bypasses the prediction cache, so every round scores
+            for complaint in WARMUP_COMPLAINTS:
+                category = classifier.predict(complaint, top_k=3)[0]['category']
+                if category not in classifier.categories:
+                    raise ValueError(f"Warmup produced unknown category: {category}")
+            classifier.predict_batch(WARMUP_COMPLAINTS)
+        return (time.perf_counter() - start) / (rounds * len(WARMUP_COMPLAINTS))
+
+    def activate(self, version: str, persist: bool = True) -> Dict:
+        """
+        Load, warm and atomically swap in a version
+
+        Readers keep using the previous ActiveModel until the single
+        assignment below; requests already holding it finish unaffected.
+
+        Args:
+            version: Version name (or 'bundled')
+            persist: Update the CURRENT pointer so restarts serve this version
+
+        Returns:
+            Swap info (version, previous version, load and warmup times)
+        """
+        with self._lock:
+            start = time.perf_counter()
+            classifier = self.load(version)
+            load_seconds = time.perf_counter() - start
+            warmup_seconds = self.warmup(classifier)
+
+            previous = self.active.version
+            self.active = ActiveModel(version, classifier)
+            if persist:
+                self._set_current(version)
+
+            self.last_swap = {
+                'version': version,
+                'previous_version': previous,
+                'load_seconds': round(load_seconds, 4),
+                'warmup_ms_per_prediction': round(warmup_seconds * 1000, 3),
+                'swapped_at': datetime.now().isoformat()
+            }
+            print(f"[SUCCESS] Model {version} active (previous: {previous})")
+            return self.last_swap
+
+    def rollback(self) -> Dict:
+        """Activate the version registered before the active one"""
+        versions = self.list_versions()
+        active = self.active.version
+        earlier = [v for v in versions if active in versions and v < active]
+        if earlier:
+            return self.activate(earlier[-1])
+        if active != BUNDLED_VERSION and self.bundled_path and os.path.isdir(self.bundled_path):
+            return self.activate(BUNDLED_VERSION)
+        raise ValueError("No earlier model version to roll back to")
+
+    def load_current(self) -> Optional[str]:
+        """
+        Activate the CURRENT version at startup (bundled model if none)
+
+        Returns:
+            Version now active, or None if no model could be loaded
+        """
+        candidates = [self.current_version()]
+        if self.bundled_path and os.path.isdir(self.bundled_path):
+            candidates.append(BUNDLED_VERSION)
+
+        for version in candidates:
+            if version is None:
+                continue
+            try:
+                self.activate(version, persist=False)
+                return version
+            except Exception as e:
+                print(f"Warning: Could not load model {version}: {e}")
+        return None
+
+    def get_info(self) -> Dict:
+        """Active version, registered versions and last swap"""
+        return {
+            'active_version': self.active.version,
+            'current_version': self.current_version(),
+            'versions': self.list_versions(),
+            'last_swap': self.last_swap
+        }
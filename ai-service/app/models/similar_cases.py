@@ -0,0 +1,349 @@
+"""
+Similar-case retrieval over historical triages
+Sparse inverted index in the classifier's TF-IDF space: term id -> posting
+list of (case id, weight). Cosine top-k search, incremental insertion and
+an on-disk format of .npy arrays plus case metadata.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from app.models.classifier import SymptomClassifier
+from app.utils.versioning import is_true
+
+
+DEFAULT_SIMILAR_CASES_DIR = os.path.join(os.path.dirname(__file__), '../data/similar_cases')
+INDEX_FORMAT = 'triage-similar-cases'
+INDEX_VERSION = 1
+INDEX_FILE = 'index.json'
+CASES_FILE = 'cases.jsonl'
+POSTING_ARRAYS = ('indptr', 'case_ids', 'weights')
+SAMPLE_STRIDE = 16  # score subsample used to bound the top-k threshold
+
+# Case fields kept for display (no patient identifiers)
+CASE_FIELDS = ('triage_id', 'complaint', 'primary_category', 'urgency_level', 'doctor_reviewed', 'created_at')
+
+
+def feature_space_fingerprint(classifier: SymptomClassifier) -> str:
+    """Identifies the TF-IDF space; an index only matches the model it was built with"""
+    engine = classifier.engine
+    digest = hashlib.sha256()
+    digest.update(json.dumps({**engine.get_config(), 'stemming': classifier.stemming}, sort_keys=True).encode('utf-8'))
+    for term in engine.feature_terms():
+        digest.update(term.encode('utf-8') + b'\n')
+    if engine.idf is not None:
+        digest.update(np.ascontiguousarray(engine.idf, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class SimilarCaseIndex:
+    """Inverted index of L2-normalized case vectors with cosine top-k search"""
+
+    def __init__(self, classifier: SymptomClassifier, compact_threshold: int = 50000):
+        """
+        Initialize an empty index
+
+        Args:
+            classifier: Loaded classifier whose NumPy engine defines the
+                feature space (queries and cases are encoded with it)
+            compact_threshold: Postings buffered from insertions before they
+                are merged into the sorted arrays
+        """
+        if classifier.engine is None:
+            raise ValueError("Similar-case index needs a classifier with a NumPy inference engine")
+
+        self.classifier = classifier
+        self.n_features = classifier.engine.hash_features or len(classifier.engine.vocabulary)
+        self.fingerprint = feature_space_fingerprint(classifier)
+        self.compact_threshold = compact_threshold
+
+        # Compacted postings, grouped by term (CSC over cases)
+        self.indptr = np.zeros(self.n_features + 1, dtype=np.int64)
+        self.case_ids = np.empty(0, dtype=np.int32)
+        self.weights = np.empty(0, dtype=np.float32)
+
+        # Postings of recent insertions, per term: ([case ids], [weights])
+        self._pending = {}
+        self._pending_count = 0
+        self.cases = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.cases)
+
+    def _vectorize(self, complaints: Sequence[str]):
+        """(rows, term ids, weights) of processed complaints, as the classifier sees them"""
+        texts = [self.classifier._featurize(text) for text in complaints]
+        return self.classifier.engine.transform(texts)
+
+    def add(self, complaints: Sequence[str], cases: Sequence[Dict] = None) -> List[int]:
+        """
+        Insert cases; they are searchable immediately
+
+        Args:
+            complaints: Processed complaint texts (as passed to the classifier)
+            cases: Per-complaint metadata (CASE_FIELDS are kept)
+
+        Returns:
+            Internal case ids
+        """
+        complaints = list(complaints)
+        cases = list(cases) if cases is not None else [{} for _ in complaints]
+        if len(cases) != len(complaints):
+            raise ValueError("complaints and cases must have the same length")
+
+        rows, terms, values = self._vectorize(complaints)
+
+        with self._lock:
+            first_id = len(self.cases)
+            for text, case in zip(complaints, cases):
+                record = _case_record(case)
+                record.setdefault('complaint', text)
+                self.cases.append(record)
+
+            for row, term, value in zip((rows + first_id).tolist(), terms.tolist(), values.tolist()):
+                ids, weights = self._pending.setdefault(term, ([], []))
+                ids.append(row)
+                weights.append(value)
+            self._pending_count += len(values)
+
+            if self._pending_count >= self.compact_threshold:
+                self._compact()
+
+        return list(range(first_id, first_id + len(complaints)))
+
+    def compact(self):
+        """Merge buffered insertions into the sorted posting arrays"""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        if not self._pending_count:
+            return
+
+        pending_terms, pending_ids, pending_weights = [], [], []
+        for term, (ids, weights) in self._pending.items():
+            pending_terms.append(np.full(len(ids), term, dtype=np.int64))
+            pending_ids.append(np.asarray(ids, dtype=np.int32))
+            pending_weights.append(np.asarray(weights, dtype=np.float32))
+
+        base_terms = np.repeat(np.arange(self.n_features), np.diff(self.indptr))
+        terms = np.concatenate([base_terms] + pending_terms)
+        case_ids = np.concatenate([self.case_ids] + pending_ids)
+        weights = np.concatenate([self.weights] + pending_weights)
+
+        # Group by term, case ids ascending within each posting list
+        order = np.lexsort((case_ids, terms))
+        indptr = np.zeros(self.n_features + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=self.n_features), out=indptr[1:])
+
+        # Publish new arrays before dropping the buffer (searches never see a gap)
+        self.case_ids, self.weights, self.indptr = case_ids[order], weights[order], indptr
+        self._pending = {}
+        self._pending_count = 0
+
+    def search(self, complaint: str, top_k: int = 5, min_score: float = 0.0) -> List[Dict]:
+        """
+        Most similar indexed cases by cosine similarity
+
+        Args:
+            complaint: Processed complaint text
+            top_k: Number of cases to return
+            min_score: Drop cases below this similarity
+
+        Returns:
+            Case metadata with 'case_id' and 'score', best first
+        """
+        _, terms, values = self._vectorize([complaint])
+        if not len(terms) or not self.cases or top_k <= 0:
+            return []
+
+        with self._lock:
+            indptr, case_ids, weights, n_cases = self.indptr, self.case_ids, self.weights, len(self.cases)
+            id_parts, score_parts = [], []
+            for term, value in zip(terms.tolist(), values.tolist()):
+                start, end = indptr[term], indptr[term + 1]
+                if end > start:
+                    id_parts.append(case_ids[start:end])
+                    score_parts.append(weights[start:end] * value)
+                pending = self._pending.get(term)
+                if pending:
+                    id_parts.append(np.asarray(pending[0], dtype=np.int32))
+                    score_parts.append(np.asarray(pending[1], dtype=np.float32) * value)
+
+        if not id_parts:
+            return []
+        ids = np.concatenate(id_parts)
+        contributions = np.concatenate(score_parts).astype(np.float64)
+
+        # Accumulate per case: dense bincount for broad queries, sort-based for narrow ones
+        if len(ids) * 8 >= n_cases:
+            scores = np.bincount(ids, weights=contributions, minlength=n_cases)
+            # The k-th best of a subsample never exceeds the true k-th best, so
+            # thresholding on it keeps the exact top k while skipping most cases
+            sample = scores[::SAMPLE_STRIDE]
+            threshold = np.partition(sample, -top_k)[-top_k] if len(sample) > top_k else 0.0
+            candidates = np.flatnonzero(scores >= threshold) if threshold > 0 else np.flatnonzero(scores)
+            candidate_scores = scores[candidates]
+        else:
+            candidates, inverse = np.unique(ids, return_inverse=True)
+            candidate_scores = np.bincount(inverse, weights=contributions)
+
+        k = min(top_k, len(candidates))
+        if k <= 0:
+            return []
+        best = np.argpartition(-candidate_scores, k - 1)[:k]
+        best = best[np.argsort(-candidate_scores[best], kind='stable')]
+
+        results = []
+        for position in best.tolist():
+            score = float(candidate_scores[position])
+            if score < min_score:
+                break
+            case_id = int(candidates[position])
+            results.append({'case_id': case_id, 'score': round(score, 4), **self.cases[case_id]})
+        return results
+
+    def add_records(self, records: Iterable[Dict], reviewed_only: bool = True) -> int:
+        """
+        Insert triage records (dicts with CASE_FIELDS), preprocessing complaints
+
+        Args:
+            records: Triage records, e.g. rows of a triage_records export
+            reviewed_only: Skip records not marked doctor_reviewed
+
+        Returns:
+            Number of cases inserted
+        """
+        from app.utils.preprocessor import preprocess_many
+
+        records = [
+            record for record in records
+            if record.get('complaint') and (not reviewed_only or is_true(record.get('doctor_reviewed')))
+        ]
+        if not records:
+            return 0
+        processed = preprocess_many([record['complaint'] for record in records])['processed']
+        self.add(list(processed), records)
+        return len(records)
+
+    def save(self, path: str = None) -> Dict:
+        """
+        Persist the index: posting .npy arrays, cases.jsonl, then index.json
+
+        index.json is written last, so a partial save is never loadable.
+
+        Returns:
+            Index manifest
+        """
+        path = path or DEFAULT_SIMILAR_CASES_DIR
+        os.makedirs(path, exist_ok=True)
+
+        with self._lock:
+            self._compact()
+            arrays = {'indptr': self.indptr, 'case_ids': self.case_ids, 'weights': self.weights}
+            cases = list(self.cases)
+
+        for name in POSTING_ARRAYS:
+            tmp_path = os.path.join(path, f'{name}.tmp.npy')
+            np.save(tmp_path, arrays[name])
+            os.replace(tmp_path, os.path.join(path, f'{name}.npy'))
+
+        tmp_path = os.path.join(path, CASES_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for case in cases:
+                f.write(json.dumps(case, ensure_ascii=False, default=str) + '\n')
+        os.replace(tmp_path, os.path.join(path, CASES_FILE))
+
+        manifest = {
+            'format': INDEX_FORMAT,
+            'version': INDEX_VERSION,
+            'fingerprint': self.fingerprint,
+            'n_features': self.n_features,
+            'cases': len(cases),
+            'postings': int(len(arrays['case_ids'])),
+        }
+        tmp_path = os.path.join(path, INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(path, INDEX_FILE))
+        return manifest
+
+    @classmethod
+    def load(cls, path: str, classifier: SymptomClassifier, rebuild: bool = False) -> 'SimilarCaseIndex':
+        """
+        Load a saved index for the given classifier
+
+        Args:
+            path: Index directory
+            classifier: Loaded classifier defining the feature space
+            rebuild: If the index was built with a different feature space,
+                re-index its stored cases with this classifier instead of failing
+
+        Raises:
+            ValueError: Missing index, unknown format, or built with a
+                different feature space and rebuild is not set
+        """
+        manifest_path = os.path.join(path, INDEX_FILE)
+        if not os.path.exists(manifest_path):
+            raise ValueError(f"No similar-case index in {path}")
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != INDEX_FORMAT or manifest.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported index format: {manifest.get('format')} v{manifest.get('version')}")
+
+        index = cls(classifier)
+        with open(os.path.join(path, CASES_FILE), 'r', encoding='utf-8') as f:
+            cases = [json.loads(line) for line in f if line.strip()]
+        if len(cases) != manifest['cases']:
+            raise ValueError("Similar-case index files are inconsistent; rebuild it")
+
+        if manifest['fingerprint'] != index.fingerprint:
+            if not rebuild:
+                raise ValueError("Similar-case index was built with a different model; rebuild it")
+            # Stored cases passed the review filter when they were first added
+            index.add_records(cases, reviewed_only=False)
+            print(f"[INFO] Rebuilt similar-case index for the new model ({len(index)} cases)")
+            return index
+
+        index.indptr = np.load(os.path.join(path, 'indptr.npy'), allow_pickle=False)
+        index.case_ids = np.load(os.path.join(path, 'case_ids.npy'), allow_pickle=False)
+        index.weights = np.load(os.path.join(path, 'weights.npy'), allow_pickle=False)
+        index.cases = cases
+
+        if len(index.indptr) != index.n_features + 1:
+            raise ValueError("Similar-case index files are inconsistent; rebuild it")
+        return index
+
+    def get_stats(self) -> Dict:
+        """Index size statistics"""
+        with self._lock:
+            postings = int(len(self.case_ids)) + self._pending_count
+            return {
+                "cases": len(self.cases),
+                "postings": postings,
+                "pending_postings": self._pending_count,
+                "array_bytes": int(self.indptr.nbytes + self.case_ids.nbytes + self.weights.nbytes),
+                "fingerprint": self.fingerprint
+            }
+
+
+def _case_record(case: Dict) -> Dict:
+    """CASE_FIELDS of one case, JSON-ready (missing and NaN values dropped)"""
+    record = {}
+    for field in CASE_FIELDS:
+        value = case.get(field)
+        if value is None or value != value:
+            continue
+        if field == 'doctor_reviewed':
+            value = is_true(value)
+        elif not isinstance(value, str):
+            value = str(value)
+        record[field] = value
+    return record
+
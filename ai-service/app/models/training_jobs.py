@@ -0,0 +1,320 @@
+"""
+Background training jobs
+Training runs in a separate worker process (never on the API event loop),
+reports progress through a small status file, registers its model in the
+ModelRegistry and hands it back for a warm hot swap. One job runs at a time.
+"""
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.models.registry import ModelRegistry
+
+
+ACTIVE_STATUSES = ('queued', 'running')
+TERMINAL_STATUSES = ('succeeded', 'failed', 'cancelled')
+PROGRESS_FILE = 'progress.json'
+RESULT_FILE = 'result.json'
+
+
+class JobConflictError(RuntimeError):
+    """A training job is already queued or running"""
+
+
+def _write_json(path: str, data: Dict):
+    """Atomic write, so the API never reads a half-written status file"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, default=str)
+    os.replace(tmp_path, path)
+
+
+def job_note(job_dir: str) -> str:
+    """Registry note that identifies the version a job registered"""
+    return f"training job {os.path.basename(job_dir)}"
+
+
+def run_training_job(job_dir: str, registry_dir: str, dataset_path: str, options: Dict):
+    """
+    Worker process entry point: train, register, write the result
+
+    Runs at lower CPU priority with single-threaded BLAS so that serving
+    processes on the same host keep their cores.
+    """
+    result = {}
+    try:
+        if hasattr(os, 'nice'):
+            os.nice(10)
+        try:
+            from threadpoolctl import threadpool_limits
+            threadpool_limits(1)
+        except ImportError:
+            pass
+
+        from app.models.classifier import SymptomClassifier
+
+        progress_path = os.path.join(job_dir, PROGRESS_FILE)
+
+        def progress(stage: str, fraction: float):
+            _write_json(progress_path, {'stage': stage, 'progress': round(fraction, 3)})
+
+        options = dict(options)
+        classifier = SymptomClassifier()
+        if options.pop('streaming', False):
+            # Chunked partial_fit within a memory budget (corpora larger than RAM)
+            metrics = classifier.train_streaming(dataset_path, progress=progress, **options)
+        else:
+            metrics = classifier.train(dataset_path, progress=progress, **options)
+
+        progress('registering', 0.95)
+        version = ModelRegistry(registry_dir).register(classifier, metrics, dataset_path, note=job_note(job_dir))
+        result = {
+            'status': 'succeeded',
+            'model_version': version,
+            'metrics': {
+                'accuracy': metrics['accuracy'],
+                'categories': len(metrics['categories']),
+                'features': metrics['features'],
+                'train_size': metrics['train_size'],
+                'test_size': metrics['test_size'],
+                **{
+                    key: metrics[key]
+                    for key in ('rows_per_second', 'peak_rss_mb', 'memory_budget_mb') if key in metrics
+                }
+            }
+        }
+    except Exception as e:
+        result = {'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+
+    _write_json(os.path.join(job_dir, RESULT_FILE), result)
+
+
+class TrainingJobManager:
+    """Starts, tracks and cancels background training jobs"""
+
+    def __init__(self, registry: ModelRegistry, history: int = 20):
+        """
+        Initialize manager
+
+        Args:
+            registry: Registry that receives trained models and performs the swap
+            history: Number of finished jobs kept for polling
+        """
+        self.registry = registry
+        self.history = history
+        self.jobs = {}
+        self._processes = {}
+        self._lock = threading.Lock()
+        # spawn: a clean interpreter, safe to start from a threaded server
+        self._context = multiprocessing.get_context('spawn')
+
+    def active_job(self) -> Optional[Dict]:
+        """Job currently queued or running, if any"""
+        for job in self.jobs.values():
+            if job['status'] in ACTIVE_STATUSES:
+                return job
+        return None
+
+    def start(self, dataset_path: str, options: Dict = None, activate: bool = True) -> Dict:
+        """
+        Start a training job in a worker process
+
+        Args:
+            dataset_path: Training dataset
+            options: Keyword arguments for SymptomClassifier.train(), or for
+                train_streaming() when options include 'streaming': True
+            activate: Hot-swap the trained model in when the job succeeds
+
+        Returns:
+            Job status
+
+        Raises:
+            JobConflictError: Another job is queued or running
+        """
+        with self._lock:
+            running = self.active_job()
+            if running is not None:
+                raise JobConflictError(f"Training job {running['job_id']} is already {running['status']}")
+
+            job_id = uuid.uuid4().hex[:12]
+            job_dir = tempfile.mkdtemp(prefix=f'triage-train-{job_id}-')
+            job = {
+                'job_id': job_id,
+                'status': 'queued',
+                'stage': 'queued',
+                'progress': 0.0,
+                'dataset': os.path.basename(dataset_path),
+                'options': options or {},
+                'activate': activate,
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'model_version': None,
+                'metrics': None,
+                'swap': None,
+                'error': None,
+                '_dir': job_dir,
+            }
+            process = self._context.Process(
+                target=run_training_job,
+                args=(job_dir, self.registry.registry_dir, dataset_path, options or {}),
+                name=f'training-job-{job_id}',
+                daemon=True
+            )
+            self.jobs[job_id] = job
+            self._processes[job_id] = process
+            self._prune()
+
+        try:
+            process.start()
+        except Exception as e:
+            self._finish(job_id, status='failed', stage='failed', error=f"Worker failed to start: {e}")
+            raise RuntimeError(f"Training job {job_id} failed to start: {e}") from e
+
+        with self._lock:
+            if job['status'] == 'queued':
+                job.update(status='running', stage='starting')
+                job['started_at'] = datetime.now().isoformat()
+            elif process.is_alive():
+                # Cancelled before the worker existed
+                process.terminate()
+        threading.Thread(target=self._monitor, args=(job_id,), daemon=True).start()
+        return self.get(job_id)
+
+    def _finish(self, job_id: str, **fields):
+        """
+        Move a job to its terminal state, unless it already reached one
+
+        Terminal states are final: a cancelled job is never later reported
+        as succeeded or failed.
+        """
+        job = self.jobs[job_id]
+        with self._lock:
+            if job['status'] not in TERMINAL_STATUSES:
+                job.update(fields)
+            job['finished_at'] = datetime.now().isoformat()
+        self._processes.pop(job_id, None)
+        shutil.rmtree(job['_dir'], ignore_errors=True)
+
+    def _discard_version(self, job: Dict, version: Optional[str]):
+        """Deregister what a cancelled job registered, even if it died mid-result"""
+        versions = [version] if version else self.registry.find_versions(job_note(job['_dir']))
+        for version in versions:
+            try:
+                self.registry.deregister(version)
+            except ValueError as e:
+                print(f"Warning: Could not deregister {version} of cancelled job {job['job_id']}: {e}")
+
+    def _monitor(self, job_id: str):
+        """Wait for the worker, collect its result and optionally activate the model"""
+        job = self.jobs[job_id]
+        process = self._processes[job_id]
+        process.join()
+
+        result = {}
+        result_path = os.path.join(job['_dir'], RESULT_FILE)
+        if os.path.exists(result_path):
+            with open(result_path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+
+        succeeded = result.get('status') == 'succeeded'
+        with self._lock:
+            cancelled = job['status'] == 'cancelled'
+            if succeeded and not cancelled:
+                job.update(model_version=result['model_version'], metrics=result['metrics'])
+                if job['activate']:
+                    # From here on the job can no longer be cancelled
+                    job['stage'] = 'activating'
+
+        if cancelled:
+            self._discard_version(job, result.get('model_version'))
+            self._finish(job_id)
+        elif succeeded:
+            if job['activate']:
+                try:
+                    # Load and warmup happen here, in the monitor thread
+                    job['swap'] = self.registry.activate(result['model_version'])
+                except Exception as e:
+                    job['error'] = f"Activation failed: {e}"
+            self._finish(job_id, status='succeeded', stage='done', progress=1.0)
+        else:
+            self._finish(
+                job_id,
+                status='failed',
+                stage='failed',
+                error=result.get('error') or f"Worker exited with code {process.exitcode}"
+            )
+
+    def _read_progress(self, job: Dict):
+        progress_path = os.path.join(job['_dir'], PROGRESS_FILE)
+        try:
+            with open(progress_path, 'r', encoding='utf-8') as f:
+                progress = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            # A concurrent cancel keeps its stage
+            if job['status'] == 'running':
+                job.update(progress)
+
+    def get(self, job_id: str) -> Dict:
+        """
+        Job status for polling
+
+        Raises:
+            KeyError: Unknown job id
+        """
+        job = self.jobs[job_id]
+        process = self._processes.get(job_id)
+        # Once the worker exits, the monitor thread owns the job state
+        if job['status'] == 'running' and process is not None and process.is_alive():
+            self._read_progress(job)
+        return {key: value for key, value in job.items() if not key.startswith('_')}
+
+    def list_jobs(self) -> List[Dict]:
+        """All tracked jobs, newest first"""
+        return [self.get(job_id) for job_id in reversed(list(self.jobs))]
+
+    def cancel(self, job_id: str) -> Dict:
+        """
+        Stop a running job; any version it registered is deregistered
+
+        Raises:
+            KeyError: Unknown job id
+            ValueError: Job already finished, or its model is being activated
+        """
+        job = self.jobs[job_id]
+        with self._lock:
+            if job['status'] not in ACTIVE_STATUSES:
+                raise ValueError(f"Training job {job_id} already {job['status']}")
+            if job['stage'] == 'activating':
+                raise ValueError(f"Training job {job_id} is activating its model; roll back instead")
+            job.update(status='cancelled', stage='cancelled')
+
+        process = self._processes.get(job_id)
+        if process is not None and process.is_alive():
+            process.terminate()
+        return self.get(job_id)
+
+    def wait(self, job_id: str, timeout: float = None) -> Dict:
+        """Block until a job finishes (for scripts and tests)"""
+        deadline = time.monotonic() + timeout if timeout else None
+        while self.jobs[job_id]['finished_at'] is None:
+            if deadline and time.monotonic() > deadline:
+                raise TimeoutError(f"Training job {job_id} still {self.jobs[job_id]['status']}")
+            time.sleep(0.05)
+        return self.get(job_id)
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond `history`"""
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] not in ACTIVE_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job_id]
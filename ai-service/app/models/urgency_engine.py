@@ -8,6 +8,17 @@ import os
 from typing import List, Dict, Tuple
 import re
 
+from app.utils.term_matcher import KeywordAutomaton
+from app.utils.vitals import heart_rate_severity
+
+
+# Rule lists in red_flags_rules.json: (key, urgency, severity)
+FLAG_LEVELS = (
+    ('critical_red_flags', 'Red', 'Critical'),
+    ('warning_yellow_flags', 'Yellow', 'Warning'),
+    ('green_flags', 'Green', 'Mild'),
+)
+
 
 class UrgencyEngine:
     """Rule-based engine for detecting medical urgency"""
@@ -26,10 +37,8 @@ class UrgencyEngine:
 
         self.rules = self._load_rules(rules_path)
 
-        # Extract keywords by urgency level for quick matching
-        self.red_keywords = self._extract_keywords(self.rules.get('critical_red_flags', []))
-        self.yellow_keywords = self._extract_keywords(self.rules.get('warning_yellow_flags', []))
-        self.green_keywords = self._extract_keywords(self.rules.get('green_flags', []))
+        # Every keyword of every level in one automaton, compiled once
+        self._compile_matcher()
 
     def _load_rules(self, rules_path: str) -> Dict:
         """Load red flag rules from JSON file"""
@@ -44,16 +53,49 @@ class UrgencyEngine:
                 'green_flags': []
             }
 
-    def _extract_keywords(self, flag_list: List[Dict]) -> List[Tuple[List[str], str, str]]:
-        """Extract keywords from flag rules"""
+    def _compile_matcher(self):
+        """Compile all rule keywords into one automaton mapping each hit to its rule"""
+        self.patterns = []  # pattern id -> (level, rule index, keyword index)
         keywords = []
-        for flag in flag_list:
-            keywords.append((
-                flag['keywords'],
-                flag['reason'],
-                flag['action']
-            ))
-        return keywords
+        for level, (key, _, _) in enumerate(FLAG_LEVELS):
+            for rule_index, rule in enumerate(self.rules.get(key, [])):
+                for keyword_index, keyword in enumerate(rule['keywords']):
+                    self.patterns.append((level, rule_index, keyword_index))
+                    keywords.append(keyword)
+        self.matcher = KeywordAutomaton(keywords)
+
+    def match_flags(self, text: str) -> Dict[str, List[Dict]]:
+        """
+        Find red, yellow and green keyword hits in one pass
+
+        Each rule fires at most once, reporting its first listed keyword
+        that occurs in the text (whole words; see KeywordAutomaton).
+
+        Args:
+            text: Preprocessed complaint text
+
+        Returns:
+            Flags per urgency level ('Red', 'Yellow', 'Green'), in rule order
+        """
+        # (level, rule) -> lowest matching keyword index
+        fired = {}
+        for hit in self.matcher.find_all(text):
+            level, rule_index, keyword_index = self.patterns[hit.pattern]
+            if keyword_index < fired.get((level, rule_index), len(self.patterns)):
+                fired[(level, rule_index)] = keyword_index
+
+        flags = {urgency: [] for _, urgency, _ in FLAG_LEVELS}
+        for level, rule_index in sorted(fired):
+            key, urgency, severity = FLAG_LEVELS[level]
+            rule = self.rules[key][rule_index]
+            flags[urgency].append({
+                'urgency': urgency,
+                'keyword': rule['keywords'][fired[(level, rule_index)]],
+                'reason': rule['reason'],
+                'action': rule['action'],
+                'severity': severity
+            })
+        return flags
 
     def detect_red_flags(self, text: str, numeric_data: Dict = None) -> List[Dict]:
         """
@@ -66,35 +108,10 @@ class UrgencyEngine:
         Returns:
             List of detected red flags with details
         """
-        text_lower = text.lower()
-        detected_flags = []
-
-        # Check critical red flags
-        for keywords, reason, action in self.red_keywords:
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    detected_flags.append({
-                        'urgency': 'Red',
-                        'keyword': keyword,
-                        'reason': reason,
-                        'action': action,
-                        'severity': 'Critical'
-                    })
-                    break  # One match per rule is enough
-
-        # Check warning yellow flags
-        if not detected_flags:  # Only check yellow if no red flags
-            for keywords, reason, action in self.yellow_keywords:
-                for keyword in keywords:
-                    if keyword.lower() in text_lower:
-                        detected_flags.append({
-                            'urgency': 'Yellow',
-                            'keyword': keyword,
-                            'reason': reason,
-                            'action': action,
-                            'severity': 'Warning'
-                        })
-                        break
+        flags = self.match_flags(text)
+
+        # Critical red flags; yellow flags only count when there is no red one
+        detected_flags = flags['Red'] or flags['Yellow']
 
         # Check numeric data for additional red flags
         if numeric_data:
@@ -150,6 +167,47 @@ class UrgencyEngine:
                     'severity': 'Warning'
                 })
 
+        # Oxygen saturation thresholds
+        if numeric_data.get('spo2'):
+            spo2 = numeric_data['spo2']
+            if spo2 < 90:
+                flags.append({
+                    'urgency': 'Red',
+                    'keyword': f'saturasi oksigen rendah ({spo2}%)',
+                    'reason': 'Hipoksemia, risiko gagal napas',
+                    'action': 'Segera ke IGD',
+                    'severity': 'Critical'
+                })
+            elif spo2 < 95:
+                flags.append({
+                    'urgency': 'Yellow',
+                    'keyword': f'saturasi oksigen menurun ({spo2}%)',
+                    'reason': 'Saturasi oksigen di bawah normal',
+                    'action': 'Konsultasi dokter segera',
+                    'severity': 'Warning'
+                })
+
+        # Heart rate thresholds
+        if numeric_data.get('heart_rate'):
+            heart_rate = numeric_data['heart_rate']
+            band, _ = heart_rate_severity(heart_rate)
+            if band == 2:
+                flags.append({
+                    'urgency': 'Red',
+                    'keyword': f'denyut nadi abnormal ({heart_rate} bpm)',
+                    'reason': 'Gangguan irama/denyut jantung berat',
+                    'action': 'Segera ke IGD',
+                    'severity': 'Critical'
+                })
+            elif band == 1:
+                flags.append({
+                    'urgency': 'Yellow',
+                    'keyword': f'denyut nadi abnormal ({heart_rate} bpm)',
+                    'reason': 'Denyut jantung di luar batas normal',
+                    'action': 'Konsultasi dokter dalam 24 jam',
+                    'severity': 'Warning'
+                })
+
         # Duration thresholds
         if numeric_data.get('duration_days'):
             days = numeric_data['duration_days']
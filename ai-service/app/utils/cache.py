@@ -0,0 +1,120 @@
+"""
+In-process caching utilities
+Thread-safe, size-bounded LRU cache with hit/miss/eviction counters
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+def approximate_size(obj: Any) -> int:
+    """Deep size in bytes of plain values (dicts, lists, tuples, strings, numbers)"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(key) + approximate_size(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item) for item in obj)
+    return size
+
+
+class LRUCache:
+    """Size-bounded least-recently-used cache, safe across threads"""
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 1024, sizeof: Callable[[Any], int] = None):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of entries (0 disables caching)
+            sizeof: Optional entry size function (e.g. approximate_size);
+                enables the "bytes" statistic
+        """
+        self.maxsize = max(0, int(maxsize))
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._sizes = {}
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value and mark it as recently used"""
+        with self._lock:
+            value = self._data.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store value, evicting the least recently used entry if full"""
+        if self.maxsize == 0:
+            return
+
+        size = self.sizeof(key) + self.sizeof(value) if self.sizeof else 0
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.sizeof:
+                self.bytes += size - self._sizes.get(key, 0)
+                self._sizes[key] = size
+            while len(self._data) > self.maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                self.bytes -= self._sizes.pop(evicted, 0)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return cached value, computing and storing it on a miss
+
+        The computation runs outside the lock, so concurrent misses for the
+        same key may compute twice; the results are identical either way.
+        """
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": f"{(self.hits / lookups * 100):.1f}%" if lookups > 0 else "N/A"
+            }
+            if self.sizeof:
+                stats["bytes"] = self.bytes
+            return stats
+
+    def __getstate__(self):
+        # Entries and the lock stay in this process (e.g. when a
+        # preprocessor is sent to worker processes)
+        return {'maxsize': self.maxsize, 'sizeof': self.sizeof}
+
+    def __setstate__(self, state):
+        self.__init__(state['maxsize'], state.get('sizeof'))
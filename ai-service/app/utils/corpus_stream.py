@@ -0,0 +1,215 @@
+"""
+Streaming preprocessing for large complaint corpora
+Reads CSV / Parquet / NDJSON in chunks and writes results incrementally,
+with resumable progress checkpoints
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional
+
+import pandas as pd
+
+from app.utils.preprocessor import IndonesianPreprocessor, preprocessor as default_preprocessor
+
+
+def _format(path: str) -> str:
+    """Detect file format from extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.csv', '.tsv'):
+        return 'csv'
+    if extension in ('.ndjson', '.jsonl', '.json'):
+        return 'ndjson'
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    raise ValueError(f"Unsupported corpus format: {path}")
+
+
+def iter_chunks(path: str, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+    """
+    Read a corpus lazily in chunks of rows
+
+    Args:
+        path: CSV, NDJSON or Parquet file
+        chunk_size: Rows per chunk
+
+    Yields:
+        DataFrame chunks (memory bounded by chunk_size)
+    """
+    file_format = _format(path)
+
+    if file_format == 'csv':
+        sep = '\t' if path.lower().endswith('.tsv') else ','
+        yield from pd.read_csv(path, chunksize=chunk_size, sep=sep)
+
+    elif file_format == 'ndjson':
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size)
+
+    else:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet corpora requires pyarrow (pip install pyarrow)")
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+def preprocess_chunks(
+    chunks: Iterator[pd.DataFrame],
+    column: str = 'complaint',
+    preprocessor: IndonesianPreprocessor = None,
+    n_jobs: int = 1
+) -> Iterator[pd.DataFrame]:
+    """
+    Preprocess each chunk, keeping the other input columns
+
+    Yields:
+        Input columns plus processed text, tokens, numeric fields and symptoms
+    """
+    preprocessor = preprocessor or default_preprocessor
+
+    # One worker pool for the whole stream
+    executor = preprocessor.batch_executor(n_jobs)
+    try:
+        for chunk in chunks:
+            yield _preprocess_chunk(chunk, column, preprocessor, executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _preprocess_chunk(
+    chunk: pd.DataFrame,
+    column: str,
+    preprocessor: IndonesianPreprocessor,
+    executor: Optional[ProcessPoolExecutor]
+) -> pd.DataFrame:
+    """Preprocess one chunk and join it to the passthrough columns"""
+    processed = preprocessor.preprocess_many(chunk[column], executor=executor)
+    processed = processed.drop(columns=['original'])
+    passthrough = chunk.drop(columns=[name for name in processed.columns if name in chunk.columns])
+    return pd.concat([passthrough, processed], axis=1)
+
+
+def _render_chunk(frame: pd.DataFrame, file_format: str, header: bool) -> bytes:
+    """Serialize one processed chunk for appending to the output"""
+    if frame.empty:
+        return b''
+
+    if file_format == 'ndjson':
+        text = frame.to_json(orient='records', lines=True, force_ascii=False)
+        if not text.endswith('\n'):
+            text += '\n'
+    else:
+        frame = frame.copy()
+        frame['tokens'] = frame['tokens'].map(' '.join)
+        frame['symptoms'] = frame['symptoms'].map('|'.join)
+        text = frame.to_csv(index=False, header=header)
+
+    return text.encode('utf-8')
+
+
+def _save_checkpoint(path: str, state: Dict):
+    """Write checkpoint atomically (never leaves a half-written file)"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def preprocess_corpus(
+    input_path: str,
+    output_path: str,
+    column: str = 'complaint',
+    chunk_size: int = 10000,
+    n_jobs: int = 1,
+    resume: bool = True,
+    preprocessor: IndonesianPreprocessor = None,
+    checkpoint_path: Optional[str] = None
+) -> Dict:
+    """
+    Preprocess a corpus of any size with constant memory
+
+    Each chunk is appended to the output and fsynced before the checkpoint
+    is advanced. On resume, the output is truncated back to the last
+    checkpoint and already processed chunks are skipped.
+
+    Args:
+        input_path: CSV, NDJSON or Parquet corpus
+        output_path: Output file (.csv or .ndjson/.jsonl)
+        column: Name of the complaint text column
+        chunk_size: Rows per chunk
+        n_jobs: Worker processes, shared by all chunks (see preprocess_many)
+        resume: Continue from an existing checkpoint
+        preprocessor: Preprocessor to use (default singleton)
+        checkpoint_path: Checkpoint file (default <output_path>.checkpoint.json)
+
+    Returns:
+        Final checkpoint state
+    """
+    preprocessor = preprocessor or default_preprocessor
+    output_format = _format(output_path)
+    if output_format == 'parquet':
+        raise ValueError("Streaming output must be CSV or NDJSON (append-only)")
+
+    checkpoint_path = checkpoint_path or output_path + '.checkpoint.json'
+    state = {
+        'input_path': os.path.abspath(input_path),
+        'chunk_size': chunk_size,
+        'config_version': preprocessor.config_version,
+        'chunks_done': 0,
+        'rows_done': 0,
+        'output_bytes': 0,
+        'completed': False
+    }
+
+    if resume and os.path.exists(checkpoint_path) and os.path.exists(output_path):
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        for key in ('input_path', 'chunk_size', 'config_version'):
+            if saved.get(key) != state[key]:
+                raise ValueError(
+                    f"Checkpoint {checkpoint_path} does not match this run ({key} changed); "
+                    f"use resume=False to start over"
+                )
+        state = saved
+        if state['completed']:
+            return state
+        print(f"[RESUME] {state['rows_done']} rows already processed")
+
+    mode = 'r+b' if state['output_bytes'] else 'wb'
+    with open(output_path, mode) as f:
+        # Drop anything written after the last checkpoint
+        f.seek(state['output_bytes'])
+        f.truncate()
+
+        # One worker pool for the whole stream
+        executor = preprocessor.batch_executor(n_jobs)
+        try:
+            chunks = iter_chunks(input_path, chunk_size=chunk_size)
+            for index, chunk in enumerate(chunks):
+                if index < state['chunks_done']:
+                    continue
+
+                processed = _preprocess_chunk(chunk, column, preprocessor, executor)
+                f.write(_render_chunk(processed, output_format, header=state['output_bytes'] == 0))
+                f.flush()
+                os.fsync(f.fileno())
+
+                state['chunks_done'] = index + 1
+                state['rows_done'] += len(chunk)
+                state['output_bytes'] = f.tell()
+                _save_checkpoint(checkpoint_path, state)
+                print(f"[CHUNK {index + 1}] {state['rows_done']} rows processed")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    state['completed'] = True
+    _save_checkpoint(checkpoint_path, state)
+    return state
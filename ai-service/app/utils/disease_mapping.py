@@ -0,0 +1,291 @@
+"""
+DATABASE disease-symptom table to the Indonesian training format
+Symptom translation and disease -> category mapping shared by
+prepare_dataset_improved.py and model selection
+"""
+
+import os
+from typing import Dict, List
+
+import pandas as pd
+
+
+DESCRIPTION_FILE = 'symptom_Description.csv'
+
+
+# Symptom translation with medical accuracy
+SYMPTOM_TRANSLATION = {
+    # Respiratory
+    'cough': 'batuk',
+    'breathlessness': 'sesak napas',
+    'rusty_sputum': 'dahak kemerahan',
+    'continuous_sneezing': 'bersin terus-menerus',
+    'runny_nose': 'pilek',
+    'congestion': 'hidung tersumbat',
+    'sinus_pressure': 'tekanan sinus',
+    'loss_of_smell': 'hilang penciuman',
+    'phlegm': 'dahak',
+    'throat_irritation': 'tenggorokan gatal',
+
+    # Cardiovascular
+    'chest_pain': 'nyeri dada',
+    'fast_heart_rate': 'jantung berdetak cepat',
+    'palpitations': 'jantung berdebar',
+    'irregular_sugar_level': 'gula darah tidak stabil',
+    'prominent_veins_on_calf': 'pembuluh darah menonjol',
+    'swollen_legs': 'kaki bengkak',
+    'swollen_blood_vessels': 'pembuluh darah bengkak',
+    'puffy_face_and_eyes': 'wajah dan mata bengkak',
+
+    # Gastrointestinal
+    'stomach_pain': 'sakit perut',
+    'acidity': 'asam lambung',
+    'vomiting': 'muntah',
+    'nausea': 'mual',
+    'diarrhoea': 'diare',
+    'constipation': 'sembelit',
+    'abdominal_pain': 'nyeri perut',
+    'stomach_bleeding': 'pendarahan lambung',
+    'distention_of_abdomen': 'perut kembung',
+    'loss_of_appetite': 'hilang nafsu makan',
+    'indigestion': 'gangguan pencernaan',
+    'passage_of_gases': 'perut kembung',
+    'belly_pain': 'sakit perut',
+    'pain_during_bowel_movements': 'nyeri saat BAB',
+    'bloody_stool': 'tinja berdarah',
+
+    # Neurological
+    'headache': 'sakit kepala',
+    'dizziness': 'pusing',
+    'loss_of_balance': 'kehilangan keseimbangan',
+    'lack_of_concentration': 'sulit konsentrasi',
+    'stiff_neck': 'leher kaku',
+    'unsteadiness': 'tidak stabil',
+    'weakness_of_one_body_side': 'lemah satu sisi tubuh',
+    'altered_sensorium': 'penurunan kesadaran',
+    'visual_disturbances': 'gangguan penglihatan',
+    'spinning_movements': 'pusing berputar',
+    'slurred_speech': 'bicara pelo',
+    'loss_of_smell': 'hilang penciuman',
+
+    # Dermatological
+    'itching': 'gatal',
+    'skin_rash': 'ruam kulit',
+    'nodal_skin_eruptions': 'bintik kulit',
+    'dischromic_patches': 'bercak kulit',
+    'blackheads': 'komedo',
+    'scurring': 'bekas luka',
+    'skin_peeling': 'kulit mengelupas',
+    'silver_like_dusting': 'kulit bersisik',
+    'small_dents_in_nails': 'kuku berlubang',
+    'inflammatory_nails': 'kuku meradang',
+    'blister': 'lepuh',
+    'red_sore_around_nose': 'luka merah hidung',
+    'yellow_crust_ooze': 'kerak kuning',
+    'pus_filled_pimples': 'jerawat bernanah',
+
+    # Endocrine/Metabolic
+    'weight_loss': 'berat badan turun',
+    'weight_gain': 'berat badan naik',
+    'excessive_hunger': 'sangat lapar',
+    'increased_appetite': 'nafsu makan meningkat',
+    'polyuria': 'sering buang air kecil',
+    'dehydration': 'dehidrasi',
+    'increased_appetite': 'nafsu makan tinggi',
+    'lethargy': 'lesu',
+    'patches_in_throat': 'bercak tenggorokan',
+    'obesity': 'obesitas',
+
+    # Musculoskeletal
+    'joint_pain': 'nyeri sendi',
+    'muscle_weakness': 'otot lemah',
+    'muscle_pain': 'nyeri otot',
+    'back_pain': 'sakit pinggang',
+    'neck_pain': 'nyeri leher',
+    'knee_pain': 'nyeri lutut',
+    'hip_joint_pain': 'nyeri pinggul',
+    'muscle_wasting': 'otot mengecil',
+    'swelling_joints': 'sendi bengkak',
+    'movement_stiffness': 'kaku bergerak',
+    'painful_walking': 'nyeri saat jalan',
+
+    # Urological
+    'burning_micturition': 'nyeri saat buang air kecil',
+    'spotting_urination': 'bercak saat BAK',
+    'continuous_feel_of_urine': 'ingin BAK terus',
+    'bladder_discomfort': 'tidak nyaman kandung kemih',
+    'foul_smell_of_urine': 'bau urin tidak sedap',
+    'dark_urine': 'urin gelap',
+    'yellow_urine': 'urin kuning',
+
+    # General symptoms
+    'high_fever': 'demam tinggi',
+    'mild_fever': 'demam ringan',
+    'fatigue': 'lemas',
+    'weakness': 'lemah',
+    'restlessness': 'gelisah',
+    'chills': 'meriang',
+    'shivering': 'menggigil',
+    'sweating': 'berkeringat',
+    'cold_hands_and_feets': 'tangan kaki dingin',
+    'anxiety': 'cemas',
+    'depression': 'depresi',
+    'irritability': 'mudah marah',
+    'mood_swings': 'perubahan mood',
+    'coma': 'tidak sadarkan diri',
+
+    # Liver/Hepatic
+    'yellowish_skin': 'kulit kuning',
+    'yellowing_of_eyes': 'mata kuning',
+    'acute_liver_failure': 'gagal hati akut',
+    'swelling_of_stomach': 'perut bengkak',
+    'fluid_overload': 'kelebihan cairan',
+    'malaise': 'tidak enak badan',
+
+    # Infectious
+    'toxic_look_(typhos)': 'tampak sakit berat',
+    'mild_fever': 'demam ringan',
+    'red_spots_over_body': 'bintik merah',
+    'watering_from_eyes': 'mata berair',
+    'sunken_eyes': 'mata cekung',
+}
+
+def translate_symptom(symptom: str) -> str:
+    """Indonesian phrase for a DATABASE symptom name (underscored English)"""
+    # The table has stray spaces inside names, e.g. 'dischromic _patches'
+    symptom_clean = symptom.strip().replace(' ', '').lower()
+    return SYMPTOM_TRANSLATION.get(symptom_clean, symptom_clean.replace('_', ' '))
+
+# Disease to category mapping using descriptions
+def map_disease_to_category(disease: str, description: str = "") -> str:
+    """
+    Category for a DATABASE disease, using its name and description
+
+    Args:
+        disease: Disease name (e.g. 'Peptic ulcer diseae')
+        description: Disease description from symptom_Description.csv
+
+    Returns:
+        Indonesian category name (default 'Umum')
+    """
+    disease_lower = disease.lower()
+    desc_lower = description.lower() if description else ""
+    combined = f"{disease_lower} {desc_lower}"
+
+    # Cardiovascular - heart, blood vessels, circulation
+    if any(kw in combined for kw in [
+        'heart', 'cardiac', 'hypertension', 'varicose', 'blood pressure',
+        'artery', 'circulation', 'angina', 'myocardial'
+    ]):
+        return 'Kardiovaskular'
+
+    # Respiratory - lungs, breathing
+    if any(kw in combined for kw in [
+        'bronchial', 'asthma', 'pneumonia', 'tuberculosis', 'lung',
+        'respiratory', 'breathing', 'common cold', 'allergy', 'cough'
+    ]):
+        return 'Respirasi'
+
+    # Gastrointestinal - stomach, intestines, digestion
+    if any(kw in combined for kw in [
+        'gastro', 'ulcer', 'gerd', 'peptic', 'stomach', 'intestin',
+        'digest', 'bowel', 'diarr', 'constipat', 'hemorrhoid'
+    ]):
+        return 'Gastrointestinal'
+
+    # Neurological - brain, nerves, nervous system
+    if any(kw in combined for kw in [
+        'migraine', 'vertigo', 'paralysis', 'cervical spondylosis',
+        'brain', 'nerve', 'neurolog', 'seizure', 'stroke', 'paralys'
+    ]):
+        return 'Neurologi'
+
+    # Dermatologi - skin
+    if any(kw in combined for kw in [
+        'fungal', 'acne', 'psoriasis', 'impetigo', 'urticaria',
+        'skin', 'dermat', 'rash', 'itch'
+    ]):
+        return 'Dermatologi'
+
+    # Endokrin - hormones, metabolism
+    if any(kw in combined for kw in [
+        'diabetes', 'hyperthyroid', 'hypothyroid', 'hypoglycemia',
+        'thyroid', 'hormone', 'metabol', 'endocrin'
+    ]):
+        return 'Endokrin'
+
+    # Muskuloskeletal - bones, joints, muscles
+    if any(kw in combined for kw in [
+        'arthritis', 'osteoarthritis', 'spondylosis', 'joint',
+        'bone', 'muscle', 'skeletal'
+    ]):
+        return 'Muskuloskeletal'
+
+    # Infeksi - infections
+    if any(kw in combined for kw in [
+        'malaria', 'dengue', 'typhoid', 'chicken pox', 'aids',
+        'hepatitis', 'infection', 'virus', 'bacteria', 'fever'
+    ]):
+        return 'Infeksi'
+
+    # Urologi - urinary system
+    if any(kw in combined for kw in [
+        'urinary tract infection', 'kidney', 'bladder', 'urin'
+    ]):
+        return 'Urologi'
+
+    # Ginekologi
+    if any(kw in combined for kw in [
+        'pregnan', 'menstrua', 'gynecolog', 'uterus'
+    ]):
+        return 'Ginekologi'
+
+    return 'Umum'
+
+
+def join_symptoms(symptoms: List[str]) -> str:
+    """'a', 'a dan b' or 'a, b, dan c'"""
+    if len(symptoms) <= 2:
+        return ' dan '.join(symptoms)
+    return ', '.join(symptoms[:-1]) + f", dan {symptoms[-1]}"
+
+
+def load_disease_descriptions(dataset_path: str) -> Dict[str, str]:
+    """Disease descriptions from symptom_Description.csv beside the table, if present"""
+    path = os.path.join(os.path.dirname(os.path.abspath(dataset_path)), DESCRIPTION_FILE)
+    if not os.path.exists(path):
+        print(f"Warning: {DESCRIPTION_FILE} not found; mapping diseases by name only")
+        return {}
+    descriptions = pd.read_csv(path)
+    return dict(zip(descriptions['Disease'].str.strip(), descriptions['Description'].fillna('')))
+
+
+def disease_table_to_dataset(df: pd.DataFrame, descriptions: Dict[str, str] = None) -> pd.DataFrame:
+    """
+    Translate the DATABASE disease table (Disease, Symptom_1..Symptom_17)
+
+    Each row becomes a complaint listing its translated symptoms, labelled
+    with the disease's category, so it shares the serving vocabulary and
+    category space.
+
+    Args:
+        df: Disease-symptom table
+        descriptions: Disease descriptions used for category mapping
+
+    Returns:
+        DataFrame with complaint, category and disease columns
+    """
+    descriptions = descriptions or {}
+    symptom_columns = [column for column in df.columns if column.startswith('Symptom')]
+    rows = []
+    for disease, symptoms in zip(df['Disease'], df[symptom_columns].itertuples(index=False)):
+        symptoms = [str(symptom).strip() for symptom in symptoms if pd.notna(symptom) and str(symptom).strip()]
+        if not symptoms:
+            continue
+        disease = str(disease).strip()
+        rows.append({
+            'complaint': 'Saya mengalami ' + join_symptoms([translate_symptom(s) for s in symptoms]),
+            'category': map_disease_to_category(disease, descriptions.get(disease, '')),
+            'disease': disease
+        })
+    return pd.DataFrame(rows, columns=['complaint', 'category', 'disease'])
@@ -0,0 +1,179 @@
+"""
+On-disk cache of vectorized training data
+Stores the fitted vectorizer and CSR train/test matrices under a key
+derived from dataset content, preprocessing version and vectorizer
+parameters, with a size limit and least-recently-used eviction
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, Optional
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+
+
+DEFAULT_FEATURE_CACHE_DIR = os.path.join(os.path.dirname(__file__), '../data/feature_cache')
+META_FILE = 'meta.json'
+
+
+def file_sha256(path: str) -> str:
+    """Content hash of a dataset file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """Directory of cached (vectorizer, X_train, X_test, y_train, y_test) entries"""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Cache directory (default app/data/feature_cache)
+            max_bytes: Total size limit (default FEATURE_CACHE_MAX_MB env or 512 MB)
+        """
+        self.cache_dir = cache_dir or DEFAULT_FEATURE_CACHE_DIR
+        if max_bytes is None:
+            max_bytes = int(os.getenv('FEATURE_CACHE_MAX_MB', '512')) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, dataset_path: str, preprocessing: str, vectorizer, split: Dict) -> Dict:
+        """
+        Build the cache key for one training run
+
+        Args:
+            dataset_path: Dataset file (hashed by content, not by name)
+            preprocessing: Preprocessing version of the training text
+            vectorizer: Unfitted vectorizer (its parameters are part of the key)
+            split: Train/test split parameters
+
+        Returns:
+            Key components plus their digest under 'key'
+        """
+        components = {
+            'dataset_sha256': file_sha256(dataset_path),
+            'preprocessing': preprocessing,
+            'vectorizer': type(vectorizer).__name__,
+            'vectorizer_params': vectorizer.get_params(),
+            'split': split,
+        }
+        payload = json.dumps(components, sort_keys=True, default=repr)
+        components['key'] = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+        return components
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: Dict) -> Optional[Dict]:
+        """
+        Load a cached entry
+
+        Returns:
+            Dict with vectorizer, X_train, X_test, y_train, y_test, or None
+        """
+        path = self._entry_path(key['key'])
+        if not os.path.exists(os.path.join(path, META_FILE)):
+            self.misses += 1
+            return None
+
+        try:
+            labels = np.load(os.path.join(path, 'labels.npz'), allow_pickle=False)
+            entry = {
+                'vectorizer': joblib.load(os.path.join(path, 'vectorizer.pkl')),
+                'X_train': sp.load_npz(os.path.join(path, 'X_train.npz')),
+                'X_test': sp.load_npz(os.path.join(path, 'X_test.npz')),
+                'y_train': labels['y_train'].astype(object),
+                'y_test': labels['y_test'].astype(object),
+            }
+        except Exception as e:
+            # A damaged entry is treated as a miss and removed
+            print(f"Warning: Dropping unreadable feature cache entry {key['key']}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            self.misses += 1
+            return None
+
+        # Access time drives LRU eviction
+        os.utime(os.path.join(path, META_FILE))
+        self.hits += 1
+        return entry
+
+    def put(self, key: Dict, vectorizer, X_train, X_test, y_train, y_test):
+        """Store an entry (written to a temp dir, then renamed into place) and evict"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(key['key'])
+        tmp_path = path + f'.tmp{os.getpid()}'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        joblib.dump(vectorizer, os.path.join(tmp_path, 'vectorizer.pkl'))
+        sp.save_npz(os.path.join(tmp_path, 'X_train.npz'), sp.csr_matrix(X_train))
+        sp.save_npz(os.path.join(tmp_path, 'X_test.npz'), sp.csr_matrix(X_test))
+        np.savez(
+            os.path.join(tmp_path, 'labels.npz'),
+            y_train=np.asarray(y_train, dtype=str),
+            y_test=np.asarray(y_test, dtype=str)
+        )
+        with open(os.path.join(tmp_path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({**key, 'created_at': time.time()}, f, indent=2, default=repr)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def _entries(self):
+        """(last access, size, path) of every complete entry"""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            meta_path = os.path.join(path, META_FILE)
+            if not os.path.exists(meta_path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((os.path.getmtime(meta_path), size, path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until the cache fits max_bytes
+
+        Returns:
+            Number of evicted entries
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        # The most recent entry is kept even if it alone exceeds the limit
+        while total > self.max_bytes and len(entries) > 1:
+            _, size, path = entries.pop(0)
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            evicted += 1
+        return evicted
+
+    def clear(self):
+        """Delete every entry"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,53 @@
+"""
+Process memory measurement
+Current and peak resident set size without third-party dependencies
+(/proc on Linux, getrusage elsewhere)
+"""
+
+import os
+import sys
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process now (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """Highest resident set size this process has reached (since the last reset)"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        # Windows: no getrusage
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Restart peak RSS tracking from the current RSS (Linux only)
+
+    Returns:
+        True if the peak was reset; otherwise peak_rss_bytes() stays the
+        lifetime peak of the process
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
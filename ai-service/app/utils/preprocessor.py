@@ -3,92 +3,545 @@ Text Preprocessor untuk Bahasa Indonesia
 Handles cleaning, normalization, and tokenization of medical complaints
 """
 
+import hashlib
+import json
+import os
 import re
 import string
-from typing import List, Dict
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Iterable, Optional, NamedTuple, Union
 import unicodedata
 
+import pandas as pd
+
+from app.utils.cache import LRUCache
+from app.utils.spelling import SymSpellIndex, load_lexicon
+from app.utils.stemmer import stemmer as shared_stemmer
+from app.utils.term_matcher import TermNormalizer, PhraseMatcher, TermMatch, word_spans
+from app.utils.vitals import heart_rate_severity
+
+
+# Bump when the preprocessing logic changes, so cached results are not reused
+PIPELINE_VERSION = 7
+
+ALPHA_WORD_PATTERN = re.compile(r'[^\W\d_]+')
+ELONGATION_PATTERN = re.compile(r'(.)\1{2,}')
+
+# A typo correction must be this many times more frequent (in the complaint
+# corpus) than any other candidate at the same edit distance
+SPELLING_MARGIN = 3.0
+
+
+class NumericReading(NamedTuple):
+    """Numeric health reading found in a complaint"""
+    kind: str  # temperature, blood_pressure, duration_days, age, heart_rate, spo2
+    value: Union[float, int, Tuple[int, int]]  # (systolic, diastolic) for blood_pressure
+    unit: str
+    start: int
+    end: int
+
+
+DURATION_UNIT_DAYS = {
+    'hari': 1, 'hr': 1, 'day': 1, 'days': 1,
+    'minggu': 7, 'week': 7, 'weeks': 7,
+    'bulan': 30, 'month': 30, 'months': 30,
+    'tahun': 365, 'thn': 365, 'year': 365, 'years': 365,
+}
+
+# Plausible body temperatures (Celsius) for a number after demam/panas/suhu
+BARE_TEMPERATURE_RANGE = (34.0, 43.0)
+
+# One alternation for all vitals; the name of the matching group is the
+# reading kind. Labelled forms (usia, nadi, spo2) come first so that
+# e.g. "umur 30 tahun" is an age and not a 30-year duration. "N bulan/
+# tahun" right after an age or pregnancy word ("anak 2 tahun", "hamil 5
+# bulan") is an age or gestation and dropped, unless "(yang) lalu" marks it
+# as elapsed time; every other "N hari/minggu/bulan/tahun" is a duration.
+VITALS_PATTERN = re.compile(r"""
+    (?P<age>\b(?:umur|usia)\s*:?\s*(?P<age_value>\d{1,3})(?:\s*(?:tahun|thn|th)\b)?)
+  | (?P<heart_rate_labeled>\b(?:denyut\s+(?:jantung|nadi)|detak\s+jantung|nadi|heart\s*rate|hr)
+        \s*:?\s*(?P<heart_rate_labeled_value>\d{2,3})(?!\d)
+        (?:\s*(?:bpm|x\s*/\s*menit|kali\s*/\s*menit|kali\s+per\s+menit)(?![a-z]))?)
+  | (?P<spo2>\b(?:spo2|sp\s*o2|sat\s*o2|saturasi(?:\s+oksigen|\s+o2)?)
+        \s*:?\s*(?P<spo2_value>\d{2,3})(?!\d)\s*%?)
+  | (?P<blood_pressure>(?<![\d.,])(?P<systolic>\d{2,3})\s*/\s*(?P<diastolic>\d{2,3})(?!\d)
+        (?:\s*mm\s*hg(?![a-z]))?)
+  | (?P<temperature>(?<![\d.,])(?P<temperature_value>\d{2,3}(?:[.,]\d{1,2})?)
+        \s*(?:derajat(?:\s*(?:celcius|celsius|c)(?![a-z]))?|°\s*c?|celcius|celsius|c)(?![a-z]))
+  | (?P<temperature_bare>\b(?:demam|panas|suhu(?:\s+(?:tubuh|badan))?)\s*:?\s*
+        (?P<temperature_bare_value>\d{2}(?:[.,]\d{1,2})?)(?![\d.,]?\d)
+        (?!\s*(?:hari|hr|days?|minggu|weeks?|bulan|months?|tahun|thn|years?|x|kali)(?![a-z])))
+  | (?P<heart_rate>(?<![\d.,])(?P<heart_rate_value>\d{2,3})
+        \s*(?:bpm|x\s*/\s*menit|kali\s*/\s*menit|kali\s+per\s+menit)(?![a-z]))
+  | (?P<duration>(?P<duration_age>\b(?:anak|bayi|balita|cucu|adik|hamil|kehamilan|kandungan|berumur|berusia)
+        (?:\s+(?:saya|kami|ku|nya))?\s+)?
+        (?P<duration_since>\b(?:sejak|selama|sudah|sdh|udah|telah|since|for)
+        \s+(?:(?:sejak|selama)\s+)?)?(?<![\d.,])(?P<duration_value>\d{1,4})
+        \s*(?P<duration_unit>hari|hr|days?|minggu|weeks?|bulan|months?|tahun|thn|years?)(?![a-z])
+        (?P<duration_ago>\s+(?:yang\s+)?(?:lalu|terakhir|belakangan|ago)\b)?)
+""", re.IGNORECASE | re.VERBOSE)
+
+
+def summarize_readings(readings: List[NumericReading]) -> Dict[str, any]:
+    """
+    Reduce all readings to the worst value of each kind
+
+    Highest temperature and duration, lowest SpO2, the heart rate farthest
+    outside the normal range (either side, urgency engine bands) and the
+    blood pressure closest to crisis level (180/120) are kept.
+    """
+    extracted = {
+        'temperature': None,
+        'blood_pressure': None,
+        'duration_days': None,
+        'age': None,
+        'heart_rate': None,
+        'spo2': None
+    }
+
+    for reading in readings:
+        current = extracted[reading.kind]
+
+        if reading.kind == 'blood_pressure':
+            systolic, diastolic = reading.value
+            if current is None or max(systolic / 180, diastolic / 120) > max(
+                current['systolic'] / 180, current['diastolic'] / 120
+            ):
+                extracted['blood_pressure'] = {'systolic': systolic, 'diastolic': diastolic}
+
+        elif reading.kind == 'age':
+            if current is None:
+                extracted['age'] = reading.value
+
+        elif reading.kind == 'spo2':
+            if current is None or reading.value < current:
+                extracted['spo2'] = reading.value
+
+        elif reading.kind == 'heart_rate':
+            if current is None or heart_rate_severity(reading.value) > heart_rate_severity(current):
+                extracted['heart_rate'] = reading.value
+
+        elif current is None or reading.value > current:
+            extracted[reading.kind] = reading.value
+
+    return extracted
+
+
+@dataclass(frozen=True)
+class PreprocessedComplaint:
+    """Immutable result of preprocessing one complaint"""
+
+    original: str
+    cleaned: str
+    normalized: str
+    tokens: Tuple[str, ...]
+    content_tokens: Tuple[str, ...]  # tokens without stopwords
+    numeric_readings: Tuple[NumericReading, ...]  # spans refer to `original`
+    symptoms: Tuple[str, ...]
+    symptom_matches: Tuple[TermMatch, ...] = ()  # spans refer to `processed`
+    stemmed_tokens: Tuple[str, ...] = ()  # only when stemming is enabled
+
+    @property
+    def numeric_data(self) -> Dict[str, any]:
+        """
+        Worst reading of each kind, as a new dict on every access
+
+        The analysis is shared through the cache, so it only holds the
+        immutable readings; callers are free to modify the returned dict.
+        """
+        return summarize_readings(self.numeric_readings)
+
+    @property
+    def processed(self) -> str:
+        """Processed text (stopwords kept), used for classification and urgency"""
+        return ' '.join(self.tokens)
+
+    @property
+    def stemmed(self) -> str:
+        """Stemmed processed text (processed text if stemming is disabled)"""
+        return ' '.join(self.stemmed_tokens) if self.stemmed_tokens else self.processed
+
+    @property
+    def processed_no_stopwords(self) -> str:
+        """Processed text without stopwords"""
+        return ' '.join(self.content_tokens)
+
+    def to_dict(self, remove_stops: bool = False) -> Dict[str, any]:
+        """Legacy preprocess() result format"""
+        tokens = self.content_tokens if remove_stops else self.tokens
+        result = {
+            'original': self.original,
+            'processed': ' '.join(tokens),
+            'tokens': list(tokens),
+            'numeric_data': self.numeric_data
+        }
+        if self.stemmed_tokens:
+            result['stemmed'] = self.stemmed
+        return result
+
+
+DEFAULT_DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), '../data/normalization_dictionary.json')
+DEFAULT_CORPUS_PATH = os.path.join(os.path.dirname(__file__), '../data/symptoms_dataset.csv')
+
+
+def load_normalization_dictionary(path: str) -> Tuple[Optional[int], Dict[str, str], List[str]]:
+    """
+    Load the versioned normalization dictionary
+
+    Args:
+        path: Path to normalization_dictionary.json
+
+    Returns:
+        Tuple of (version, medical_terms_map, stopwords); map order is kept
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    terms_map = {}
+    for group in data.get('medical_terms', {}).values():
+        for term, standard in group.items():
+            if not isinstance(term, str) or not isinstance(standard, str) or not term.strip():
+                raise ValueError(f"Invalid medical term entry: {term!r} -> {standard!r}")
+            terms_map[term] = standard
+
+    stopwords = data.get('stopwords', [])
+    if not all(isinstance(word, str) for word in stopwords):
+        raise ValueError("Stopwords must be strings")
+
+    return data.get('version'), terms_map, stopwords
+
+
+class NormalizationSnapshot:
+    """
+    Immutable, fully compiled normalization state
+
+    The preprocessor swaps whole snapshots, so a request always sees either
+    the old or the new dictionary, never a partially built one.
+    """
+
+    def __init__(
+        self,
+        medical_terms_map: Dict[str, str],
+        stopwords: Iterable[str],
+        symptom_keywords: Dict[str, str],
+        protected_words: Iterable[str] = (),
+        fuzzy: bool = False,
+        settings: Dict = None,
+        version: Optional[int] = None,
+        red_words: Iterable[str] = (),
+        lexicon: Iterable[str] = None,
+        word_frequencies: Dict[str, int] = None
+    ):
+        start = time.perf_counter()
+
+        self.version = version
+        self.medical_terms_map = dict(medical_terms_map)
+        self.stopwords = frozenset(stopwords)
+        self.symptom_keywords = dict(symptom_keywords)
+
+        # Compile the normalization map once into a single-pass matcher
+        self.term_normalizer = TermNormalizer(self.medical_terms_map)
+
+        # Symptom vocabulary compiled into a word-level trie
+        self.symptom_matcher = PhraseMatcher(self.symptom_keywords)
+
+        # Canonical medical vocabulary for typo correction; words already
+        # known anywhere in the pipeline are never rewritten, and words that
+        # are (or normalize to) single-word Red keywords are never a
+        # correction target, since a wrong guess there alone escalates
+        # triage. Without a general lexicon nothing is corrected.
+        vocabulary = set()
+        for phrase in list(self.medical_terms_map) + list(self.medical_terms_map.values()) + list(self.symptom_keywords):
+            vocabulary.update(ALPHA_WORD_PATTERN.findall(phrase))
+        protected_words = set(protected_words)
+        red_words = set(red_words)
+        self.known_words = frozenset(vocabulary | self.stopwords | protected_words | red_words)
+        self.lexicon = frozenset(lexicon or ())
+        fuzzy = bool(fuzzy and self.lexicon)
+        targets = {
+            word for word in vocabulary
+            if not red_words.intersection(ALPHA_WORD_PATTERN.findall(self.term_normalizer.normalize(word)))
+        }
+        self.spelling_index = SymSpellIndex(
+            targets, max_distance=2, frequencies=word_frequencies
+        ) if fuzzy else None
+
+        payload = json.dumps(
+            [PIPELINE_VERSION, self.medical_terms_map, sorted(self.stopwords), self.symptom_keywords,
+             fuzzy, sorted(protected_words), sorted(red_words), len(self.lexicon), settings or {}],
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        self.config_version = hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+        self.compile_seconds = time.perf_counter() - start
+
+    def get_info(self) -> Dict:
+        """Dictionary size, versions and compile time"""
+        return {
+            'dictionary_version': self.version,
+            'config_version': self.config_version,
+            'medical_terms': len(self.medical_terms_map),
+            'stopwords': len(self.stopwords),
+            'symptom_keywords': len(self.symptom_keywords),
+            'compile_ms': round(self.compile_seconds * 1000, 2)
+        }
+
+
 class IndonesianPreprocessor:
     """Preprocessor for Indonesian medical text"""
 
-    def __init__(self):
-        # Common medical terms normalization
-        self.medical_terms_map = {
-            # Symptoms
-            'pusing': 'pusing',
-            'puzing': 'pusing',
-            'mumet': 'pusing',
-            'demem': 'demam',
-            'panas': 'demam',
-            'batuk2': 'batuk',
-            'batuk-batuk': 'batuk',
-            'pilek': 'pilek',
-            'meler': 'pilek',
-            'sesek': 'sesak napas',
-            'sesak': 'sesak napas',
-            'napas pendek': 'sesak napas',
-            'dada sakit': 'nyeri dada',
-            'sakit dada': 'nyeri dada',
-            'perut sakit': 'sakit perut',
-            'mual2': 'mual',
-            'muntah2': 'muntah',
-            'mencret': 'diare',
-            'diare': 'diare',
-            'lemas': 'lemas',
-            'capek': 'lemas',
-            'lelah': 'lemas',
-            'gatel': 'gatal',
-            'gatal2': 'gatal',
-            'pegel': 'pegal',
-            'pegel2': 'pegal',
-            'keringetan': 'keringat dingin',
-
-            # Body parts
-            'kepala': 'kepala',
-            'dada': 'dada',
-            'perut': 'perut',
-            'tangan': 'tangan',
-            'kaki': 'kaki',
-            'mata': 'mata',
-            'telinga': 'telinga',
-            'hidung': 'hidung',
-            'tenggorokan': 'tenggorokan',
-            'leher': 'leher',
-            'punggung': 'punggung',
-
-            # Severity descriptors
-            'sangat': 'sangat',
-            'sekali': 'sangat',
-            'banget': 'sangat',
-            'hebat': 'hebat',
-            'parah': 'hebat',
-            'ringan': 'ringan',
-            'sedikit': 'ringan',
-
-            # Time descriptors
-            'tiba-tiba': 'tiba-tiba',
-            'tiba2': 'tiba-tiba',
-            'mendadak': 'tiba-tiba',
-            'lama': 'lama',
-            'terus': 'terus-menerus',
-            'terus-menerus': 'terus-menerus',
-            'sering': 'sering',
-
-            # Medical conditions
-            'jantung': 'jantung',
-            'darah tinggi': 'hipertensi',
-            'diabetes': 'diabetes',
-            'kencing manis': 'diabetes',
-            'asma': 'asma',
-            'alergi': 'alergi',
-        }
-
-        # Stopwords bahasa Indonesia (minimal set - we want to keep medical context)
-        self.stopwords = set([
-            'yang', 'dan', 'di', 'ke', 'dari', 'pada', 'untuk',
-            'dengan', 'ini', 'itu', 'saya', 'aku', 'adalah',
-            'sudah', 'juga', 'atau', 'akan', 'tidak', 'ya'
-        ])
+    def __init__(
+        self,
+        symptoms_path: str = None,
+        cache_size: int = None,
+        fuzzy: bool = None,
+        rules_path: str = None,
+        stemming: bool = None,
+        dictionary_path: str = None
+    ):
+        """
+        Initialize preprocessor
+
+        Args:
+            symptoms_path: Path to symptom_keywords.json
+            cache_size: Max cached analyses (default PREPROCESS_CACHE_SIZE env or 4096, 0 disables)
+            fuzzy: Enable typo-tolerant correction towards the medical vocabulary
+                (default PREPROCESS_SPELLING env; needs Sastrawi's lexicon)
+            rules_path: Path to red_flags_rules.json (its words are never corrected;
+                Red/Yellow rule words are never a correction either)
+            stemming: Add Sastrawi stems to each analysis (default PREPROCESS_STEMMING env)
+            dictionary_path: Path to normalization_dictionary.json
+        """
+        current_dir = os.path.dirname(__file__)
+        if symptoms_path is None:
+            # Default path
+            symptoms_path = os.path.join(current_dir, '../data/symptom_keywords.json')
+        if rules_path is None:
+            rules_path = os.path.join(current_dir, '../data/red_flags_rules.json')
+
+        self.dictionary_path = dictionary_path or DEFAULT_DICTIONARY_PATH
+        if fuzzy is None:
+            fuzzy = os.getenv('PREPROCESS_SPELLING', 'false').lower() in ('1', 'true', 'yes')
+        self.lexicon = load_lexicon() if fuzzy else None
+        self.fuzzy = self.lexicon is not None
+        self.word_frequencies = self._load_word_frequencies(DEFAULT_CORPUS_PATH) if self.fuzzy else {}
+        if stemming is None:
+            stemming = os.getenv('PREPROCESS_STEMMING', 'false').lower() in ('1', 'true', 'yes')
+        self.stemming = stemming
+        self.stemmer = shared_stemmer
+        self.rule_words = self._load_rule_words(rules_path)
+        self.red_words = self._load_rule_words(rules_path, urgencies=('Red',), single_word=True)
+        self.common_words = self._load_word_list(os.path.join(current_dir, '../data/common_words.txt'))
+
+        # Symptom vocabulary (keyword -> symptom)
+        self._symptom_keywords = self._load_symptom_keywords(symptoms_path)
+
+        # Memoized analyses keyed by (config_version, hash of raw text)
+        if cache_size is None:
+            cache_size = int(os.getenv('PREPROCESS_CACHE_SIZE', '4096'))
+        self.cache = LRUCache(maxsize=cache_size)
+
+        # Medical terms map and stopwords come from the versioned dictionary file
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._dictionary_mtime = self._get_dictionary_mtime()
+        version, terms_map, stopwords = load_normalization_dictionary(self.dictionary_path)
+        self.snapshot = self._build_snapshot(terms_map, stopwords, version)
+
+    def _build_snapshot(
+        self,
+        terms_map: Dict[str, str],
+        stopwords: Iterable[str],
+        version: Optional[int] = None
+    ) -> NormalizationSnapshot:
+        """Compile a new snapshot with this preprocessor's settings"""
+        return NormalizationSnapshot(
+            terms_map,
+            stopwords,
+            self._symptom_keywords,
+            protected_words=self.rule_words | self.common_words,
+            fuzzy=self.fuzzy,
+            settings={'stemming': self.stemming},
+            version=version,
+            red_words=self.red_words,
+            lexicon=self.lexicon,
+            word_frequencies=self.word_frequencies
+        )
+
+    def _swap_snapshot(self, snapshot: NormalizationSnapshot):
+        """Atomically publish a snapshot and drop results of the old one"""
+        self.snapshot = snapshot
+        self.cache.clear()
+
+    # Read-only views of the current snapshot
+    @property
+    def medical_terms_map(self) -> Dict[str, str]:
+        return self.snapshot.medical_terms_map
+
+    @property
+    def stopwords(self) -> frozenset:
+        return self.snapshot.stopwords
+
+    @property
+    def symptom_keywords(self) -> Dict[str, str]:
+        return self.snapshot.symptom_keywords
+
+    @property
+    def spelling_index(self) -> Optional[SymSpellIndex]:
+        return self.snapshot.spelling_index
+
+    @property
+    def config_version(self) -> str:
+        return self.snapshot.config_version
+
+    def update_medical_terms(self, terms_map: Dict[str, str]):
+        """Replace the normalization map, recompile and invalidate the cache"""
+        with self._reload_lock:
+            current = self.snapshot
+            self._swap_snapshot(self._build_snapshot(terms_map, current.stopwords, current.version))
+
+    def reload_dictionary(self, path: str = None) -> Dict:
+        """
+        Reload the normalization dictionary file and swap it in atomically
+
+        The new snapshot is compiled completely before it is published;
+        in-flight requests keep using the snapshot they started with. If the
+        file is invalid the current snapshot stays active.
+
+        Returns:
+            Dictionary size, versions and compile time of the active snapshot
+        """
+        with self._reload_lock:
+            if path:
+                self.dictionary_path = path
+            self._dictionary_mtime = self._get_dictionary_mtime()
+            version, terms_map, stopwords = load_normalization_dictionary(self.dictionary_path)
+            snapshot = self._build_snapshot(terms_map, stopwords, version)
+            self._swap_snapshot(snapshot)
+
+        print(f"[+] Normalization dictionary v{snapshot.version} loaded: "
+              f"{len(snapshot.medical_terms_map)} terms in {snapshot.compile_seconds * 1000:.1f} ms")
+        return snapshot.get_info()
+
+    def _get_dictionary_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.dictionary_path)
+        except OSError:
+            return None
+
+    def watch_dictionary(self, interval: float = 5.0):
+        """Start a background thread that reloads the dictionary when the file changes"""
+        if self._watcher is not None:
+            return
+
+        stop_event = threading.Event()
+
+        def _watch():
+            while not stop_event.wait(interval):
+                mtime = self._get_dictionary_mtime()
+                if mtime is None or mtime == self._dictionary_mtime:
+                    continue
+                try:
+                    self.reload_dictionary()
+                except Exception as e:
+                    # Keep serving the previous snapshot
+                    self._dictionary_mtime = mtime
+                    print(f"[!] Dictionary reload failed, keeping v{self.snapshot.version}: {e}")
+
+        thread = threading.Thread(target=_watch, name='dictionary-watcher', daemon=True)
+        self._watcher = (thread, stop_event)
+        thread.start()
+
+    def stop_watching(self):
+        """Stop the dictionary watcher thread"""
+        if self._watcher is not None:
+            thread, stop_event = self._watcher
+            stop_event.set()
+            thread.join()
+            self._watcher = None
+
+    def __getstate__(self):
+        # Locks and watcher threads stay in this process
+        state = self.__dict__.copy()
+        state['_reload_lock'] = None
+        state['_watcher'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reload_lock = threading.Lock()
+
+    def _load_symptom_keywords(self, symptoms_path: str) -> Dict[str, str]:
+        """Load symptom keywords as a keyword -> symptom mapping"""
+        try:
+            with open(symptoms_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            print(f"Warning: Symptom keywords file not found at {symptoms_path}")
+            return {}
+
+        keywords = {}
+        for entry in data.get('symptoms', []):
+            for keyword in entry.get('keywords', [entry['symptom']]):
+                keywords[keyword] = entry['symptom']
+        return keywords
+
+    def _load_rule_words(self, rules_path: str, urgencies: Iterable[str] = None, single_word: bool = False) -> set:
+        """
+        Collect the words used by urgency rule keywords
+
+        Args:
+            rules_path: Path to red_flags_rules.json
+            urgencies: Only rules with these urgency levels (default: all)
+            single_word: Only keywords that are one word
+        """
+        try:
+            with open(rules_path, 'r', encoding='utf-8') as f:
+                rules = json.load(f)
+        except FileNotFoundError:
+            return set()
+
+        words = set()
+        for flag_list in rules.values():
+            if not isinstance(flag_list, list):
+                continue
+            for flag in flag_list:
+                if urgencies is not None and flag.get('urgency') not in urgencies:
+                    continue
+                for keyword in flag.get('keywords', []):
+                    keyword_words = ALPHA_WORD_PATTERN.findall(keyword.lower())
+                    if not single_word or len(keyword_words) == 1:
+                        words.update(keyword_words)
+        return words
+
+    def _load_word_frequencies(self, path: str) -> Dict[str, int]:
+        """Count lowercase words in the complaint column of a dataset"""
+        try:
+            complaints = pd.read_csv(path, usecols=['complaint'])['complaint'].dropna()
+        except (FileNotFoundError, ValueError):
+            return {}
+
+        counts = {}
+        for complaint in complaints:
+            for word in ALPHA_WORD_PATTERN.findall(str(complaint).lower()):
+                counts[word] = counts.get(word, 0) + 1
+        return counts
+
+    def _load_word_list(self, path: str) -> set:
+        """Load a one-word-per-line list ('#' starts a comment line)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return {
+                    word.lower()
+                    for line in f
+                    if not line.startswith('#')
+                    for word in line.split()
+                }
+        except FileNotFoundError:
+            return set()
 
     def clean_text(self, text: str) -> str:
         """Basic text cleaning"""
@@ -115,17 +568,46 @@ class IndonesianPreprocessor:
 
         return text
 
-    def normalize_medical_terms(self, text: str) -> str:
+    def correct_word(self, word: str, snapshot: NormalizationSnapshot = None) -> str:
+        """
+        Correct one lowercase word towards the medical vocabulary
+
+        Elongations ("pusinggg") are collapsed first. Words of the general
+        Indonesian lexicon, or inflections of one ("berdahak", "jantungan"),
+        are not typos and stay as they are. Otherwise a distance-1
+        correction is allowed from 5 letters and distance 2 from 7 letters,
+        keeping the first letter, if the best candidate clearly beats the
+        others by corpus frequency (SPELLING_MARGIN). Short and known words
+        are left untouched.
+        """
+        snapshot = snapshot or self.snapshot
+        if word in snapshot.known_words or len(word) < 5 or len(word) > 20:
+            return word
+
+        collapsed = ELONGATION_PATTERN.sub(r'\1', word)
+        if collapsed in snapshot.known_words:
+            return collapsed
+
+        if collapsed in snapshot.lexicon or self.stemmer.stem(collapsed) in snapshot.lexicon:
+            return collapsed
+
+        max_distance = 2 if len(collapsed) >= 7 else 1
+        result = snapshot.spelling_index.lookup(collapsed, max_distance=max_distance, margin=SPELLING_MARGIN)
+        if result and result[0][0] == collapsed[0]:
+            return result[0]
+        return word
+
+    def correct_spelling(self, text: str, snapshot: NormalizationSnapshot = None) -> str:
+        """Typo-tolerant normalization of every word in cleaned text"""
+        snapshot = snapshot or self.snapshot
+        if snapshot.spelling_index is None or not text:
+            return text
+        return ALPHA_WORD_PATTERN.sub(lambda match: self.correct_word(match.group(0), snapshot), text)
+
+    def normalize_medical_terms(self, text: str, snapshot: NormalizationSnapshot = None) -> str:
         """Normalize common medical term variations"""
-        normalized = text
-
-        # Replace known variations
-        for term, standard in self.medical_terms_map.items():
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(term) + r'\b'
-            normalized = re.sub(pattern, standard, normalized)
-
-        return normalized
+        # Word-bounded, longest-match replacement in one scan
+        return (snapshot or self.snapshot).term_normalizer.normalize(text)
 
     def remove_punctuation(self, text: str, keep_medical: bool = True) -> str:
         """Remove punctuation but keep medical-relevant ones"""
@@ -141,102 +623,253 @@ class IndonesianPreprocessor:
         """Simple whitespace tokenization"""
         return text.split()
 
-    def remove_stopwords(self, tokens: List[str]) -> List[str]:
+    def remove_stopwords(self, tokens: List[str], snapshot: NormalizationSnapshot = None) -> List[str]:
         """Remove stopwords but keep medical context"""
-        return [token for token in tokens if token not in self.stopwords]
+        stopwords = (snapshot or self.snapshot).stopwords
+        return [token for token in tokens if token not in stopwords]
+
+    def extract_readings(self, text: str) -> List[NumericReading]:
+        """
+        Extract every numeric health reading in a single scan
+
+        Args:
+            text: Raw complaint text
 
-    def extract_numbers(self, text: str) -> Dict[str, any]:
+        Returns:
+            Readings in text order, with spans into the raw text
+        """
+        readings = []
+
+        for match in VITALS_PATTERN.finditer(text):
+            kind = match.lastgroup
+            span = match.span()
+
+            if kind in ('temperature', 'temperature_bare'):
+                value = float(match.group(kind + '_value').replace(',', '.'))
+                # Without a unit, only body temperatures ("demam 39.5", not "demam 12")
+                if kind == 'temperature_bare' and not BARE_TEMPERATURE_RANGE[0] <= value <= BARE_TEMPERATURE_RANGE[1]:
+                    continue
+                readings.append(NumericReading('temperature', value, 'celsius', *span))
+
+            elif kind == 'blood_pressure':
+                value = (int(match.group('systolic')), int(match.group('diastolic')))
+                readings.append(NumericReading('blood_pressure', value, 'mmHg', *span))
+
+            elif kind == 'duration':
+                unit = match.group('duration_unit').lower()
+                if (match.group('duration_age') and DURATION_UNIT_DAYS[unit] >= 30
+                        and not match.group('duration_ago')):
+                    continue
+                days = int(match.group('duration_value')) * DURATION_UNIT_DAYS[unit]
+                readings.append(NumericReading('duration_days', days, 'days', *span))
+
+            elif kind == 'age':
+                readings.append(NumericReading('age', int(match.group('age_value')), 'years', *span))
+
+            elif kind in ('heart_rate', 'heart_rate_labeled'):
+                value = int(match.group(kind + '_value'))
+                readings.append(NumericReading('heart_rate', value, 'bpm', *span))
+
+            elif kind == 'spo2':
+                readings.append(NumericReading('spo2', int(match.group('spo2_value')), '%', *span))
+
+        return readings
+
+    def extract_numbers(self, text: str, readings: List[NumericReading] = None) -> Dict[str, any]:
         """Extract numeric values (temperature, blood pressure, etc.)"""
-        extracted = {
-            'temperature': None,
-            'blood_pressure': None,
-            'duration_days': None,
-            'age': None
-        }
+        if readings is None:
+            readings = self.extract_readings(text)
 
-        # Temperature (in Celsius)
-        temp_pattern = r'(\d{2,3})\s*(?:derajat|°|c|celcius)'
-        temp_match = re.search(temp_pattern, text, re.IGNORECASE)
-        if temp_match:
-            extracted['temperature'] = float(temp_match.group(1))
-
-        # Blood pressure
-        bp_pattern = r'(\d{2,3})/(\d{2,3})'
-        bp_match = re.search(bp_pattern, text)
-        if bp_match:
-            extracted['blood_pressure'] = {
-                'systolic': int(bp_match.group(1)),
-                'diastolic': int(bp_match.group(2))
-            }
-
-        # Duration in days
-        day_pattern = r'(\d+)\s*(?:hari|hr|day)'
-        day_match = re.search(day_pattern, text, re.IGNORECASE)
-        if day_match:
-            extracted['duration_days'] = int(day_match.group(1))
-
-        # Week pattern
-        week_pattern = r'(\d+)\s*(?:minggu|week)'
-        week_match = re.search(week_pattern, text, re.IGNORECASE)
-        if week_match:
-            extracted['duration_days'] = int(week_match.group(1)) * 7
-
-        return extracted
+        return summarize_readings(readings)
 
-    def preprocess(self, text: str, remove_stops: bool = False) -> Dict[str, any]:
-        """Full preprocessing pipeline"""
+    def analyze(self, text: str) -> PreprocessedComplaint:
+        """
+        Run the full pipeline once and return an immutable analysis
+
+        Every stage (classifier, urgency engine, symptom extraction) should
+        consume this object instead of re-processing the raw complaint.
+        Results are memoized per raw text and config version and shared by
+        every caller; numeric_data is rebuilt on each access, so mutating
+        it never reaches a later cache hit.
+        """
+        # One snapshot per call, even if the dictionary is reloaded meanwhile
+        snapshot = self.snapshot
+        if self.cache.maxsize == 0:
+            return self._analyze(text, snapshot)
+
+        key = (snapshot.config_version, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest())
+        return self.cache.get_or_compute(key, lambda: self._analyze(text, snapshot))
 
-        # Extract numeric data first (before cleaning)
-        numeric_data = self.extract_numbers(text)
+    def _analyze(self, text: str, snapshot: NormalizationSnapshot = None) -> PreprocessedComplaint:
+        """Uncached analysis of one complaint"""
+        snapshot = snapshot or self.snapshot
+
+        # Extract numeric readings first (before cleaning)
+        numeric_readings = self.extract_readings(text)
 
         # Clean text
         cleaned = self.clean_text(text)
 
-        # Normalize medical terms
-        normalized = self.normalize_medical_terms(cleaned)
+        # Correct typos, then normalize medical terms
+        normalized = self.normalize_medical_terms(self.correct_spelling(cleaned, snapshot), snapshot)
 
         # Remove punctuation
         no_punct = self.remove_punctuation(normalized, keep_medical=True)
 
-        # Tokenize
+        # Tokenize, with and without stopwords
         tokens = self.tokenize(no_punct)
+        content_tokens = self.remove_stopwords(tokens, snapshot)
+
+        # Symptoms are matched across stopwords, with spans in processed text
+        symptom_matches = self._match_symptoms(' '.join(tokens), snapshot)
+        symptoms = []
+        for match in symptom_matches:
+            if match.label not in symptoms:
+                symptoms.append(match.label)
+
+        # Optional stemming, served from the persistent word -> stem cache
+        stemmed_tokens = [self.stemmer.stem(token) for token in tokens] if self.stemming else []
+
+        return PreprocessedComplaint(
+            original=text,
+            cleaned=cleaned,
+            normalized=normalized,
+            tokens=tuple(tokens),
+            content_tokens=tuple(content_tokens),
+            numeric_readings=tuple(numeric_readings),
+            symptoms=tuple(symptoms),
+            symptom_matches=tuple(symptom_matches),
+            stemmed_tokens=tuple(stemmed_tokens)
+        )
 
-        # Optionally remove stopwords
-        if remove_stops:
-            tokens = self.remove_stopwords(tokens)
-
-        # Reconstruct processed text
-        processed_text = ' '.join(tokens)
+    def preprocess(self, text: str, remove_stops: bool = False) -> Dict[str, any]:
+        """Full preprocessing pipeline"""
+        return self.analyze(text).to_dict(remove_stops=remove_stops)
 
-        return {
-            'original': text,
-            'processed': processed_text,
-            'tokens': tokens,
-            'numeric_data': numeric_data
-        }
+    def _match_symptoms(self, processed_text: str, snapshot: NormalizationSnapshot = None) -> List[TermMatch]:
+        """Match symptom keywords against processed text in one pass"""
+        snapshot = snapshot or self.snapshot
+        pieces = word_spans(processed_text, skip=snapshot.stopwords)
+        return snapshot.symptom_matcher.match(pieces)
 
     def extract_symptoms(self, text: str) -> List[str]:
         """Extract symptom keywords from text"""
-        processed = self.preprocess(text, remove_stops=True)
-
-        # Define symptom keywords
-        symptom_keywords = [
-            'demam', 'batuk', 'pilek', 'pusing', 'sakit kepala',
-            'nyeri dada', 'sesak napas', 'mual', 'muntah', 'diare',
-            'sakit perut', 'lemas', 'pegal', 'gatal', 'ruam',
-            'keringat dingin', 'menggigil', 'bengkak', 'kejang',
-            'pingsan', 'berdarah', 'mata kuning', 'leher kaku'
-        ]
-
-        found_symptoms = []
-        tokens = processed['tokens']
-        text_lower = processed['processed']
-
-        for symptom in symptom_keywords:
-            if symptom in text_lower:
-                found_symptoms.append(symptom)
-
-        return list(set(found_symptoms))
+        return list(self.analyze(text).symptoms)
+
+    def analyze_many(self, texts: Iterable[str]) -> List[PreprocessedComplaint]:
+        """Analyze a sequence of complaints in the current process (uncached)"""
+        snapshot = self.snapshot
+        return [self._analyze(text if isinstance(text, str) else '', snapshot) for text in texts]
+
+    def batch_executor(self, n_jobs: int) -> Optional[ProcessPoolExecutor]:
+        """
+        Create a worker pool for preprocess_many() calls
+
+        Workers receive this preprocessor once, when they start; the caller
+        owns the pool and must shut it down.
+
+        Args:
+            n_jobs: Worker processes (-1 = all cores)
+
+        Returns:
+            Executor, or None when n_jobs asks for a single process
+        """
+        if n_jobs is not None and n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        if not n_jobs or n_jobs <= 1:
+            return None
+        return ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_batch_worker,
+            initargs=(self,)
+        )
+
+    def preprocess_many(
+        self,
+        texts: Iterable[str],
+        n_jobs: int = 1,
+        chunk_size: int = 1000,
+        executor: ProcessPoolExecutor = None
+    ) -> pd.DataFrame:
+        """
+        Preprocess a batch of complaints into columnar results
+
+        Args:
+            texts: Iterable or pandas Series of complaint texts
+            n_jobs: Worker processes to shard across (-1 = all cores)
+            chunk_size: Complaints per chunk sent to a worker
+            executor: Pool from batch_executor() to reuse across calls
+                (n_jobs is then ignored)
+
+        Returns:
+            DataFrame with one row per complaint (index preserved for Series)
+        """
+        index = texts.index if isinstance(texts, pd.Series) else None
+        texts = list(texts)
+
+        if len(texts) <= chunk_size:
+            results = self.analyze_many(texts)
+        elif executor is not None:
+            results = self._analyze_sharded(texts, chunk_size, executor)
+        else:
+            owned = self.batch_executor(n_jobs)
+            if owned is None:
+                results = self.analyze_many(texts)
+            else:
+                with owned:
+                    results = self._analyze_sharded(texts, chunk_size, owned)
+
+        return _to_columns(results, index=index)
+
+    def _analyze_sharded(
+        self,
+        texts: List[str],
+        chunk_size: int,
+        executor: ProcessPoolExecutor
+    ) -> List[PreprocessedComplaint]:
+        """Analyze chunks of texts in worker processes, keeping order"""
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        results = []
+        for chunk_results in executor.map(_analyze_batch_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+
+
+def _to_columns(results: List[PreprocessedComplaint], index=None) -> pd.DataFrame:
+    """Convert analyzed complaints into a columnar DataFrame"""
+    numeric = [result.numeric_data for result in results]
+    blood_pressure = [data.get('blood_pressure') or {} for data in numeric]
+
+    return pd.DataFrame({
+        'original': [result.original for result in results],
+        'processed': [result.processed for result in results],
+        'processed_no_stopwords': [result.processed_no_stopwords for result in results],
+        'stemmed': [result.stemmed for result in results],
+        'tokens': [list(result.tokens) for result in results],
+        'temperature': pd.array([data.get('temperature') for data in numeric], dtype='Float64'),
+        'systolic': pd.array([bp.get('systolic') for bp in blood_pressure], dtype='Int64'),
+        'diastolic': pd.array([bp.get('diastolic') for bp in blood_pressure], dtype='Int64'),
+        'duration_days': pd.array([data.get('duration_days') for data in numeric], dtype='Int64'),
+        'age': pd.array([data.get('age') for data in numeric], dtype='Int64'),
+        'heart_rate': pd.array([data.get('heart_rate') for data in numeric], dtype='Int64'),
+        'spo2': pd.array([data.get('spo2') for data in numeric], dtype='Int64'),
+        'symptoms': [list(result.symptoms) for result in results],
+    }, index=index)
+
+
+# Process-pool worker state for preprocess_many()
+_batch_preprocessor = None
+
+
+def _init_batch_worker(instance: 'IndonesianPreprocessor'):
+    """Install the parent's preprocessor once per worker process"""
+    global _batch_preprocessor
+    _batch_preprocessor = instance
+
+
+def _analyze_batch_chunk(texts: List[str]) -> List[PreprocessedComplaint]:
+    """Analyze one chunk inside a worker process"""
+    return _batch_preprocessor.analyze_many(texts)
 
 
 # Singleton instance
@@ -244,6 +877,11 @@ preprocessor = IndonesianPreprocessor()
 
 
 # Helper functions for easy import
+def analyze_complaint(text: str) -> PreprocessedComplaint:
+    """Preprocess a complaint once for all pipeline stages"""
+    return preprocessor.analyze(text)
+
+
 def preprocess_text(text: str, remove_stopwords: bool = False) -> Dict[str, any]:
     """Preprocess Indonesian medical text"""
     return preprocessor.preprocess(text, remove_stops=remove_stopwords)
@@ -254,6 +892,25 @@ def extract_symptoms(text: str) -> List[str]:
     return preprocessor.extract_symptoms(text)
 
 
+def get_cache_stats() -> Dict:
+    """Get preprocessing cache statistics"""
+    return {
+        **preprocessor.cache.get_stats(),
+        "config_version": preprocessor.config_version,
+        "dictionary_version": preprocessor.snapshot.version
+    }
+
+
+def reload_dictionary(path: str = None) -> Dict:
+    """Reload the normalization dictionary of the shared preprocessor"""
+    return preprocessor.reload_dictionary(path)
+
+
+def preprocess_many(texts: Iterable[str], n_jobs: int = 1, chunk_size: int = 1000) -> pd.DataFrame:
+    """Preprocess a batch of complaints into columnar results"""
+    return preprocessor.preprocess_many(texts, n_jobs=n_jobs, chunk_size=chunk_size)
+
+
 def extract_numeric_data(text: str) -> Dict[str, any]:
     """Extract numeric health data from text"""
     return preprocessor.extract_numbers(text)
@@ -0,0 +1,156 @@
+"""
+Typo-tolerant word lookup for Indonesian medical vocabulary
+SymSpell-style symmetric delete index (edit distance <= 2)
+"""
+
+import json
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+def load_lexicon() -> Optional[FrozenSet[str]]:
+    """
+    General Indonesian lexicon (Sastrawi's KBBI root word list)
+
+    Returns:
+        Lowercase root words, or None if Sastrawi is not installed
+    """
+    try:
+        from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+    except ImportError:
+        print("Warning: Sastrawi not installed, no Indonesian lexicon for typo correction")
+        return None
+    return frozenset(word.strip().lower() for word in StemmerFactory().get_words() if word.strip())
+
+
+def delete_variants(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from word by up to max_distance deletions (word included)"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        next_frontier -= variants
+        variants |= next_frontier
+        frontier = next_frontier
+    return variants
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein + adjacent transpositions)
+
+    Returns max_distance + 1 as soon as the distance is known to exceed it.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+
+    return previous[-1]
+
+
+class SymSpellIndex:
+    """Precomputed delete index over a fixed vocabulary"""
+
+    def __init__(self, words: Iterable[str] = (), max_distance: int = 2, frequencies: Dict[str, int] = None):
+        """
+        Build index
+
+        Args:
+            words: Canonical vocabulary
+            max_distance: Largest edit distance supported by lookup()
+            frequencies: Corpus frequency of vocabulary words (missing words count 1)
+        """
+        self.max_distance = max_distance
+        self.words = sorted(set(word for word in words if word))
+        self.word_set = set(self.words)
+        self.frequencies = {word: max(1, (frequencies or {}).get(word, 1)) for word in self.words}
+        self.deletes: Dict[str, List[str]] = {}
+
+        for word in self.words:
+            for variant in delete_variants(word, max_distance):
+                self.deletes.setdefault(variant, []).append(word)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def lookup(self, token: str, max_distance: int = None, margin: float = 1.0) -> Optional[Tuple[str, int]]:
+        """
+        Find the closest vocabulary word
+
+        Only the deletes of the token are generated and looked up, so the
+        cost depends on the token length, not on the vocabulary size.
+        Among candidates at the smallest distance the most frequent wins.
+
+        Args:
+            token: Word to correct
+            max_distance: Max edit distance (capped at the index distance)
+            margin: Required frequency ratio of the best candidate over any
+                other candidate at the same distance; below it the token is
+                ambiguous and None is returned
+
+        Returns:
+            (word, distance) of the best candidate, or None
+        """
+        if token in self.word_set:
+            return token, 0
+
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        candidates = []
+        seen = set()
+        for variant in delete_variants(token, max_distance):
+            for candidate in self.deletes.get(variant, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(token, candidate, max_distance)
+                if distance <= max_distance:
+                    candidates.append((distance, -self.frequencies.get(candidate, 1), candidate))
+
+        if not candidates:
+            return None
+
+        candidates.sort()
+        distance, frequency, word = candidates[0]
+        if len(candidates) > 1 and candidates[1][0] == distance and -candidates[1][1] * margin > -frequency:
+            return None
+        return word, distance
+
+    def save(self, path: str):
+        """Serialize index to JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'max_distance': self.max_distance,
+                'words': self.words,
+                'frequencies': self.frequencies,
+                'deletes': self.deletes
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> 'SymSpellIndex':
+        """Load a serialized index without rebuilding the deletes"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        index = cls(max_distance=data['max_distance'])
+        index.words = data['words']
+        index.word_set = set(index.words)
+        index.frequencies = data.get('frequencies') or {word: 1 for word in index.words}
+        index.deletes = data['deletes']
+        return index
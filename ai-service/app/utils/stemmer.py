@@ -0,0 +1,130 @@
+"""
+Indonesian stemming with a persistent word -> stem cache
+Wraps Sastrawi so the serving path almost never calls the stemmer
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional
+
+from app.utils.cache import LRUCache
+
+
+DEFAULT_STEM_CACHE_PATH = os.path.join(os.path.dirname(__file__), '../data/stem_cache.json')
+
+
+class CachedStemmer:
+    """
+    Sastrawi stemmer memoized per word, with an on-disk cache
+
+    The prebuilt cache (loaded from disk or filled offline by warm()) is
+    read-only while serving; words missing from it go to a bounded LRU, so
+    arbitrary user input cannot grow memory without limit.
+    """
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_STEM_CACHE_PATH, runtime_cache_size: int = None):
+        """
+        Initialize stemmer
+
+        Args:
+            cache_path: JSON word -> stem cache to load at startup (optional)
+            runtime_cache_size: Max stems of words outside the prebuilt cache
+                (default STEM_CACHE_SIZE env or 10000, 0 disables)
+        """
+        self.cache_path = cache_path
+        self.stems: Dict[str, str] = {}
+        if runtime_cache_size is None:
+            runtime_cache_size = int(os.getenv('STEM_CACHE_SIZE', '10000'))
+        self.runtime = LRUCache(maxsize=runtime_cache_size)
+        self._stemmer = None
+        self._lock = threading.Lock()
+
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                self.stems = json.load(f).get('stems', {})
+
+    def _get_stemmer(self):
+        """Create the Sastrawi stemmer on first cache miss"""
+        if self._stemmer is None:
+            try:
+                from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+                self._stemmer = StemmerFactory().create_stemmer()
+            except ImportError:
+                print("Warning: Sastrawi not installed, stemming disabled for uncached words")
+                self._stemmer = False
+        return self._stemmer
+
+    def _stem_uncached(self, word: str) -> str:
+        """Run Sastrawi on one word"""
+        stemmer = self._get_stemmer()
+
+        # Words without letters (numbers, units) are kept as they are
+        if not stemmer or not any(char.isalpha() for char in word):
+            return word
+
+        with self._lock:
+            return stemmer.stem(word) or word
+
+    def stem(self, word: str) -> str:
+        """Stem one lowercase word"""
+        stem = self.stems.get(word)
+        if stem is not None:
+            return stem
+        return self.runtime.get_or_compute(word, lambda: self._stem_uncached(word))
+
+    def stem_text(self, text: str) -> str:
+        """Stem every whitespace-separated word of processed text"""
+        return ' '.join(self.stem(word) for word in text.split())
+
+    def warm(self, words: Iterable[str]) -> int:
+        """
+        Pre-populate the cache (offline)
+
+        Returns:
+            Number of newly stemmed words
+        """
+        if not self._get_stemmer():
+            return 0
+
+        before = len(self.stems)
+        for word in words:
+            if word not in self.stems:
+                self.stems[word] = self._stem_uncached(word)
+        return len(self.stems) - before
+
+    def save(self, path: str = None):
+        """Persist the cache as JSON"""
+        path = path or self.cache_path
+        with self._lock:
+            stems = dict(sorted(self.stems.items()))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'stems': stems}, f, ensure_ascii=False, indent=0)
+
+    def __getstate__(self):
+        # The lock and Sastrawi instance are recreated in the receiving process
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        state['_stemmer'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics (runtime counters cover words outside the prebuilt cache)"""
+        return {
+            "size": len(self.stems),
+            "runtime": self.runtime.get_stats()
+        }
+
+
+# Singleton instance
+stemmer = CachedStemmer()
+
+
+# Helper function for easy import
+def stem_text(text: str) -> str:
+    """Stem processed Indonesian text using the shared cache"""
+    return stemmer.stem_text(text)
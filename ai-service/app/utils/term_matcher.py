@@ -0,0 +1,354 @@
+"""
+Compiled term matchers for Indonesian medical text
+Builds single-pass replacers and phrase tries from term dictionaries
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def build_trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Build a regex body that matches any of the given terms
+
+    Terms are merged into a character trie so the regex engine never
+    backtracks across alternatives that share a prefix. Longer terms are
+    tried first, so the leftmost-longest term wins at every position.
+
+    Args:
+        terms: Literal terms to match
+
+    Returns:
+        Regex source (without anchors or word boundaries)
+    """
+    trie = {}
+    for term in terms:
+        if not term:
+            continue
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def _build(node: Dict) -> str:
+        is_end = '' in node
+        branches = [
+            re.escape(char) + _build(child)
+            for char, child in sorted(node.items())
+            if char != ''
+        ]
+
+        if not branches:
+            return ''
+
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if is_end else body
+
+    return _build(trie)
+
+
+def apply_sequential(text: str, terms_map: Dict[str, str]) -> str:
+    """
+    Reference normalizer: one word-bounded substitution per map entry
+
+    This is the original (multi-pass) behaviour of
+    IndonesianPreprocessor.normalize_medical_terms. It is only used when a
+    TermNormalizer is compiled, to resolve what each term finally becomes.
+    """
+    normalized = text
+    for term, standard in terms_map.items():
+        pattern = r'\b' + re.escape(term) + r'\b'
+        normalized = re.sub(pattern, standard, normalized)
+    return normalized
+
+
+class TermNormalizer:
+    """
+    Single-pass term replacer compiled once from a term -> standard map
+
+    Each term is rewritten to what the sequential map turns that term into
+    on its own, and the text is scanned once (leftmost-longest, word
+    bounded). Replaced text is never rescanned, so output only equals
+    apply_sequential() when no rewrite combines with its neighbouring words
+    into another term. With overlapping or chained keys the two differ:
+    'sesek pendek' gives 'sesak napas napas pendek' here ('sesek' is
+    resolved alone, 'pendek' stays), whereas the sequential map first makes
+    'sesak napas pendek' and then rewrites 'napas pendek' across the
+    boundary into 'sesak napas sesak napas'.
+    """
+
+    def __init__(self, terms_map: Dict[str, str]):
+        """
+        Compile normalizer
+
+        Args:
+            terms_map: Mapping of term variations to their standard form
+        """
+        self.terms_map = dict(terms_map)
+
+        # Resolve every term through the sequential map once, so chains
+        # within a term (e.g. 'sesek' -> 'sesak napas' -> 'sesak napas
+        # napas') match the entry-by-entry result for that term
+        self.replacements = {
+            term: apply_sequential(term, self.terms_map)
+            for term in self.terms_map
+        }
+
+        body = build_trie_pattern(self.terms_map.keys())
+        self.pattern = re.compile(r'\b' + body + r'\b') if body else None
+
+    def __len__(self) -> int:
+        return len(self.replacements)
+
+    def _replace(self, match) -> str:
+        return self.replacements[match.group(0)]
+
+    def normalize(self, text: str) -> str:
+        """Rewrite all known terms in one scan over the text"""
+        if self.pattern is None or not text:
+            return text
+        return self.pattern.sub(self._replace, text)
+
+
+# Indonesian enclitics tolerated on keyword words ('dadanya' -> 'dada')
+ENCLITICS = ('nya', 'ku', 'mu')
+
+
+class TermMatch(NamedTuple):
+    """Phrase matched in a text, with its character span"""
+    label: str
+    keyword: str
+    start: int
+    end: int
+
+
+def word_spans(text: str, skip: Optional[Set[str]] = None) -> List[Tuple[str, int, int]]:
+    """
+    Split text into word pieces with character spans
+
+    Args:
+        text: Whitespace-tokenized text
+        skip: Whitespace tokens to leave out (e.g. stopwords)
+
+    Returns:
+        List of (word, start, end) tuples
+    """
+    pieces = []
+    for token in re.finditer(r'\S+', text):
+        if skip and token.group(0) in skip:
+            continue
+        offset = token.start()
+        for word in WORD_PATTERN.finditer(token.group(0)):
+            pieces.append((word.group(0), offset + word.start(), offset + word.end()))
+    return pieces
+
+
+def enclitic_symbols(vocabulary: Iterable[str]) -> Dict[str, str]:
+    """
+    Map text words to the keyword words they stand for
+
+    Every vocabulary word maps to itself and its enclitic forms
+    ('perutnya', 'perutku', 'perutmu') map to it; exact words win when an
+    enclitic form is also a vocabulary word.
+    """
+    vocabulary = set(vocabulary)
+    symbols = {word + enclitic: word for word in vocabulary for enclitic in ENCLITICS}
+    symbols.update((word, word) for word in vocabulary)
+    return symbols
+
+
+def reduplication_symbol(symbols: Dict[str, str], word: str) -> Optional[str]:
+    """
+    Keyword word for reduplication written with a digit, or None
+
+    'kejang2' is informal for 'kejang-kejang' and stands for 'kejang';
+    call this only when the word itself is not a symbol.
+    """
+    if len(word) > 2 and word[-1] == '2' and not word[-2].isdigit():
+        return symbols.get(word[:-1])
+    return None
+
+
+class PhraseMatcher:
+    """
+    Word-level trie mapping (multi-word) phrases to labels
+
+    Text words with a trailing enclitic match their keyword word, so
+    'sakit perutnya' matches 'sakit perut'; so does digit reduplication
+    ('kejang2').
+    """
+
+    _END = None
+
+    def __init__(self, phrases: Dict[str, str]):
+        """
+        Build trie
+
+        Args:
+            phrases: Mapping of keyword phrase to its label
+        """
+        self.root = {}
+        self.size = 0
+        vocabulary = set()
+
+        for phrase, label in phrases.items():
+            words = WORD_PATTERN.findall(phrase.lower())
+            if not words:
+                continue
+            vocabulary.update(words)
+            node = self.root
+            for word in words:
+                node = node.setdefault(word, {})
+            if self._END not in node:
+                self.size += 1
+            node[self._END] = (label, phrase)
+
+        self.symbols = enclitic_symbols(vocabulary)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def match(self, pieces: List[Tuple[str, int, int]]) -> List[TermMatch]:
+        """
+        Find leftmost-longest, non-overlapping phrase matches
+
+        Args:
+            pieces: Word pieces as returned by word_spans()
+
+        Returns:
+            Matches in text order
+        """
+        matches = []
+        symbols = self.symbols
+        words = [symbols.get(piece[0]) or reduplication_symbol(symbols, piece[0]) for piece in pieces]
+        i = 0
+        n = len(pieces)
+
+        while i < n:
+            node = self.root
+            best = None
+            j = i
+            while j < n and words[j] is not None:
+                node = node.get(words[j])
+                if node is None:
+                    break
+                j += 1
+                if self._END in node:
+                    best = (node[self._END], j)
+
+            if best is None:
+                i += 1
+                continue
+
+            (label, phrase), end = best
+            matches.append(TermMatch(label, phrase, pieces[i][1], pieces[end - 1][2]))
+            i = end
+
+        return matches
+
+
+class KeywordHit(NamedTuple):
+    """Keyword found by KeywordAutomaton, with its character span"""
+    pattern: int
+    start: int
+    end: int
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over words
+
+    Keyword phrases are compiled once into a word-level automaton with
+    failure links, so every occurrence of every keyword (overlapping ones
+    included) is found in one left-to-right pass over the text. Matching
+    whole words gives word-boundary semantics; a word with a trailing
+    enclitic (-nya, -ku, -mu) or a reduplication digit ('kejang2') also
+    matches its keyword word.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile automaton
+
+        Args:
+            keywords: Keyword phrases; a hit reports the phrase's position
+                in this sequence
+        """
+        self.keywords = []
+        self.goto = [{}]
+        self.outputs = [[]]
+        self.vocabulary = set()
+
+        for phrase in keywords:
+            pattern = len(self.keywords)
+            self.keywords.append(phrase)
+            words = WORD_PATTERN.findall(phrase.lower())
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                next_state = self.goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][word] = next_state
+                    self.goto.append({})
+                    self.outputs.append([])
+                state = next_state
+            self.outputs[state].append((pattern, len(words)))
+            self.vocabulary.update(words)
+
+        # Failure links, breadth first: the longest proper suffix that is
+        # also a keyword prefix; its outputs end here too
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for word, next_state in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(word, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+                queue.append(next_state)
+
+        # Text word -> keyword word, enclitic forms included
+        self.symbols = enclitic_symbols(self.vocabulary)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """
+        Find every keyword occurrence in one pass
+
+        Args:
+            text: Text to scan (matched case-insensitively)
+
+        Returns:
+            Hits ordered by end position (overlapping hits included)
+        """
+        hits = []
+        starts = []
+        goto, fail, outputs, symbols = self.goto, self.fail, self.outputs, self.symbols
+        state = 0
+
+        for match in WORD_PATTERN.finditer(text.lower()):
+            starts.append(match.start())
+            symbol = symbols.get(match.group(0))
+            if symbol is None:
+                symbol = reduplication_symbol(symbols, match.group(0))
+                if symbol is None:
+                    state = 0
+                    continue
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            for pattern, length in outputs[state]:
+                hits.append(KeywordHit(pattern, starts[-length], match.end()))
+
+        return hits
@@ -0,0 +1,83 @@
+"""
+Versioned directories and record flags shared by the model stores
+Numbered version directories (v0001, v0002, ...) are written under a
+temporary name and renamed into place, and a CURRENT file points at the
+version in use; both updates are atomic.
+"""
+
+import json
+import os
+import shutil
+from typing import List, Optional, Union
+
+
+CURRENT_FILE = 'CURRENT'
+
+
+def version_name(number: int) -> str:
+    """Directory name of a version number ('v0001')"""
+    return f'v{number:04d}'
+
+
+def list_version_numbers(root: str) -> List[int]:
+    """Numbers of the version directories under root, oldest first"""
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        int(name[1:]) for name in os.listdir(root)
+        if name.startswith('v') and name[1:].isdigit()
+    )
+
+
+def read_current(root: str) -> Optional[Union[int, str]]:
+    """Version the CURRENT pointer refers to, or None"""
+    current_path = os.path.join(root, CURRENT_FILE)
+    if not os.path.exists(current_path):
+        return None
+    with open(current_path, 'r', encoding='utf-8') as f:
+        return json.load(f)['version']
+
+
+def write_current(root: str, version: Union[int, str]):
+    """Point CURRENT at a version (fsynced, then renamed into place)"""
+    os.makedirs(root, exist_ok=True)
+    current_path = os.path.join(root, CURRENT_FILE)
+    tmp_path = current_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, current_path)
+
+
+def staging_path(root: str, name: str) -> str:
+    """Empty temporary directory path to write a version into before publish_version()"""
+    tmp_path = os.path.join(root, f'.{name}.tmp')
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    return tmp_path
+
+
+def publish_version(tmp_path: str, root: str, name: str) -> str:
+    """
+    Rename a fully written staging directory into place
+
+    A crash before this point never leaves a half-written version.
+
+    Returns:
+        Path of the version directory
+    """
+    path = os.path.join(root, name)
+    os.replace(tmp_path, path)
+    return path
+
+
+def is_true(value) -> bool:
+    """doctor_reviewed as exported (bool, 0/1 or 'true'/'false')"""
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 't', '1', 'yes')
+    # Missing values read from CSV are NaN, which is truthy
+    try:
+        return bool(value) and bool(value == value)
+    except TypeError:
+        # pandas.NA has no truth value
+        return False
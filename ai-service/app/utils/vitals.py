@@ -0,0 +1,33 @@
+"""
+Vital sign reference bands
+Shared by numeric extraction (which reading is worst) and the urgency
+engine (which band a reading falls in)
+"""
+
+from typing import Tuple
+
+
+# Heart rate bands in bpm as (low, high): Red below low or at/above high,
+# Yellow below low or above high
+HEART_RATE_RED = (40, 130)
+HEART_RATE_YELLOW = (50, 100)
+
+
+def heart_rate_severity(heart_rate: int) -> Tuple[int, int]:
+    """
+    Rank a heart rate reading by how abnormal it is
+
+    Args:
+        heart_rate: Heart rate in bpm
+
+    Returns:
+        Tuple of (band, distance): band is 2 for Red, 1 for Yellow and 0 for
+        normal; distance is how far the reading lies outside the normal range
+    """
+    low, high = HEART_RATE_YELLOW
+    distance = max(low - heart_rate, heart_rate - high, 0)
+    if heart_rate < HEART_RATE_RED[0] or heart_rate >= HEART_RATE_RED[1]:
+        return 2, distance
+    if distance:
+        return 1, distance
+    return 0, 0
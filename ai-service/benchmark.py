@@ -0,0 +1,467 @@
+"""
+Benchmark script for TRIAGE.AI components
+Measures build time, memory and latency of the serving hot paths
+
+Usage:
+    python benchmark.py            # run all benchmarks
+    python benchmark.py spelling   # run one benchmark
+"""
+
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from app.utils.preprocessor import preprocessor, IndonesianPreprocessor, preprocess_many
+from app.models.classifier import SymptomClassifier
+from app.utils.spelling import SymSpellIndex
+from app.utils.stemmer import CachedStemmer, DEFAULT_STEM_CACHE_PATH
+
+
+def print_header(text):
+    """Print formatted header"""
+    print("\n" + "="*70)
+    print(f"  {text}")
+    print("="*70)
+
+
+def time_per_call(func, args_list, repeat: int = 3) -> float:
+    """Best average seconds per call over several rounds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        best = min(best, (time.perf_counter() - start) / len(args_list))
+    return best
+
+
+def measure_build(build):
+    """Return (result, seconds, peak bytes allocated) of a build function"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def random_word(rng: random.Random) -> str:
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+
+
+def benchmark_spelling():
+    """SymSpell delete index: build time, memory and per-token lookup latency"""
+    print_header("BENCHMARK: Typo-tolerant Spelling Index")
+
+    spelling_index = IndonesianPreprocessor(cache_size=0, fuzzy=True).spelling_index
+    if spelling_index is None:
+        print("Skipped: typo correction needs Sastrawi's lexicon")
+        return
+
+    rng = random.Random(42)
+    vocabulary = sorted(spelling_index.words)
+    typos = ['pusinggg', 'sesakk', 'mualll', 'tenggorokkan', 'menggigill', 'pusin', 'kepalaa']
+    unknown = [random_word(rng) for _ in range(200)]
+
+    for size in [len(vocabulary), 1000, 5000]:
+        words = list(vocabulary)
+        while len(words) < size:
+            words.append(random_word(rng))
+
+        index, build_seconds, peak = measure_build(lambda: SymSpellIndex(words, max_distance=2))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'spelling_index.json')
+            index.save(path)
+            file_size = os.path.getsize(path)
+            start = time.perf_counter()
+            SymSpellIndex.load(path)
+            load_seconds = time.perf_counter() - start
+
+        typo_latency = time_per_call(index.lookup, [(word,) for word in typos * 50])
+        miss_latency = time_per_call(index.lookup, [(word,) for word in unknown])
+
+        print(f"\nVocabulary: {size} words, {len(index.deletes)} delete entries")
+        print(f"  Build time:        {build_seconds * 1000:8.1f} ms")
+        print(f"  Build peak memory: {peak / 1024 / 1024:8.2f} MB")
+        print(f"  Serialized size:   {file_size / 1024 / 1024:8.2f} MB (load {load_seconds * 1000:.1f} ms)")
+        print(f"  Lookup (typo):     {typo_latency * 1e6:8.1f} us/token")
+        print(f"  Lookup (unknown):  {miss_latency * 1e6:8.1f} us/token")
+
+
+SAMPLE_COMPLAINTS = [
+    "saya merasa nyeri dada menjalar ke lengan kiri dan sesak napas",
+    "demam tinggi 39 derajat sudah 3 hari, kepala pusing",
+    "tekanan darah 200/120, kepala sangat sakit dan mata kabur",
+    "batuk berdarah dan berat badan turun 5kg dalam sebulan",
+    "kepusingan dan merasakan mual setelah makan",
+]
+
+
+def benchmark_stemming():
+    """Sastrawi stemming: uncached stemmer vs persistent word -> stem cache"""
+    print_header("BENCHMARK: Cached Sastrawi Stemming")
+
+    words = sorted({word for text in SAMPLE_COMPLAINTS for word in preprocessor.analyze(text).tokens})
+
+    cached = CachedStemmer(DEFAULT_STEM_CACHE_PATH)
+    print(f"\nPersistent cache: {len(cached.stems)} words")
+
+    uncached = CachedStemmer(cache_path=None, runtime_cache_size=0)
+    uncached.stem('merasakan')  # create the Sastrawi stemmer
+    uncached_latency = time_per_call(uncached.stem, [(word,) for word in words], repeat=1)
+    cached.warm(words)
+    cached_latency = time_per_call(cached.stem, [(word,) for word in words * 20])
+
+    print(f"  Sastrawi (cache miss): {uncached_latency * 1e6:8.1f} us/word")
+    print(f"  Cache hit:             {cached_latency * 1e6:8.1f} us/word")
+
+    plain = IndonesianPreprocessor(cache_size=0, stemming=False)
+    stemming = IndonesianPreprocessor(cache_size=0, stemming=True)
+    stemming.analyze(SAMPLE_COMPLAINTS[0])  # create the Sastrawi stemmer
+
+    plain_latency = time_per_call(plain.analyze, [(text,) for text in SAMPLE_COMPLAINTS * 50])
+    stemming_latency = time_per_call(stemming.analyze, [(text,) for text in SAMPLE_COMPLAINTS * 50])
+
+    print(f"\nanalyze() without stemming: {plain_latency * 1e6:8.1f} us/complaint")
+    print(f"analyze() with stemming:    {stemming_latency * 1e6:8.1f} us/complaint "
+          f"(+{(stemming_latency - plain_latency) * 1e6:.1f} us)")
+
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), 'app/data/trained_model')
+DATASET_PATH = os.path.join(os.path.dirname(__file__), 'app/data/symptoms_dataset.csv')
+
+
+def load_processed_dataset(repeat: int = 1):
+    """Processed complaints of the training dataset, repeated to a batch size"""
+    import pandas as pd
+    texts = list(preprocess_many(pd.read_csv(DATASET_PATH)['complaint'])['processed'])
+    return texts * repeat
+
+
+def benchmark_predict_batch():
+    """Classifier: per-complaint predict() vs vectorized predict_batch()"""
+    print_header("BENCHMARK: Batch Classifier Prediction")
+
+    classifier = SymptomClassifier(MODEL_PATH)
+    texts = load_processed_dataset(repeat=100)
+
+    single_latency = time_per_call(classifier.predict, [(text,) for text in texts[:1000]], repeat=1)
+    print(f"\npredict():                 {1 / single_latency:10.0f} complaints/s")
+
+    for batch_size in [100, 1000, len(texts)]:
+        batches = [(texts[i:i + batch_size],) for i in range(0, len(texts), batch_size)]
+        batch_latency = time_per_call(classifier.predict_batch, batches) / batch_size
+        print(f"predict_batch({batch_size:>6}):     {1 / batch_latency:10.0f} complaints/s")
+
+    dict_latency = time_per_call(lambda batch: classifier.predict_batch(batch, as_dicts=True), [(texts,)], repeat=1)
+    print(f"predict_batch(as_dicts):   {len(texts) / dict_latency:10.0f} complaints/s")
+
+
+def benchmark_inference():
+    """Classifier: sklearn transform + predict_proba vs the NumPy inference engine"""
+    print_header("BENCHMARK: NumPy Inference Engine")
+
+    classifier = SymptomClassifier()
+    classifier.load_model(MODEL_PATH, use_artifact=False)
+    vectorizer, model, engine = classifier.vectorizer, classifier.model, classifier.engine
+    texts = load_processed_dataset()
+
+    expected = model.predict_proba(vectorizer.transform(texts))
+    print(f"\nMax difference vs sklearn: {abs(expected - engine.predict_proba(texts)).max():.2e}")
+
+    sklearn_latency = time_per_call(lambda text: model.predict_proba(vectorizer.transform([text])), [(text,) for text in texts])
+    engine_latency = time_per_call(lambda text: engine.predict_proba([text]), [(text,) for text in texts])
+    print(f"\nSingle complaint (per call)")
+    print(f"  sklearn:        {sklearn_latency * 1e6:8.1f} us")
+    print(f"  NumPy engine:   {engine_latency * 1e6:8.1f} us ({sklearn_latency / engine_latency:.1f}x)")
+
+    batch = [(texts * 20,)]
+    sklearn_batch = time_per_call(lambda batch: model.predict_proba(vectorizer.transform(batch)), batch) / len(batch[0][0])
+    engine_batch = time_per_call(engine.predict_proba, batch) / len(batch[0][0])
+    print(f"\nBatch of {len(batch[0][0])} (per complaint)")
+    print(f"  sklearn:        {sklearn_batch * 1e6:8.1f} us")
+    print(f"  NumPy engine:   {engine_batch * 1e6:8.1f} us ({sklearn_batch / engine_batch:.1f}x)")
+
+
+def benchmark_model_load():
+    """Model startup: joblib pickles vs memory-mapped pickle-free artifact"""
+    print_header("BENCHMARK: Model Artifact Load")
+
+    pickle_load = time_per_call(lambda: SymptomClassifier().load_model(MODEL_PATH, use_artifact=False), [()], repeat=3)
+    artifact_load = time_per_call(lambda: SymptomClassifier().load_model(MODEL_PATH), [()], repeat=3)
+
+    print(f"\n  Pickle (joblib):     {pickle_load * 1000:8.1f} ms")
+    print(f"  Artifact (mmap):     {artifact_load * 1000:8.1f} ms ({pickle_load / artifact_load:.0f}x)")
+
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), '..', 'DATABASE', 'dataset', 'dataset.csv')
+
+
+def load_symptom_corpus():
+    """DATABASE disease-symptom table as (complaint, category) rows, duplicates kept"""
+    from app.models.model_selection import load_training_data
+    return load_training_data([CORPUS_PATH], dedupe=False)
+
+
+def benchmark_features():
+    """Classifier feature modes: TF-IDF vocabulary vs hashing (accuracy, latency, memory)"""
+    import pickle
+    import warnings
+
+    print_header("BENCHMARK: TF-IDF vs Hashing Feature Modes")
+
+    corpus = load_symptom_corpus()
+    print(f"\nCorpus: {CORPUS_PATH}")
+    print(f"  {len(corpus)} rows, {corpus['category'].nunique()} categories, "
+          f"{corpus['complaint'].nunique()} distinct complaints")
+
+    modes = [
+        ('tfidf', {'features': 'tfidf'}),
+        ('hashing+idf', {'features': 'hashing', 'hash_idf': True}),
+        ('hashing', {'features': 'hashing', 'hash_idf': False}),
+    ]
+    texts = list(corpus['complaint'])
+
+    # Most rows are repeats, so held-out accuracy is also reported without duplicates
+    for label, frame in [('all rows', corpus), ('distinct rows', corpus.drop_duplicates())]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, 'corpus.csv')
+            frame.to_csv(dataset_path, index=False)
+
+            print(f"\n[{label}: {len(frame)}]")
+            print(f"{'Mode':<13}{'Accuracy':>9}{'Train s':>9}{'1 call us':>11}{'Batch us':>10}"
+                  f"{'Vocab KB':>10}{'Arrays KB':>11}{'Pickle KB':>11}")
+            for name, options in modes:
+                classifier = SymptomClassifier()
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    start = time.perf_counter()
+                    metrics = classifier.train(dataset_path, **options)
+                    train_seconds = time.perf_counter() - start
+
+                engine = classifier.engine
+                single = time_per_call(classifier.predict, [(text,) for text in texts[:500]])
+                batch = time_per_call(classifier.predict_batch, [(texts,)]) / len(texts)
+                vocabulary_bytes = sys.getsizeof(engine.vocabulary) + sum(sys.getsizeof(term) for term in engine.vocabulary)
+                array_bytes = engine.coefficient_nbytes + (engine.idf.nbytes if engine.idf is not None else 0)
+                pickle_bytes = len(pickle.dumps(classifier.vectorizer)) + len(pickle.dumps(classifier.model))
+
+                print(f"{name:<13}{metrics['accuracy']:>9.3f}{train_seconds:>9.2f}{single * 1e6:>11.1f}{batch * 1e6:>10.1f}"
+                      f"{vocabulary_bytes / 1024:>10.1f}{array_bytes / 1024:>11.1f}{pickle_bytes / 1024:>11.1f}")
+
+    print("\n1 call = predict() per complaint; Batch = predict_batch() over the corpus, per complaint")
+
+
+def benchmark_transform():
+    """TF-IDF transform: sklearn vs the engine's analyzer vs its lookup-table fast path"""
+    import copy
+    import numpy as np
+
+    print_header("BENCHMARK: Fast-path TF-IDF Transform")
+
+    classifier = SymptomClassifier()
+    classifier.load_model(MODEL_PATH, use_artifact=False)
+    vectorizer, engine = classifier.vectorizer, classifier.engine
+    texts = load_processed_dataset() + list(load_symptom_corpus()['complaint'][:2000])
+
+    # Same engine without lookup tables: n-gram strings + vocabulary lookups
+    analyzer_engine = copy.copy(engine)
+    analyzer_engine._unigrams = analyzer_engine._bigrams = None
+
+    expected = vectorizer.transform(texts)
+    actual = engine.transform_csr(texts)
+    identical = all(
+        np.array_equal(getattr(expected, name), getattr(actual, name))
+        and getattr(expected, name).dtype == getattr(actual, name).dtype
+        for name in ('data', 'indices', 'indptr')
+    )
+    print(f"\n{len(texts)} complaints, CSR identical to sklearn (bit for bit): {identical}")
+
+    # The engine scores from the coordinate form; CSR assembly is scipy's cost
+    args = [(text,) for text in texts]
+    sklearn_latency = time_per_call(lambda text: vectorizer.transform([text]), args[:1000])
+    analyzer_latency = time_per_call(lambda text: analyzer_engine.transform([text]), args, repeat=7)
+    fast_latency = time_per_call(lambda text: engine.transform([text]), args, repeat=7)
+    print(f"\nTransform, single complaint (per call)")
+    print(f"  sklearn:          {sklearn_latency * 1e6:8.1f} us")
+    print(f"  engine analyzer:  {analyzer_latency * 1e6:8.1f} us ({sklearn_latency / analyzer_latency:.1f}x)")
+    print(f"  lookup fast path: {fast_latency * 1e6:8.1f} us ({sklearn_latency / fast_latency:.1f}x)")
+
+    sklearn_classifier = copy.copy(classifier)
+    sklearn_classifier.engine = None
+    analyzer_classifier = copy.copy(classifier)
+    analyzer_classifier.engine = analyzer_engine
+
+    sklearn_predict = time_per_call(sklearn_classifier.predict, args[:1000])
+    analyzer_predict = time_per_call(analyzer_classifier.predict, args, repeat=7)
+    fast_predict = time_per_call(classifier.predict, args, repeat=7)
+    print(f"\nSymptomClassifier.predict (per complaint)")
+    print(f"  sklearn:          {sklearn_predict * 1e6:8.1f} us")
+    print(f"  engine analyzer:  {analyzer_predict * 1e6:8.1f} us ({sklearn_predict / analyzer_predict:.1f}x)")
+    print(f"  lookup fast path: {fast_predict * 1e6:8.1f} us ({sklearn_predict / fast_predict:.1f}x)")
+
+
+def benchmark_similar_cases(n_cases: int = 300000):
+    """Similar-case search: inverted index vs brute-force sparse scoring at scale"""
+    import numpy as np
+    from app.models.similar_cases import SimilarCaseIndex
+
+    print_header("BENCHMARK: Similar-Case Inverted Index")
+
+    classifier = SymptomClassifier(MODEL_PATH)
+    corpus = load_processed_dataset() + list(preprocess_many(load_symptom_corpus()['complaint'][:2000])['processed'])
+
+    # Synthetic history: complaint lengths and tokens sampled from the corpus
+    rng = np.random.default_rng(0)
+    tokens = np.array([token for text in corpus for token in text.split()])
+    lengths = np.array([len(text.split()) for text in corpus])
+    cases = [
+        ' '.join(tokens[rng.integers(0, len(tokens), length)])
+        for length in rng.choice(lengths, n_cases)
+    ]
+    queries = [corpus[i] for i in rng.integers(0, len(corpus), 500)]
+
+    def build():
+        index = SimilarCaseIndex(classifier)
+        for start in range(0, n_cases, 20000):
+            index.add(cases[start:start + 20000])
+        index.compact()
+        return index
+
+    index, build_seconds, peak = measure_build(build)
+    stats = index.get_stats()
+    print(f"\n{n_cases} cases, {stats['postings']} postings, {len(set(tokens))} distinct tokens")
+    print(f"  Build:           {build_seconds:8.2f} s ({n_cases / build_seconds:.0f} cases/s, peak {peak / 1024 / 1024:.0f} MB)")
+    print(f"  Index arrays:    {stats['array_bytes'] / 1024 / 1024:8.1f} MB")
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, top_k=5)
+        latencies.append(time.perf_counter() - start)
+    print(f"\nSearch top-5 (per query)")
+    print(f"  Inverted index:  p50 {np.percentile(latencies, 50) * 1000:6.2f} ms   p99 {np.percentile(latencies, 99) * 1000:6.2f} ms")
+
+    matrix = classifier.engine.transform_csr([classifier._featurize(text) for text in cases])
+    brute = []
+    for query in queries[:100]:
+        start = time.perf_counter()
+        scores = matrix @ classifier.engine.transform_csr([query]).T
+        np.argpartition(-scores.toarray().ravel(), 5)[:5]
+        brute.append(time.perf_counter() - start)
+    print(f"  Brute force CSR: p50 {np.percentile(brute, 50) * 1000:6.2f} ms   p99 {np.percentile(brute, 99) * 1000:6.2f} ms")
+
+    # Inserting into a large index only touches the buffer until compaction
+    insert = time_per_call(lambda text: index.add([text]), [(text,) for text in queries], repeat=1)
+    print(f"\nIncremental insert: {insert * 1e6:8.1f} us per case")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        index.save(tmp_dir)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        SimilarCaseIndex.load(tmp_dir, classifier)
+        print(f"Save / load:        {save_seconds:8.2f} s / {time.perf_counter() - start:.2f} s")
+
+
+def substring_red_flags(engine, text: str):
+    """Previous detect_red_flags: every rule, every keyword, substring search"""
+    text_lower = text.lower()
+    detected = []
+    for rule in engine.rules.get('critical_red_flags', []):
+        for keyword in rule['keywords']:
+            if keyword.lower() in text_lower:
+                detected.append(keyword)
+                break
+    if not detected:
+        for rule in engine.rules.get('warning_yellow_flags', []):
+            for keyword in rule['keywords']:
+                if keyword.lower() in text_lower:
+                    detected.append(keyword)
+                    break
+    return detected
+
+
+def benchmark_urgency():
+    """Red-flag matching: per-keyword substring scan vs compiled automaton, scaling the ruleset"""
+    import json
+    from app.models.urgency_engine import UrgencyEngine, FLAG_LEVELS
+
+    print_header("BENCHMARK: Red-Flag Matcher vs Ruleset Size")
+
+    rules_path = os.path.join(os.path.dirname(__file__), 'app/data/red_flags_rules.json')
+    with open(rules_path, 'r', encoding='utf-8') as f:
+        base_rules = json.load(f)
+    complaints = load_processed_dataset()
+    vocabulary = sorted({word for text in complaints for word in text.split()})
+
+    rng = random.Random(42)
+    # Synthetic keywords mix corpus words (partial matches walk the automaton)
+    # with at least one random word, so the rules that fire stay the real ones
+    print(f"\n{len(complaints)} complaints; synthetic keywords = corpus words + a random word")
+    print(f"{'Rules':>7}{'Keywords':>10}{'Compile ms':>12}{'Hits':>6}{'Substring us':>14}{'Automaton us':>14}{'Speedup':>9}")
+
+    for extra_rules in [0, 500, 2000, 5000]:
+        rules = {key: list(base_rules.get(key, [])) for key, _, _ in FLAG_LEVELS}
+        for i in range(extra_rules):
+            key = FLAG_LEVELS[i % len(FLAG_LEVELS)][0]
+            keywords = []
+            for _ in range(3):
+                words = [rng.choice(vocabulary) for _ in range(rng.randint(0, 2))]
+                words.insert(rng.randint(0, len(words)), random_word(rng))
+                keywords.append(' '.join(words))
+            rules[key].append({'keywords': keywords, 'reason': f'synthetic {i}', 'action': '-'})
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'rules.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(rules, f)
+            start = time.perf_counter()
+            engine = UrgencyEngine(path)
+            compile_seconds = time.perf_counter() - start
+
+        args = [(text,) for text in complaints]
+        substring = time_per_call(lambda text: substring_red_flags(engine, text), args)
+        automaton = time_per_call(engine.detect_red_flags, args)
+        n_rules = sum(len(rules[key]) for key, _, _ in FLAG_LEVELS)
+        hits = sum(len(engine.matcher.find_all(text)) for text in complaints) / len(complaints)
+        print(f"{n_rules:>7}{len(engine.matcher):>10}{compile_seconds * 1000:>12.1f}{hits:>6.1f}"
+              f"{substring * 1e6:>14.1f}{automaton * 1e6:>14.1f}{substring / automaton:>8.1f}x")
+
+    print("\nAutomaton time covers all levels (red, yellow and green hits) in one pass")
+
+
+BENCHMARKS = {
+    'spelling': benchmark_spelling,
+    'stemming': benchmark_stemming,
+    'predict_batch': benchmark_predict_batch,
+    'inference': benchmark_inference,
+    'transform': benchmark_transform,
+    'model_load': benchmark_model_load,
+    'features': benchmark_features,
+    'similar_cases': benchmark_similar_cases,
+    'urgency': benchmark_urgency,
+}
+
+
+def main():
+    """Run selected benchmarks"""
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for name in selected:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            continue
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Build the similar-case index for TRIAGE.AI
+Streams an export of historical triage records (triage_records columns:
+triage_id, complaint, primary_category, urgency_level, doctor_reviewed,
+created_at) in chunks and indexes them in the active model's TF-IDF space
+
+Usage:
+    python build_similar_index.py records.csv [records2.ndjson ...]
+        [--model app/data/trained_model] [--output app/data/similar_cases]
+        [--all] [--append] [--chunk-size 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from app.models.classifier import SymptomClassifier
+from app.models.similar_cases import SimilarCaseIndex, DEFAULT_SIMILAR_CASES_DIR
+from app.utils.corpus_stream import iter_chunks
+
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), 'app/data/trained_model')
+
+
+def main():
+    """Index triage records and save the index"""
+    parser = argparse.ArgumentParser(description="Similar-case index builder")
+    parser.add_argument('records', nargs='+', help="Triage record exports (.csv, .ndjson/.jsonl, .parquet)")
+    parser.add_argument('--model', default=MODEL_PATH, help="Model whose features the index uses")
+    parser.add_argument('--output', default=DEFAULT_SIMILAR_CASES_DIR, help="Index directory")
+    parser.add_argument('--all', action='store_true', help="Include records not reviewed by a doctor")
+    parser.add_argument('--append', action='store_true', help="Add to the existing index instead of rebuilding")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Rows per chunk")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("TRIAGE.AI - Similar-Case Index")
+    print("="*60 + "\n")
+
+    classifier = SymptomClassifier()
+    classifier.load_model(args.model)
+
+    if args.append:
+        # Cases indexed with another model are re-indexed in this one
+        index = SimilarCaseIndex.load(args.output, classifier, rebuild=True)
+        print(f"[INFO] Appending to index with {len(index)} cases")
+    else:
+        index = SimilarCaseIndex(classifier)
+
+    start = time.perf_counter()
+    rows = 0
+    for path in args.records:
+        for chunk in iter_chunks(path, chunk_size=args.chunk_size):
+            rows += len(chunk)
+            added = index.add_records(chunk.to_dict('records'), reviewed_only=not args.all)
+            print(f"[INFO] {os.path.basename(path)}: {rows} rows read, {len(index)} cases indexed (+{added})")
+
+    manifest = index.save(args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n[SUCCESS] {manifest['cases']} cases, {manifest['postings']} postings saved to {args.output}")
+    print(f"[SUCCESS] Elapsed: {elapsed:.1f}s\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Build the persistent word -> stem cache for TRIAGE.AI
+Run offline after the training vocabulary changes, so serving never calls Sastrawi
+
+Usage:
+    python build_stem_cache.py [dataset.csv ...]
+"""
+
+import os
+import sys
+
+# Add app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pandas as pd
+
+from app.utils.preprocessor import IndonesianPreprocessor
+from app.utils.stemmer import CachedStemmer, DEFAULT_STEM_CACHE_PATH
+
+
+def main():
+    """Stem the vocabulary of the training datasets and save the cache"""
+
+    print("\n" + "="*60)
+    print("TRIAGE.AI - Stem Cache Builder")
+    print("="*60 + "\n")
+
+    current_dir = os.path.dirname(__file__)
+    dataset_paths = sys.argv[1:] or [
+        os.path.join(current_dir, 'app/data/symptoms_dataset.csv'),
+        os.path.join(current_dir, 'app/data/symptoms_dataset_improved.csv'),
+    ]
+
+    # Stems must be computed on the same tokens the pipeline produces
+    preprocessor = IndonesianPreprocessor(cache_size=0, stemming=False)
+    stemmer = CachedStemmer(DEFAULT_STEM_CACHE_PATH)
+    print(f"[INFO] Existing cache: {len(stemmer.stems)} words")
+
+    vocabulary = set()
+    for path in dataset_paths:
+        if not os.path.exists(path):
+            print(f"[SKIP] Dataset not found: {path}")
+            continue
+        df = pd.read_csv(path)
+        batch = preprocessor.preprocess_many(df['complaint'])
+        for tokens in batch['tokens']:
+            vocabulary.update(tokens)
+        print(f"[INFO] {path}: {len(df)} complaints")
+
+    # Dictionary vocabulary is always included
+    for phrase in list(preprocessor.medical_terms_map.values()) + list(preprocessor.symptom_keywords):
+        vocabulary.update(phrase.split())
+
+    added = stemmer.warm(sorted(vocabulary))
+    stemmer.save(DEFAULT_STEM_CACHE_PATH)
+
+    print(f"[SUCCESS] Vocabulary: {len(vocabulary)} words, {added} newly stemmed")
+    print(f"[SUCCESS] Cache saved to: {DEFAULT_STEM_CACHE_PATH} ({len(stemmer.stems)} words)\n")
+
+
+if __name__ == "__main__":
+    main()
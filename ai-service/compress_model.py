@@ -0,0 +1,145 @@
+"""
+Coefficient compression report and export for TRIAGE.AI
+Compares pruned / reduced-precision artifacts against the float64 model on
+accuracy, artifact size, resident coefficient memory and latency, and
+optionally exports one level
+
+Usage:
+    python compress_model.py [--model app/data/trained_model]
+        [--data app/data/symptoms_dataset.csv ...]
+        [--levels float32,float16,int8,float16:0.01,int8:0.05]
+        [--export int8:0.05 --output app/data/trained_model_int8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Add app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from app.models.classifier import SymptomClassifier
+from app.models.inference import LinearInferenceEngine
+from app.models.model_selection import load_training_data
+from app.utils.preprocessor import preprocess_many
+
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), 'app/data/trained_model')
+DATASET_PATH = os.path.join(os.path.dirname(__file__), 'app/data/symptoms_dataset.csv')
+DEFAULT_LEVELS = 'float32,float16,int8,float16:0.01,int8:0.01,int8:0.05,int8:0.1'
+
+
+def parse_level(level: str) -> Tuple[str, float]:
+    """'int8:0.05' -> ('int8', 0.05); the prune fraction defaults to 0"""
+    precision, _, prune = level.partition(':')
+    return precision, float(prune or 0.0)
+
+
+def directory_bytes(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def measure(engine: LinearInferenceEngine, texts: List[str], labels: np.ndarray, reference: np.ndarray) -> Dict:
+    """Accuracy, agreement with the float64 model and per-complaint latency"""
+    probabilities = engine.predict_proba(texts)
+    predicted = engine.classes_[probabilities.argmax(axis=1)]
+
+    sample = texts[:500]
+    start = time.perf_counter()
+    for text in sample:
+        engine.predict_proba([text])
+    single_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+    start = time.perf_counter()
+    engine.predict_proba(texts)
+    batch_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    return {
+        'accuracy': float(np.mean(predicted == labels)),
+        'agreement': float(np.mean(probabilities.argmax(axis=1) == reference.argmax(axis=1))),
+        'max_probability_delta': float(np.abs(probabilities - reference).max()),
+        'single_us': single_us,
+        'batch_us': batch_us,
+    }
+
+
+def main():
+    """Report compression levels and optionally export one"""
+    parser = argparse.ArgumentParser(description="Compressed model coefficients")
+    parser.add_argument('--model', default=MODEL_PATH, help="Model directory (float64 artifact or pickles)")
+    parser.add_argument('--data', nargs='+', default=[DATASET_PATH], help="Labelled evaluation data (.csv, .ndjson)")
+    parser.add_argument('--levels', default=DEFAULT_LEVELS, help="Comma-separated precision[:prune] levels")
+    parser.add_argument('--raw', action='store_true', help="Evaluate on raw text instead of preprocessed text")
+    parser.add_argument('--export', help="Level to export, e.g. int8:0.05")
+    parser.add_argument('--output', help="Directory for the exported model")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("TRIAGE.AI - Coefficient Compression")
+    print("="*60 + "\n")
+
+    classifier = SymptomClassifier()
+    classifier.load_model(args.model)
+    base = classifier.engine
+    if base is None:
+        print("[ERROR] Model has no NumPy inference engine; compression needs one")
+        return
+    if base.sparse_weights is not None:
+        print(f"Warning: Model is already compressed ({base.compression}); it is used as the baseline")
+
+    data = load_training_data(args.data)
+    texts = data['complaint'].astype(str) if args.raw else preprocess_many(data['complaint'])['processed']
+    texts = [classifier._featurize(text) for text in texts]
+    labels = data['category'].astype(str).to_numpy()
+    known = np.isin(labels, base.classes_)
+    if not known.all():
+        print(f"Warning: {int((~known).sum())} rows have categories the model does not know; they count as errors")
+
+    reference = base.predict_proba(texts)
+    print(f"[INFO] {len(texts)} complaints, {len(base.classes_)} categories, "
+          f"{base.dense_weights().shape[0]} features\n")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        base_dir = os.path.join(work_dir, 'float64')
+        base.save(base_dir)
+        # Every level is measured after a save/load round trip, as served
+        loaded = LinearInferenceEngine.load(base_dir, mmap=False)
+        rows.append(('float64', 0.0, 1.0, directory_bytes(base_dir), loaded.coefficient_nbytes,
+                     measure(loaded, texts, labels, reference)))
+
+        for level in args.levels.split(','):
+            precision, prune = parse_level(level.strip())
+            level_dir = os.path.join(work_dir, level.replace(':', '_'))
+            base.compress(prune=prune, precision=precision).save(level_dir)
+            loaded = LinearInferenceEngine.load(level_dir, mmap=False)
+            rows.append((precision, prune, loaded.compression['density'], directory_bytes(level_dir),
+                         loaded.coefficient_nbytes, measure(loaded, texts, labels, reference)))
+
+    base_accuracy, base_resident = rows[0][5]['accuracy'], rows[0][4]
+    print(f"{'Precision':<10}{'Prune':>7}{'Density':>9}{'Accuracy':>10}{'Delta':>8}{'Agree':>8}"
+          f"{'Max dP':>9}{'Artifact':>11}{'Resident':>11}{'Ratio':>7}{'us/call':>9}{'us/batch':>10}")
+    for precision, prune, density, artifact_bytes, resident_bytes, metrics in rows:
+        print(f"{precision:<10}{prune:>7g}{density:>9.3f}{metrics['accuracy']:>10.4f}"
+              f"{metrics['accuracy'] - base_accuracy:>+8.4f}{metrics['agreement']:>8.4f}"
+              f"{metrics['max_probability_delta']:>9.4f}{artifact_bytes / 1024:>9.1f}KB"
+              f"{resident_bytes / 1024:>9.1f}KB{base_resident / resident_bytes:>6.1f}x"
+              f"{metrics['single_us']:>9.1f}{metrics['batch_us']:>10.2f}")
+    print("\nResident = coefficient arrays in memory; latency per complaint (single call / batched)")
+
+    if args.export:
+        if not args.output:
+            print("[ERROR] --export needs --output")
+            return
+        precision, prune = parse_level(args.export)
+        classifier.save_model(args.output, compression={'prune': prune, 'precision': precision})
+        print(f"\n[SUCCESS] Exported {args.export} model to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Incremental model updates for TRIAGE.AI
+Learns from doctor-reviewed triage records (NDJSON / CSV export) without a
+full retrain, checkpointing each update so it can be rolled back
+
+A fresh checkpoint directory is first seeded with the base training
+dataset, so the first checkpoint starts near the production model.
+
+Usage:
+    python learn_incremental.py reviewed_records.ndjson [--eval dataset.csv]
+        [--seed-from symptoms_dataset.csv] [--seed-epochs 5]
+    python learn_incremental.py --list
+    python learn_incremental.py --rollback [VERSION]
+
+Export example (Supabase / Postgres):
+    SELECT complaint, primary_category, doctor_reviewed FROM triage_records
+    WHERE doctor_reviewed
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pandas as pd
+
+from app.models.incremental import IncrementalLearner
+from app.utils.versioning import CURRENT_FILE
+
+
+CURRENT_DIR = os.path.dirname(__file__)
+DEFAULT_CHECKPOINT_DIR = os.path.join(CURRENT_DIR, 'app/data/incremental_model')
+DEFAULT_CATEGORIES_PATH = os.path.join(CURRENT_DIR, 'app/data/trained_model/categories.json')
+DEFAULT_SEED_PATH = os.path.join(CURRENT_DIR, 'app/data/symptoms_dataset.csv')
+
+
+def load_classes(path: str):
+    """Category set from categories.json or a dataset CSV"""
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['categories']
+    return list(pd.read_csv(path)['category'].unique())
+
+
+def main():
+    """Apply one incremental update, or manage checkpoints"""
+    parser = argparse.ArgumentParser(description="Incremental learning from reviewed triage records")
+    parser.add_argument('input', nargs='?', help="Reviewed records (.ndjson/.jsonl, .csv, .parquet)")
+    parser.add_argument('--checkpoint-dir', default=DEFAULT_CHECKPOINT_DIR, help="Checkpoint directory")
+    parser.add_argument('--classes-from', default=DEFAULT_CATEGORIES_PATH,
+                        help="categories.json or dataset CSV (first run only)")
+    parser.add_argument('--seed-from', default=DEFAULT_SEED_PATH,
+                        help="Base dataset a fresh learner is trained on first (first run only)")
+    parser.add_argument('--seed-epochs', type=int, default=5, help="Passes over the seed dataset")
+    parser.add_argument('--batch-size', type=int, default=512, help="Rows per mini-batch")
+    parser.add_argument('--epochs', type=int, default=1, help="Passes over the input")
+    parser.add_argument('--all-rows', action='store_true',
+                        help="Do not filter on doctor_reviewed (required if the export has no such column)")
+    parser.add_argument('--eval', help="Dataset CSV (complaint, category) to report accuracy on")
+    parser.add_argument('--list', action='store_true', help="List checkpoints")
+    parser.add_argument('--rollback', nargs='?', type=int, const=-1, help="Roll back (to VERSION)")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("TRIAGE.AI - Incremental Learning")
+    print("="*60 + "\n")
+
+    fresh = not os.path.exists(os.path.join(args.checkpoint_dir, CURRENT_FILE))
+    if fresh and (args.list or args.rollback is not None):
+        print("[INFO] No checkpoints yet\n")
+        return
+
+    learner = IncrementalLearner(
+        args.checkpoint_dir,
+        classes=load_classes(args.classes_from) if fresh else None,
+        seed_path=args.seed_from if fresh else None,
+        seed_epochs=args.seed_epochs
+    )
+    if fresh:
+        version = learner.checkpoint(note=f"seed: {os.path.basename(args.seed_from)}")
+        print(f"[INFO] Seed checkpoint v{version:04d}")
+
+    if args.list:
+        current = learner.current_version()
+        for version in learner.list_versions():
+            print(f"  v{version:04d}{'  (current)' if version == current else ''}")
+        return
+
+    if args.rollback is not None:
+        version = learner.rollback(None if args.rollback == -1 else args.rollback)
+        print(f"[SUCCESS] Rolled back to v{version:04d}: {learner.current_path()}\n")
+        return
+
+    if not args.input:
+        parser.error("input file is required unless --list or --rollback is given")
+
+    evaluation = pd.read_csv(args.eval) if args.eval else None
+    if evaluation is not None and learner.version:
+        print(f"[INFO] Accuracy before: {learner.evaluate(evaluation['complaint'], evaluation['category']):.2%}")
+
+    try:
+        stats = learner.learn_from_file(
+            args.input,
+            batch_size=args.batch_size,
+            reviewed_only=not args.all_rows,
+            epochs=args.epochs
+        )
+    except ValueError as e:
+        print(f"[ERROR] {e} (--all-rows on the command line)\n")
+        return
+    print(f"[INFO] Learned {stats['rows']} rows in {stats['seconds']:.2f}s "
+          f"({stats['unreviewed']} unreviewed, {stats['skipped']} unknown category skipped)")
+
+    if stats['rows'] == 0:
+        print("[WARNING] Nothing learned, no checkpoint written\n")
+        return
+
+    if evaluation is not None:
+        print(f"[INFO] Accuracy after:  {learner.evaluate(evaluation['complaint'], evaluation['category']):.2%}")
+
+    version = learner.checkpoint(note=os.path.basename(args.input))
+    print(f"[SUCCESS] Checkpoint v{version:04d}: {learner.current_path()}")
+    print("[SUCCESS] Load it with SymptomClassifier(path); roll back with --rollback\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Re-preprocess a large complaint corpus for TRIAGE.AI
+Streams CSV / Parquet / NDJSON in chunks with constant memory and resumes
+from the last checkpoint if interrupted
+
+Usage:
+    python preprocess_corpus.py input.csv output.ndjson [--column complaint]
+        [--chunk-size 10000] [--jobs 1] [--restart]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from app.utils.corpus_stream import preprocess_corpus
+
+
+def main():
+    """Preprocess a corpus file into an output file"""
+    parser = argparse.ArgumentParser(description="Streaming complaint preprocessing")
+    parser.add_argument('input', help="Input corpus (.csv, .ndjson/.jsonl, .parquet)")
+    parser.add_argument('output', help="Output file (.csv or .ndjson/.jsonl)")
+    parser.add_argument('--column', default='complaint', help="Complaint text column")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Rows per chunk")
+    parser.add_argument('--jobs', type=int, default=1, help="Worker processes (-1 = all cores)")
+    parser.add_argument('--restart', action='store_true', help="Ignore existing checkpoint")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("TRIAGE.AI - Corpus Preprocessing")
+    print("="*60 + "\n")
+
+    start = time.perf_counter()
+    state = preprocess_corpus(
+        args.input,
+        args.output,
+        column=args.column,
+        chunk_size=args.chunk_size,
+        n_jobs=args.jobs,
+        resume=not args.restart
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"\n[SUCCESS] {state['rows_done']} rows written to {args.output}")
+    print(f"[SUCCESS] Elapsed: {elapsed:.1f}s (config {state['config_version']})\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Cross-validated model selection for TRIAGE.AI
+Grid-searches vectorizer and regularization settings with k-fold CV in
+parallel, writes a report and saves the winning model
+
+Usage:
+    python select_model.py ../DATABASE/dataset/dataset.csv reviewed_records.ndjson
+        [--folds 5] [--jobs -1] [--keep-duplicates] [--report model_selection_report.json]
+        [--save app/data/trained_model]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+# Add app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from app.models.model_selection import load_training_data, cross_validate_grid, train_best
+
+
+def main():
+    """Run CV grid search and save the best model"""
+    parser = argparse.ArgumentParser(description="Cross-validated model selection")
+    parser.add_argument('datasets', nargs='+', help="Labelled data (.csv, .ndjson); DATABASE dataset.csv supported")
+    parser.add_argument('--folds', type=int, default=5, help="Number of CV folds")
+    parser.add_argument('--jobs', type=int, default=-1, help="Worker processes (-1 = all cores)")
+    parser.add_argument('--keep-duplicates', action='store_true',
+                        help="Keep duplicate (complaint, category) rows (they leak across CV folds)")
+    parser.add_argument('--raw', action='store_true', help="Train on raw text instead of preprocessed text")
+    parser.add_argument('--report', default='model_selection_report.json', help="JSON report path")
+    parser.add_argument('--save', help="Save the winning model to this directory")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("TRIAGE.AI - Model Selection")
+    print("="*60 + "\n")
+
+    data = load_training_data(args.datasets, dedupe=not args.keep_duplicates)
+    print(f"[INFO] {len(data)} samples, {data['category'].nunique()} categories, "
+          f"{data['complaint'].nunique()} distinct complaints")
+
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        results, info = cross_validate_grid(data, folds=args.folds, n_jobs=args.jobs, preprocess=not args.raw)
+    info['total_seconds'] = time.perf_counter() - start
+
+    print(f"[INFO] {info['configurations']} configurations x {info['folds']} folds in {info['total_seconds']:.1f}s "
+          f"(preprocess {info['preprocess_seconds']:.1f}s, vectorize {info['vectorize_seconds']:.1f}s, "
+          f"fit {info['fit_seconds']:.1f}s)\n")
+
+    print(f"{'Configuration':<44}{'C':>6}{'Accuracy':>15}{'Macro F1':>10}{'Fit s':>8}{'us/call':>9}")
+    for result in results:
+        accuracy = f"{result['accuracy']:.3f}±{result['accuracy_std']:.3f}"
+        print(f"{result['name']:<44}{result['C']:>6g}{accuracy:>15}{result['macro_f1']:>10.3f}"
+              f"{result['fit_seconds']:>8.2f}{result['latency_us']:>9.1f}")
+
+    best = results[0]
+    worst_classes = sorted(best['per_class_f1'].items(), key=lambda item: item[1])[:5]
+    print(f"\n[BEST] {best['name']}, C={best['C']:g}: accuracy {best['accuracy']:.3f}, macro F1 {best['macro_f1']:.3f}")
+    print("[BEST] Lowest per-class F1: " + ', '.join(f"{label} {f1:.2f}" for label, f1 in worst_classes))
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'datasets': args.datasets, 'cv': info, 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f"[SUCCESS] Report saved to: {args.report}")
+
+    if args.save:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            classifier = train_best(data, best, preprocess=not args.raw)
+        classifier.save_model(args.save)
+        print(f"[SUCCESS] Winning model saved to: {args.save}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 from app.utils.preprocessor import preprocess_text, extract_symptoms, extract_numeric_data
 from app.models.urgency_engine import analyze_urgency
 from app.models.classifier import SymptomClassifier
+from app.utils.preprocessor import preprocessor
+from app.utils.term_matcher import apply_sequential, KeywordAutomaton
 
 
 def print_header(text):
@@ -56,6 +58,138 @@ def test_preprocessor():
         numeric = extract_numeric_data(complaint)
         print(f"Numeric data: {json.dumps(numeric, indent=2)}")
 
+    # Symptoms carrying an enclitic (-nya/-ku/-mu)
+    enclitic_cases = {
+        "demamnya tinggi": ["demam"],
+        "sakit perutnya hebat": ["sakit perut"],
+        "kepalaku pusing dan batuknya lama": ["pusing", "batuk"],
+    }
+    for complaint, expected in enclitic_cases.items():
+        symptoms = extract_symptoms(complaint)
+        print(f"Enclitic: {complaint} -> {symptoms}")
+        assert sorted(symptoms) == sorted(expected)
+
+    # Ages and gestation are not symptom durations; bare durations still are
+    duration_cases = {
+        "anak saya 2 tahun demam": None,
+        "bayi 6 bulan batuk pilek": None,
+        "hamil 5 bulan, perut kram": None,
+        "batuk sudah 3 minggu": 21,
+        "sesak sejak 2 bulan": 60,
+        "mulai pusing 3 hari yang lalu": 3,
+        "diare 2 minggu": 14,
+        "nyeri sendi 3 minggu": 21,
+        "sakit kepala 3 minggu ini": 21,
+        "batuk 2 bulan": 60,
+    }
+    for complaint, expected in duration_cases.items():
+        numeric = extract_numeric_data(complaint)
+        result = analyze_urgency(preprocess_text(complaint)['processed'], numeric)
+        prolonged = [flag for flag in result['detected_flags'] if flag['keyword'].startswith('gejala berkepanjangan')]
+        print(f"Duration: {complaint} -> {numeric['duration_days']} days, {result['urgency_level']}")
+        assert numeric['duration_days'] == expected
+        assert bool(prolonged) == (expected is not None and expected >= 14)
+
+    # Cached analyses hand out a fresh numeric_data dict every time
+    complaint = "demam 39 derajat sudah 3 hari"
+    preprocessor.analyze(complaint).numeric_data['temperature'] = 41.0
+    assert preprocessor.analyze(complaint).numeric_data['temperature'] == 39.0
+
+    # The most abnormal heart rate wins on either side of the normal range
+    complaint = "nadi 35 tadi, sekarang nadi 90"
+    numeric = extract_numeric_data(complaint)
+    result = analyze_urgency(preprocess_text(complaint)['processed'], numeric)
+    print(f"Heart rate: {complaint} -> {numeric['heart_rate']} bpm, {result['urgency_level']}")
+    assert numeric['heart_rate'] == 35
+    assert result['urgency_level'] == 'Red'
+
+
+def test_term_normalizer():
+    """Test compiled normalizer against the sequential medical terms map"""
+    print_header("TEST 1b: Compiled Term Normalizer")
+
+    test_cases = [
+        "saya mumet dan demem sudah 3 hari",
+        "batuk-batuk terus-menerus, sesek dan capek banget",
+        "dada sakit tiba2, kencing manis dan darah tinggi",
+        "perut sakit, mencret 2 hari, gatel2 di tangan",
+        "napas pendek setelah jalan jauh"
+    ]
+
+    mismatches = 0
+    for complaint in test_cases:
+        cleaned = preprocessor.clean_text(complaint)
+        expected = apply_sequential(cleaned, preprocessor.medical_terms_map)
+        normalized = preprocessor.normalize_medical_terms(cleaned)
+
+        print(f"Input: {complaint}")
+        print(f"Normalized: {normalized}")
+        if normalized != expected:
+            print(f"[FAIL] (expected {expected})")
+            mismatches += 1
+
+    assert mismatches == 0
+
+    # Rewrites are not rescanned: a replacement that forms another term
+    # with the next word differs from the sequential map
+    cleaned = preprocessor.clean_text("sesek pendek")
+    normalized = preprocessor.normalize_medical_terms(cleaned)
+    print(f"Overlap: {normalized} (sequential: {apply_sequential(cleaned, preprocessor.medical_terms_map)})")
+    assert normalized == "sesak napas napas pendek"
+
+
+def test_typo_correction():
+    """Test typo correction, which never turns a real word into a red flag"""
+    from app.utils.preprocessor import IndonesianPreprocessor
+
+    print_header("TEST 1c: Typo Correction")
+
+    # Opt-in stage
+    assert IndonesianPreprocessor(cache_size=0, fuzzy=False).spelling_index is None
+
+    speller = IndonesianPreprocessor(cache_size=0, fuzzy=True)
+    if speller.spelling_index is None:
+        print("Skipped: Sastrawi lexicon not available")
+        return
+
+    # Real Indonesian words that used to be "corrected" into urgency terms
+    for complaint in ["batuk berdahak", "suara serak", "mata berkunang-kunang", "suara parau", "jantungan"]:
+        analysis = speller.analyze(complaint)
+        result = analyze_urgency(analysis.processed, analysis.numeric_data)
+        print(f"{complaint} -> {analysis.processed} ({result['urgency_level']})")
+        assert analysis.processed == complaint
+        assert result['urgency_level'] == 'Green'
+
+    # Genuine typos and elongations are still fixed
+    for complaint, expected in [("pusinggg dan mualll", "pusing dan mual"), ("menggigill", "menggigil"), ("pilekk", "pilek"),
+                                ("pusingg", "pusing"), ("batukk", "batuk")]:
+        processed = speller.analyze(complaint).processed
+        print(f"{complaint} -> {processed}")
+        assert processed == expected
+
+    # Words of multi-word and Yellow keywords are targets; single-word Red keywords are not
+    assert speller.analyze("sesakk napas").processed == speller.analyze("sesak napas").processed
+    assert speller.analyze("demamm tinggi").processed == "demam tinggi"
+    assert speller.analyze("pingsann").processed == "pingsann"
+
+
+def test_cached_stemmer():
+    """Test that runtime stems stay bounded and apart from the prebuilt cache"""
+    from app.utils.stemmer import CachedStemmer
+
+    print_header("TEST 1d: Cached Stemmer")
+
+    stemmer = CachedStemmer(cache_path=None, runtime_cache_size=2)
+    stemmer.stems['merasakan'] = 'rasa'
+    words = ['merasakan', 'keluhan', 'pemeriksaan', 'berobat', 'keluhan']
+    stems = [stemmer.stem(word) for word in words]
+
+    print(f"Stems: {stems}")
+    print(f"Stats: {stemmer.get_stats()}")
+    assert stems[0] == 'rasa' and stems[1] == stems[4]
+    assert len(stemmer.stems) == 1
+    assert len(stemmer.runtime) <= 2
+
 
 def test_urgency_engine():
     """Test urgency detection"""
@@ -124,6 +258,64 @@ def test_urgency_engine():
     print(f"{'='*70}")
 
 
+def test_red_flag_matcher():
+    """Test compiled red-flag matcher against word-boundary substring search"""
+    import re
+    import random
+    from app.models.urgency_engine import urgency_engine
+
+    print_header("TEST 2b: Compiled Red-Flag Matcher")
+
+    # Overlapping hits, word boundaries and enclitics
+    automaton = KeywordAutomaton(["sesak napas", "napas", "napas berat", "stroke"])
+    hits = [(automaton.keywords[hit.pattern], hit.start, hit.end)
+            for hit in automaton.find_all("sesak napas berat, heatstroke")]
+    print(f"Hits: {hits}")
+    assert hits == [("sesak napas", 0, 11), ("napas", 6, 11), ("napas berat", 6, 17)]
+    assert [hit.pattern for hit in automaton.find_all("sesak napasnya")] == [0, 1]
+
+    # Each rule fires once with its first listed keyword, in rule order
+    flags = urgency_engine.match_flags("sulit bernapas dan sesak napas, pilek, demam tinggi")
+    print(f"Flags: {[(level, [f['keyword'] for f in found]) for level, found in flags.items()]}")
+    assert [f['keyword'] for f in flags['Red']] == ["sesak napas"]
+    assert [f['keyword'] for f in flags['Yellow']] == ["demam tinggi"]
+    assert [f['keyword'] for f in flags['Green']] == ["pilek"]
+    detected = urgency_engine.detect_red_flags("sesak napas dan demam tinggi", {})
+    assert [f['urgency'] for f in detected] == ["Red"]
+
+    # Reduplication written with a digit and unitless temperatures keep their urgency
+    for complaint, expected in [
+        ("anak saya kejang2 sejak tadi", "Red"),
+        ("sering pingsan2", "Red"),
+        ("batuk berdarah2", "Red"),
+        ("demam 39.5", "Red"),
+    ]:
+        result = analyze_urgency(preprocess_text(complaint)['processed'], extract_numeric_data(complaint))
+        print(f"'{complaint}' -> {result['urgency_level']}")
+        assert result['urgency_level'] == expected
+    assert extract_numeric_data("demam 39,5")['temperature'] == 39.5
+    assert extract_numeric_data("demam 12")['temperature'] is None
+
+    # Agreement with a per-keyword regex scan on a random ruleset
+    rng = random.Random(0)
+    words = ["nyeri", "dada", "sesak", "napas", "demam", "tinggi", "batuk", "darah", "kepala", "muntah"]
+    phrases = sorted({" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(60)})
+    automaton = KeywordAutomaton(phrases)
+    mismatches = 0
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(3, 12)))
+        expected = sorted(
+            (index, match.start())
+            for index, phrase in enumerate(phrases)
+            for match in re.finditer(r'(?=\b' + re.escape(phrase) + r'\b)', text)
+        )
+        found = sorted((hit.pattern, hit.start) for hit in automaton.find_all(text))
+        if found != expected:
+            mismatches += 1
+    print(f"Random ruleset: {len(phrases)} keywords, {mismatches} mismatches in 200 texts")
+    assert mismatches == 0
+
+
 def test_classifier():
     """Test ML classifier"""
     print_header("TEST 3: Disease Category Classifier")
@@ -207,6 +399,440 @@ def test_classifier():
     print(f"{'='*70}")
 
 
+def test_classifier_batch():
+    """Test batch prediction against single predictions"""
+    print_header("TEST 3b: Batch Classifier Prediction")
+
+    model_path = os.path.join(os.path.dirname(__file__), 'app/data/trained_model')
+    if not os.path.exists(model_path):
+        print("\n[!] Model not found, skipping\n")
+        return
+
+    classifier = SymptomClassifier()
+    classifier.load_model(model_path)
+
+    complaints = [
+        "nyeri dada menjalar ke lengan kiri dan sesak napas",
+        "batuk berdarah dan demam tinggi",
+        "sakit perut hebat di kanan bawah dan mual",
+        "gatal-gatal seluruh badan dan bentol merah",
+        ""
+    ]
+    processed = [preprocess_text(complaint)['processed'] for complaint in complaints]
+
+    batch = classifier.predict_batch(processed, top_k=3)
+    print(f"Batch shape: {batch.indices.shape}")
+    assert batch.indices.shape == (len(complaints), 3)
+
+    for row, text in enumerate(processed):
+        single = classifier.predict(text, top_k=3)
+        print(f"{complaints[row] or '<empty>'}: {list(batch.categories[row])}")
+        assert [p['category'] for p in single] == list(batch.categories[row])
+        assert all(abs(p['probability'] - q) < 1e-12 for p, q in zip(single, batch.probabilities[row]))
+
+    assert classifier.predict_batch(processed, as_dicts=True)[0] == classifier.predict(processed[0])
+
+
+def test_inference_engine():
+    """Test NumPy inference engine against sklearn probabilities"""
+    print_header("TEST 3c: NumPy Inference Engine")
+
+    model_path = os.path.join(os.path.dirname(__file__), 'app/data/trained_model')
+    if not os.path.exists(model_path):
+        print("\n[!] Model not found, skipping\n")
+        return
+
+    classifier = SymptomClassifier()
+    classifier.load_model(model_path, use_artifact=False)
+    assert classifier.engine is not None
+
+    complaints = [
+        "nyeri dada menjalar ke lengan kiri dan sesak napas",
+        "Demam TINGGI 39,5 derajat!! sudah 3 hari",
+        "gatal-gatal seluruh badan dan bentol merah",
+        "kata yang tidak dikenal",
+        ""
+    ]
+    texts = complaints + [preprocess_text(complaint)['processed'] for complaint in complaints]
+
+    expected = classifier.model.predict_proba(classifier.vectorizer.transform(texts))
+    actual = classifier.engine.predict_proba(texts)
+    max_diff = float(abs(expected - actual).max())
+
+    print(f"Max probability difference vs sklearn: {max_diff:.2e}")
+    assert list(classifier.engine.classes_) == list(classifier.model.classes_)
+    assert max_diff < 1e-9
+
+    # Lookup-table fast path builds the same CSR matrix as sklearn, bit for bit
+    expected_tfidf = classifier.vectorizer.transform(texts)
+    actual_tfidf = classifier.engine.transform_csr(texts)
+    for name in ('data', 'indices', 'indptr'):
+        assert getattr(expected_tfidf, name).dtype == getattr(actual_tfidf, name).dtype
+        assert (getattr(expected_tfidf, name) == getattr(actual_tfidf, name)).all()
+
+    # Pickle-free artifact (memory-mapped) must score identically
+    if os.path.exists(os.path.join(model_path, 'manifest.json')):
+        served = SymptomClassifier()
+        served.load_model(model_path)
+        assert served.model is None
+        artifact_diff = float(abs(expected - served.engine.predict_proba(texts)).max())
+        print(f"Max probability difference (artifact) vs sklearn: {artifact_diff:.2e}")
+        assert artifact_diff < 1e-9
+
+        # Terms are looked up in the memory-mapped vocabulary, without a dict
+        from app.models.inference import SortedVocabulary, verify_artifact
+        assert isinstance(served.engine.vocabulary, SortedVocabulary)
+        served_tfidf = served.engine.transform_csr(texts)
+        for name in ('data', 'indices', 'indptr'):
+            assert (getattr(expected_tfidf, name) == getattr(served_tfidf, name)).all()
+        # The served engine counts through the lookup tables too, built on first use
+        assert served.engine._unigrams is not None
+        served.engine._unigrams = served.engine._bigrams = None
+        served_sorted = served.engine.transform_csr(texts)
+        for name in ('data', 'indices', 'indptr'):
+            assert (getattr(expected_tfidf, name) == getattr(served_sorted, name)).all()
+        verify_artifact(model_path)
+
+    # Compressed export: unpruned float64 is exact, int8 stays close
+    import tempfile
+    with tempfile.TemporaryDirectory() as export_dir:
+        for compression, tolerance in (({'precision': 'float64'}, 1e-9), ({'prune': 0.01, 'precision': 'int8'}, 0.05)):
+            classifier.save_model(export_dir, compression=compression)
+            compressed = SymptomClassifier()
+            compressed.load_model(export_dir)
+            assert compressed.engine.sparse_weights is not None
+            compressed_diff = float(abs(expected - compressed.engine.predict_proba(texts)).max())
+            print(f"Max probability difference ({compression['precision']}, "
+                  f"{compressed.engine.compression['density']:.0%} kept) vs sklearn: {compressed_diff:.2e}")
+            assert compressed_diff < tolerance
+
+
+def test_incremental_learner():
+    """Test incremental SGD updates, checkpoints and rollback"""
+    import tempfile
+    import pandas as pd
+    from app.models.incremental import IncrementalLearner
+
+    print_header("TEST 3d: Incremental Learner")
+
+    dataset_path = os.path.join(os.path.dirname(__file__), 'app/data/symptoms_dataset.csv')
+    df = pd.read_csv(dataset_path)
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        learner = IncrementalLearner(checkpoint_dir, classes=df['category'].unique())
+        for _ in range(5):
+            stats = learner.partial_fit(df['complaint'], df['category'])
+        first = learner.checkpoint()
+        accuracy = learner.evaluate(df['complaint'], df['category'])
+        print(f"v{first}: {stats['rows']} rows/batch, training accuracy {accuracy:.2%}")
+        assert accuracy > 0.5
+
+        learner.partial_fit(["ruam merah gatal di kulit"] * 20, ["Dermatologi"] * 20)
+        second = learner.checkpoint()
+        assert learner.list_versions() == [first, second]
+
+        # Checkpoints load like any trained model
+        served = SymptomClassifier(learner.current_path())
+        print(f"v{second} prediction: {served.predict('ruam merah gatal')[0]['category']}")
+
+        assert learner.rollback() == first
+        resumed = IncrementalLearner(checkpoint_dir)
+        assert resumed.version == first and resumed.samples_seen == 5 * len(df)
+
+    # A fresh learner is seeded with the base dataset before reviewed records
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        seeded = IncrementalLearner(checkpoint_dir, seed_path=dataset_path)
+        accuracy = seeded.evaluate(df['complaint'], df['category'])
+        print(f"Seeded from {seeded.seeded_from}: training accuracy {accuracy:.2%}")
+        assert accuracy > 0.5
+
+        # reviewed_only never silently learns from an export without review flags
+        export_path = os.path.join(checkpoint_dir, 'unflagged.csv')
+        df[['complaint', 'category']].to_csv(export_path, index=False)
+        try:
+            seeded.learn_from_file(export_path)
+            raise AssertionError("export without doctor_reviewed was accepted")
+        except ValueError as e:
+            print(f"Rejected: {e}")
+
+
+def test_model_selection():
+    """Test cross-validated grid search on the bundled dataset"""
+    import tempfile
+    import pandas as pd
+    from app.models.model_selection import cross_validate_grid, train_best, load_training_data
+
+    print_header("TEST 3e: Cross-validated Model Selection")
+
+    dataset_path = os.path.join(os.path.dirname(__file__), 'app/data/symptoms_dataset.csv')
+    data = pd.read_csv(dataset_path)
+
+    grid = [
+        {'mode': 'tfidf', 'max_features': 500, 'ngram_range': (1, 2)},
+        {'mode': 'hashing', 'n_features': 2 ** 12, 'idf': True},
+    ]
+    results, info = cross_validate_grid(data, vectorizer_grid=grid, C_grid=[1.0, 10.0], folds=3, n_jobs=1)
+
+    for result in results:
+        print(f"{result['name']:<36} C={result['C']:<5g} accuracy {result['accuracy']:.3f}")
+    assert info['configurations'] == 4 and len(results) == 4
+    assert results[0]['accuracy'] >= results[-1]['accuracy']
+    assert set(results[0]['per_class_f1']) == set(data['category'])
+
+    best = train_best(data, results[0])
+    assert best.engine is not None
+    print(f"Best model prediction: {best.predict('nyeri dada dan sesak napas')[0]['category']}")
+
+    # DATABASE disease table: translated, mapped to categories, deduplicated
+    table = pd.DataFrame({
+        'Disease': ['Bronchial Asthma', 'Bronchial Asthma', 'Hypertension '],
+        'Symptom_1': [' breathlessness', ' breathlessness', ' headache'],
+        'Symptom_2': [' cough', ' cough', ' chest_pain'],
+        'Symptom_3': [None, None, ' dischromic _patches'],
+    })
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        table_path = os.path.join(tmp_dir, 'dataset.csv')
+        table.to_csv(table_path, index=False)
+        disease_data = load_training_data([table_path])
+        assert len(load_training_data([table_path], dedupe=False)) == 3
+
+    print(disease_data.to_string(index=False))
+    assert list(disease_data['category']) == ['Respirasi', 'Kardiovaskular']
+    assert disease_data['complaint'].iloc[0] == 'Saya mengalami sesak napas dan batuk'
+    assert 'bercak kulit' in disease_data['complaint'].iloc[1]
+
+
+def test_feature_cache():
+    """Test that a repeated training run reuses cached feature matrices"""
+    import tempfile
+    import numpy as np
+    from app.utils.feature_cache import FeatureCache
+
+    print_header("TEST 3f: Training Feature Cache")
+
+    dataset_path = os.path.join(os.path.dirname(__file__), 'app/data/symptoms_dataset.csv')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = FeatureCache(cache_dir)
+        first = SymptomClassifier()
+        first_metrics = first.train(dataset_path, feature_cache=cache)
+        second = SymptomClassifier()
+        second_metrics = second.train(dataset_path, feature_cache=cache)
+
+        stats = cache.get_stats()
+        print(f"Cache: {stats['hits']} hit, {stats['misses']} miss, {stats['bytes']} bytes")
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        assert first_metrics['accuracy'] == second_metrics['accuracy']
+        assert np.allclose(first.model.coef_, second.model.coef_)
+
+        # Different vectorizer settings get their own entry; the limit keeps only the newest
+        SymptomClassifier().train(dataset_path, features='hashing', feature_cache=cache)
+        cache.max_bytes = 1
+        assert cache.evict() == 1
+        assert cache.get_stats()['entries'] == 1
+
+
+def test_model_registry():
+    """Test versioned registration, warm hot swap and rollback"""
+    import tempfile
+    from app.models.registry import ModelRegistry, BUNDLED_VERSION
+
+    print_header("TEST 3g: Model Registry")
+
+    model_path = os.path.join(os.path.dirname(__file__), 'app/data/trained_model')
+    dataset_path = os.path.join(os.path.dirname(__file__), 'app/data/symptoms_dataset.csv')
+
+    with tempfile.TemporaryDirectory() as registry_dir:
+        registry = ModelRegistry(registry_dir, bundled_path=model_path)
+        assert registry.load_current() == BUNDLED_VERSION
+
+        classifier = SymptomClassifier()
+        metrics = classifier.train(dataset_path)
+        version = registry.register(classifier, metrics, dataset_path, note="test")
+        assert registry.active.version == BUNDLED_VERSION
+
+        held = registry.active
+        swap = registry.activate(version)
+        print(f"Swapped {swap['previous_version']} -> {swap['version']} (load {swap['load_seconds']}s)")
+        assert registry.active.version == version and registry.current_version() == version
+        # A request holding the previous model still completes on it
+        assert held.classifier.predict('demam tinggi')[0]['category'] in held.classifier.categories
+
+        manifest = registry.get_manifest(version)
+        assert manifest['dataset_sha256'] and manifest['metrics']['accuracy'] == metrics['accuracy']
+
+        # A restarted service resumes the current version
+        assert ModelRegistry(registry_dir, bundled_path=model_path).load_current() == version
+
+        assert registry.rollback()['version'] == BUNDLED_VERSION
+
+
+def test_training_jobs():
+    """Test a background training job, single-job limit and cancellation"""
+    import tempfile
+    from app.models.registry import ModelRegistry
+    from app.models.training_jobs import TrainingJobManager, JobConflictError
+
+    print_header("TEST 3h: Background Training Jobs")
+
+    dataset_path = os.path.join(os.path.dirname(__file__), 'app/data/symptoms_dataset.csv')
+
+    with tempfile.TemporaryDirectory() as registry_dir:
+        registry = ModelRegistry(registry_dir)
+        jobs = TrainingJobManager(registry)
+
+        job = jobs.start(dataset_path)
+        try:
+            jobs.start(dataset_path)
+            assert False, "second job should be rejected while one is running"
+        except JobConflictError as e:
+            print(f"Rejected concurrent job: {e}")
+
+        job = jobs.wait(job['job_id'], timeout=120)
+        print(f"Job {job['job_id']}: {job['status']} -> {job['model_version']} (accuracy {job['metrics']['accuracy']:.2f})")
+        assert job['status'] == 'succeeded' and job['progress'] == 1.0
+        assert registry.active.version == job['model_version']
+
+        cancelled = jobs.start(dataset_path)
+        jobs.cancel(cancelled['job_id'])
+        cancelled = jobs.wait(cancelled['job_id'], timeout=30)
+        assert cancelled['status'] == 'cancelled'
+        assert registry.active.version == job['model_version']
+        # Whenever the cancel landed, nothing of the job stays registered
+        assert registry.list_versions() == [job['model_version']]
+
+        try:
+            registry.deregister(job['model_version'])
+            assert False, "the active version must not be deregistered"
+        except ValueError as e:
+            print(f"Refused: {e}")
+
+        # A worker that cannot be spawned fails its job instead of blocking the next
+        try:
+            jobs.start(dataset_path, options={'progress': lambda stage, fraction: None})
+            assert False, "unpicklable options should fail to spawn"
+        except RuntimeError as e:
+            print(f"Spawn failed: {e}")
+        assert jobs.list_jobs()[0]['status'] == 'failed' and jobs.active_job() is None
+
+
+def test_prediction_cache():
+    """Test the prediction cache: hits, copies and invalidation on model load"""
+    print_header("TEST 3i: Prediction Cache")
+
+    model_path = os.path.join(os.path.dirname(__file__), 'app/data/trained_model')
+    classifier = SymptomClassifier(cache_size=2)
+    classifier.load_model(model_path)
+
+    first = classifier.predict_with_details("batuk pilek")
+    first['alternative_categories'].clear()
+    second = classifier.predict_with_details("batuk pilek")
+    assert second['alternative_categories'], "cached result must not share state with callers"
+
+    classifier.predict_with_details("demam pusing")
+    classifier.predict_with_details("nyeri dada")
+    stats = classifier.get_cache_stats()
+    print(f"Cache: {stats['hits']} hit, {stats['misses']} miss, {stats['size']} entries, {stats['bytes']} bytes")
+    assert stats['hits'] == 1 and stats['misses'] == 3
+    assert stats['size'] == 2 and stats['evictions'] == 1 and stats['bytes'] > 0
+
+    # Loading a model (same or new) starts from an empty cache
+    classifier.load_model(model_path)
+    assert classifier.get_cache_stats()['size'] == 0
+    assert classifier.predict_with_details("batuk pilek") == second
+
+
+def test_similar_cases():
+    """Test similar-case search against brute force, insertion and persistence"""
+    import tempfile
+    import numpy as np
+    from app.models.similar_cases import SimilarCaseIndex
+
+    print_header("TEST 3j: Similar-Case Index")
+
+    model_path = os.path.join(os.path.dirname(__file__), 'app/data/trained_model')
+    classifier = SymptomClassifier(model_path)
+    complaints = [
+        "demam tinggi menggigil", "batuk pilek hidung meler", "nyeri dada sesak napas",
+        "gatal ruam kulit merah", "sakit perut mual muntah", "demam batuk pilek",
+    ]
+
+    index = SimilarCaseIndex(classifier, compact_threshold=10)
+    index.add(complaints[:4], [{'triage_id': f'TRG-{i}', 'doctor_reviewed': 'true'} for i in range(4)])
+    # Inserted after the last compaction: served from the buffer
+    index.add(complaints[4:])
+    assert index.get_stats()['pending_postings'] > 0
+
+    query = "demam dan batuk"
+    results = index.search(query, top_k=3)
+    print(f"'{query}' -> {[(r['complaint'], r['score']) for r in results]}")
+
+    rows, columns, values = classifier.engine.transform([classifier._featurize(text) for text in complaints + [query]])
+    vectors = np.zeros((len(complaints) + 1, index.n_features))
+    vectors[rows, columns] = values
+    expected = vectors[:-1] @ vectors[-1]
+    assert [r['case_id'] for r in results] == list(np.argsort(-expected, kind='stable')[:3])
+    assert np.allclose([r['score'] for r in results], np.sort(expected)[::-1][:3], atol=1e-4)
+    assert results[0]['complaint'] == "demam batuk pilek"
+    assert index.search(query, top_k=3, min_score=0.99) == []
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index.save(index_dir)
+        loaded = SimilarCaseIndex.load(index_dir, classifier)
+        assert len(loaded) == len(complaints) and loaded.search(query, top_k=3) == results
+        assert loaded.cases[0]['triage_id'] == 'TRG-0' and loaded.cases[0]['doctor_reviewed'] is True
+
+        # After a model swap the saved cases are re-indexed in the new feature space
+        retrained = SymptomClassifier()
+        retrained.train(os.path.join(os.path.dirname(__file__), 'app/data/symptoms_dataset.csv'), features='hashing')
+        try:
+            SimilarCaseIndex.load(index_dir, retrained)
+            assert False, "an index from another model must not load as is"
+        except ValueError as e:
+            print(f"Rejected: {e}")
+        rebuilt = SimilarCaseIndex.load(index_dir, retrained, rebuild=True)
+        assert rebuilt.fingerprint != index.fingerprint and len(rebuilt) == len(complaints)
+        assert rebuilt.cases[0]['triage_id'] == 'TRG-0'
+        assert rebuilt.search("demam tinggi menggigil", top_k=1)[0]['case_id'] == 0
+
+
+def test_streaming_training():
+    """Test out-of-core training: chunked epochs, stable holdout split, reported memory"""
+    import tempfile
+    import pandas as pd
+
+    print_header("TEST 3k: Streaming Training")
+
+    dataset = pd.read_csv(os.path.join(os.path.dirname(__file__), 'app/data/symptoms_dataset.csv'))
+    # Variants of every complaint, so both the train and held-out streams see each category
+    corpus = pd.concat(
+        [dataset.assign(complaint=dataset['complaint'] + f" hari ke {i}") for i in range(20)],
+        ignore_index=True
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_path = os.path.join(tmp_dir, 'corpus.csv')
+        corpus.to_csv(corpus_path, index=False)
+
+        classifier = SymptomClassifier()
+        metrics = classifier.train_streaming(corpus_path, epochs=3, chunk_size=100, holdout=0.2)
+        print(f"Accuracy {metrics['accuracy']:.2f}, {metrics['rows_per_second']:.0f} rows/s, "
+              f"peak RSS {metrics['peak_rss_mb']} MB")
+
+        assert metrics['train_size'] + metrics['test_size'] == len(corpus)
+        assert 0 < metrics['test_size'] < len(corpus) / 2
+        assert [epoch['rows'] for epoch in metrics['epochs']] == [metrics['train_size']] * 3
+        assert metrics['peak_rss_mb'] > 0 and metrics['rows_per_second'] > 0
+        assert metrics['accuracy'] > 0.5 and metrics['report']['accuracy'] == metrics['accuracy']
+
+        # The split hashes complaint text: a second run holds out the same rows
+        again = SymptomClassifier().train_streaming(corpus_path, epochs=1, chunk_size=250)
+        assert again['test_size'] == metrics['test_size']
+
+        assert classifier.engine is not None
+        assert classifier.predict("demam tinggi batuk pilek")[0]['category'] in classifier.categories
+
+
 def test_full_pipeline():
     """Test complete triage pipeline"""
     print_header("TEST 4: Full Triage Pipeline")
@@ -274,12 +900,26 @@ def main():
     try:
         # Test 1: Preprocessor
         test_preprocessor()
+        test_term_normalizer()
+        test_typo_correction()
+        test_cached_stemmer()
 
         # Test 2: Urgency Engine
         test_urgency_engine()
+        test_red_flag_matcher()
 
         # Test 3: Classifier
         test_classifier()
+        test_classifier_batch()
+        test_inference_engine()
+        test_incremental_learner()
+        test_model_selection()
+        test_feature_cache()
+        test_model_registry()
+        test_training_jobs()
+        test_prediction_cache()
+        test_similar_cases()
+        test_streaming_training()
 
         # Test 4: Full Pipeline
         test_full_pipeline()
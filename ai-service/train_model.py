@@ -10,6 +10,7 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.models.classifier import SymptomClassifier
+from app.utils.feature_cache import FeatureCache
 
 
 def main():
@@ -36,9 +37,18 @@ def main():
     print("🔄 Initializing classifier...")
     classifier = SymptomClassifier()
 
+    # Optional Sastrawi stemming (applied identically at prediction time)
+    stemming = '--stem' in sys.argv
+
+    # Optional vocabulary-free hashed feature space (persisted with the model)
+    features = 'hashing' if '--hashing' in sys.argv else 'tfidf'
+
+    # Vectorized matrices are reused while dataset and settings are unchanged
+    feature_cache = None if '--no-cache' in sys.argv else FeatureCache()
+
     print("🚀 Starting training...\n")
     try:
-        metrics = classifier.train(dataset_path)
+        metrics = classifier.train(dataset_path, stemming=stemming, features=features, feature_cache=feature_cache)
 
         print("\n📊 Training Results:")
         print(f"   Accuracy: {metrics['accuracy']:.2%}")
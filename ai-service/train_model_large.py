@@ -10,6 +10,7 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.models.classifier import SymptomClassifier
+from app.utils.feature_cache import FeatureCache
 
 
 def main():
@@ -37,11 +38,14 @@ def main():
     print("[*] Initializing classifier...")
     classifier = SymptomClassifier()
 
+    # Vectorized matrices are reused while dataset and settings are unchanged
+    feature_cache = None if '--no-cache' in sys.argv else FeatureCache()
+
     print("[*] Starting training with large dataset...")
     print("    This may take 1-2 minutes...\n")
 
     try:
-        metrics = classifier.train(dataset_path)
+        metrics = classifier.train(dataset_path, feature_cache=feature_cache)
 
         print("\n" + "="*60)
         print("TRAINING RESULTS")
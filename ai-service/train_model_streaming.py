@@ -0,0 +1,80 @@
+"""
+Out-of-core training for TRIAGE.AI
+Streams complaint corpora larger than memory in chunks (hashed features,
+SGD partial_fit over several epochs) within a peak-memory budget and
+reports throughput and peak RSS
+
+Usage:
+    python train_model_streaming.py corpus.csv [more.ndjson ...]
+        [--epochs 3] [--memory-mb 1024] [--chunk-size N] [--holdout 0.2]
+        [--stem] [--hash-features 16384] [--output DIR | --register]
+"""
+
+import argparse
+import os
+import sys
+
+# Add app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from app.models.classifier import SymptomClassifier, DEFAULT_HASH_FEATURES
+
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), 'app/data/trained_model')
+
+
+def main():
+    """Train on streamed corpora and save (or register) the model"""
+    parser = argparse.ArgumentParser(description="Out-of-core classifier training")
+    parser.add_argument('datasets', nargs='+', help="Corpora with complaint and category columns (.csv, .ndjson, .parquet)")
+    parser.add_argument('--epochs', type=int, default=3, help="Passes over the training stream")
+    parser.add_argument('--memory-mb', type=int, help="Peak RSS budget (default TRAIN_MEMORY_BUDGET_MB env or 1024)")
+    parser.add_argument('--chunk-size', type=int, help="Rows per chunk (default: derived from the budget)")
+    parser.add_argument('--holdout', type=float, default=0.2, help="Fraction of complaints held out for evaluation")
+    parser.add_argument('--stem', action='store_true', help="Train on preprocessed + stemmed complaints")
+    parser.add_argument('--hash-features', type=int, default=DEFAULT_HASH_FEATURES, help="Hashed feature space size")
+    parser.add_argument('--output', default=MODEL_PATH, help="Model directory")
+    parser.add_argument('--register', action='store_true', help="Register a new version in the model registry instead")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("TRIAGE.AI - Streaming Model Training")
+    print("="*60 + "\n")
+
+    for path in args.datasets:
+        if not os.path.exists(path):
+            print(f"[ERROR] Dataset not found at {path}")
+            return
+        print(f"[INFO] Dataset: {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+    classifier = SymptomClassifier()
+    metrics = classifier.train_streaming(
+        args.datasets,
+        epochs=args.epochs,
+        memory_budget_mb=args.memory_mb,
+        chunk_size=args.chunk_size,
+        holdout=args.holdout,
+        stemming=args.stem,
+        hash_features=args.hash_features
+    )
+
+    print(f"{'Epoch':<8}{'Rows':>12}{'Seconds':>10}{'Rows/s':>10}{'Holdout acc':>13}")
+    for epoch in metrics['epochs']:
+        rate = epoch['rows'] / epoch['seconds'] if epoch['seconds'] else 0.0
+        accuracy = f"{epoch['holdout_accuracy']:.4f}" if epoch['holdout_accuracy'] is not None else 'n/a'
+        print(f"{epoch['epoch']:<8}{epoch['rows']:>12}{epoch['seconds']:>10.1f}{rate:>10.0f}{accuracy:>13}")
+    print("(holdout accuracy per epoch is progressive: rows scored before their chunk is learned)\n")
+
+    if args.register:
+        from app.models.registry import ModelRegistry
+        version = ModelRegistry(os.getenv('MODEL_REGISTRY_DIR')).register(
+            classifier, metrics, args.datasets[0], note=f"streaming training, {args.epochs} epochs"
+        )
+        print(f"[SUCCESS] Registered {version}; activate it with POST /api/v1/admin/models/{version}/activate\n")
+    else:
+        classifier.save_model(args.output)
+        print(f"[SUCCESS] Model saved to: {args.output}\n")
+
+
+if __name__ == "__main__":
+    main()